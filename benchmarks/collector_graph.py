@@ -0,0 +1,89 @@
+"""
+데이터 수집 워크플로우 그래프 준비 비용 벤치마크
+
+턴마다 그래프를 새로 만들고 컴파일하는 방식(이전 방식)과
+한 번 컴파일한 그래프를 재사용하는 방식(현재 방식)의 턴당 오버헤드를 비교합니다.
+LLM은 즉시 응답하는 가짜 객체로 바꾸므로 측정값은 그래프 준비와 실행 자체의 비용입니다.
+
+실행 방법 (프로젝트 루트에서):
+    python -m benchmarks.collector_graph
+    python -m benchmarks.collector_graph --repeat 500
+"""
+
+import argparse
+import logging
+import time
+from typing import Any, Callable, Dict
+from unittest.mock import patch
+
+from src.agent import Agent
+
+
+class _InstantLLM:
+    """항상 불충분 평가를 즉시 반환하는 벤치마크용 LLM"""
+
+    def invoke(self, prompt: str) -> str:
+        return "<insufficient><code>INSUFFICIENT</code><reason>vague</reason><result>More?</result></insufficient>"
+
+
+def make_state() -> Dict[str, Any]:
+    """
+    process_answer에서 시작하여 불충분 판정으로 끝나는 한 턴의 입력 상태를 생성합니다.
+
+    Returns:
+        Dict[str, Any]: 상태 객체
+    """
+    return {
+        "messages": [{"role": "ai", "content": "What is it?"}, {"role": "human", "content": "hmm"}],
+        "message_offset": 0,
+        "node_result": "",
+        "results": {},
+        "current_target": {"id": "target1", "name": "Target 1", "description": "Test", "example": "Example"},
+        "model": {"name": "llama3", "temperature": 0.0, "type": "ollama", "api_key": None}
+    }
+
+
+def measure(get_graph: Callable[[], Any], repeat: int, run: bool) -> float:
+    """
+    턴당 평균 시간(ms)을 측정합니다.
+
+    Args:
+        get_graph: 턴마다 그래프를 가져오는 함수
+        repeat: 반복 횟수
+        run: True면 그래프 실행까지 포함하여 측정
+
+    Returns:
+        float: 턴당 평균 시간 (ms)
+    """
+    config = {"configurable": {"session_id": "benchmark"}}
+    start = time.perf_counter()
+    for _ in range(repeat):
+        graph = get_graph()
+        if run:
+            graph.invoke(make_state(), config=config)
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="워크플로우 그래프 준비 비용 벤치마크")
+    parser.add_argument("--repeat", type=int, default=200, help="측정 반복 횟수")
+    args = parser.parse_args()
+
+    # 노드 로그가 측정에 섞이지 않도록 함
+    logging.disable(logging.INFO)
+
+    strategies = {
+        "compile per turn": Agent._create_collector_graph,
+        "cached graph": Agent._get_collector_graph,
+    }
+
+    print(f"{'strategy':<18} {'prepare ms':>11} {'turn ms':>9}")
+    with patch("src.utils.model._get_llm_instance", return_value=_InstantLLM()):
+        for name, get_graph in strategies.items():
+            prepare_ms = measure(get_graph, args.repeat, run=False)
+            turn_ms = measure(get_graph, args.repeat, run=True)
+            print(f"{name:<18} {prepare_ms:>11.3f} {turn_ms:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
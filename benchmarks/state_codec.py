@@ -0,0 +1,101 @@
+"""
+상태 직렬화 형식 벤치마크
+
+대화 길이별로 직렬화 형식/압축 방식의 인코딩·디코딩 시간과 기록 크기를 비교합니다.
+
+실행 방법 (프로젝트 루트에서):
+    python -m benchmarks.state_codec
+    python -m benchmarks.state_codec --sizes 100 1000 --repeat 20
+"""
+
+import argparse
+import time
+from typing import Any, Dict, List, Tuple
+
+from src.utils.codec import StateCodec, FORMAT_JSON, FORMAT_COMPACT_JSON, FORMAT_MSGPACK
+
+# 비교할 (형식, 압축 방식) 조합
+_CODECS: List[Tuple[str, str]] = [
+    (FORMAT_JSON, "none"),
+    (FORMAT_COMPACT_JSON, "none"),
+    (FORMAT_MSGPACK, "none"),
+    (FORMAT_COMPACT_JSON, "gzip"),
+    (FORMAT_COMPACT_JSON, "zstd"),
+    (FORMAT_MSGPACK, "zstd"),
+]
+
+
+def make_state(message_count: int) -> Dict[str, Any]:
+    """
+    벤치마크용 상태를 생성합니다. (질문/답변과 평가 디버그 메시지가 섞인 대화)
+
+    Args:
+        message_count: 메시지 수
+
+    Returns:
+        Dict[str, Any]: 상태 객체
+    """
+    roles = ("ai", "human", "debug")
+    messages = [
+        {
+            "role": roles[i % 3],
+            "content": f"메시지 {i}: 사용자의 이름과 연락처, 선호하는 연락 시간을 알려주세요. " * 3
+        }
+        for i in range(message_count)
+    ]
+    return {
+        "messages": messages,
+        "node_result": "need_more_info",
+        "results": {f"target{i}": {"value": f"수집된 값 {i}"} for i in range(20)},
+        "current_target": {"id": "target1", "description": "이름"},
+        "model": {"name": "llama3", "temperature": 0.2, "type": "ollama", "api_key": None}
+    }
+
+
+def measure(codec: StateCodec, state: Dict[str, Any], repeat: int) -> Tuple[float, float, int]:
+    """
+    코덱의 평균 인코딩/디코딩 시간(ms)과 기록 크기(바이트)를 측정합니다.
+
+    Args:
+        codec: 측정할 코덱
+        state: 직렬화할 상태
+        repeat: 반복 횟수
+
+    Returns:
+        Tuple[float, float, int]: (인코딩 ms, 디코딩 ms, 바이트 수)
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        data = codec.encode(state)
+    encode_ms = (time.perf_counter() - start) * 1000 / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        StateCodec.decode(data)
+    decode_ms = (time.perf_counter() - start) * 1000 / repeat
+
+    return encode_ms, decode_ms, len(data)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="상태 직렬화 형식 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000],
+                        help="측정할 메시지 수 목록")
+    parser.add_argument("--repeat", type=int, default=10, help="측정 반복 횟수")
+    args = parser.parse_args()
+
+    print(f"{'messages':>8}  {'format':<13} {'compression':<11} {'encode ms':>10} {'decode ms':>10} {'bytes':>10}")
+    for size in args.sizes:
+        state = make_state(size)
+        for format, compression in _CODECS:
+            try:
+                codec = StateCodec(format, compression, compress_threshold=0)
+            except ValueError as e:
+                print(f"{size:>8}  {format:<13} {compression:<11} 건너뜀: {e}")
+                continue
+            encode_ms, decode_ms, size_bytes = measure(codec, state, args.repeat)
+            print(f"{size:>8}  {format:<13} {compression:<11} {encode_ms:>10.3f} {decode_ms:>10.3f} {size_bytes:>10}")
+
+
+if __name__ == "__main__":
+    main()
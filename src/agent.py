@@ -1,15 +1,24 @@
-from typing import Dict, List, Any, Tuple, Optional
-from langgraph.graph import StateGraph, END
+from typing import Dict, Iterator, List, Any, Tuple, Optional
+from langchain_core.runnables import RunnableLambda
+from langgraph.graph import StateGraph, START, END
 import logging
+import threading
 
-from src.nodes.find_missing import find_missing
-from src.nodes.generate_question import generate_question
-from src.nodes.process_answer import process_answer
-from src.state import State, StateManager
+from src.nodes.find_missing import find_missing, afind_missing
+from src.nodes.generate_question import generate_question, agenerate_question, warmup_questions
+from src.nodes.process_answer import process_answer, aprocess_answer
+from src.state import State, StateManager, DEFAULT_SESSION_ID
+from src.target import resolve_target_version
+from src.utils.readonly import unwrap
+from src.utils.streaming import STREAM_TOKEN, STREAM_MESSAGE_END
 from src.entities import RESULT_TARGET_FOUND, RESULT_ALL_TARGETS_COMPLETE, RESULT_ANSWER_SUFFICIENT
 
 logger = logging.getLogger(__name__)
 
+# 컴파일된 데이터 수집 워크플로우 (처음 사용할 때 한 번만 컴파일하여 모든 세션/턴에서 재사용)
+_COLLECTOR_GRAPH: Optional[Any] = None
+_COLLECTOR_GRAPH_LOCK = threading.Lock()
+
 class Agent:
     """
     대화형 데이터 수집 에이전트
@@ -21,41 +30,68 @@ class Agent:
     2. 사용자에게 질문 생성 (generate_question)
     3. 사용자 응답 처리 (process_answer)
     4. 모든 데이터가 수집될 때까지 반복
+    
+    모든 진입점은 session_id 인자로 대화 세션을 지정하며,
+    세션마다 독립된 상태(메시지, 결과, 모델 설정)를 사용합니다.
     """
     
     @staticmethod
-    def add_user_message(content: str) -> Tuple[List[Dict], List[Dict]]:
+    def add_user_message(content: str, session_id: str = DEFAULT_SESSION_ID) -> Tuple[List[Dict], List[Dict]]:
         """
         사용자 메시지를 추가하고 에이전트의 응답을 처리합니다.
         
         Args:
             content: 사용자가 입력한 메시지
+            session_id: 대화 세션 ID
             
         Returns:
             Tuple[List[Dict], List[Dict]]: (모든 메시지, 새 AI 메시지만) 포함하는 튜플
         """
-        # 사용자 메시지를 상태에 추가
-        StateManager.append_message({"role": "human", "content": content})
-        messages = StateManager.get_messages()
-        
-        # 상태에서 모델 설정 가져오기
-        model_name, temperature, model_type, api_key = StateManager.get_model_settings()
+        messages, model_settings = Agent._prepare_user_message(content, session_id)
         
         # 에이전트로 처리
-        result = Agent._run_collector(messages, model_name, temperature, model_type, api_key)
+        result = Agent._run_collector(messages, *model_settings, session_id)
+        return Agent._split_new_messages(result, messages)
+    
+    @staticmethod
+    async def aadd_user_message(content: str, session_id: str = DEFAULT_SESSION_ID) -> Tuple[List[Dict], List[Dict]]:
+        """
+        add_user_message()의 비동기 버전입니다. (graph.ainvoke()로 워크플로우 실행)
         
-        # 새 AI 메시지 가져오기
-        all_messages = result.get("messages", [])
-        new_messages = []
+        Args:
+            content: 사용자가 입력한 메시지
+            session_id: 대화 세션 ID
+            
+        Returns:
+            Tuple[List[Dict], List[Dict]]: (모든 메시지, 새 AI 메시지만) 포함하는 튜플
+        """
+        messages, model_settings = Agent._prepare_user_message(content, session_id)
         
-        if len(all_messages) > len(messages):
-            new_messages = [msg for msg in all_messages[len(messages):] if msg["role"] == "ai"]
+        # 에이전트로 처리
+        result = await Agent._arun_collector(messages, *model_settings, session_id)
+        return Agent._split_new_messages(result, messages)
+    
+    @staticmethod
+    def stream_user_message(content: str, session_id: str = DEFAULT_SESSION_ID) -> Iterator[Dict[str, Any]]:
+        """
+        add_user_message()의 스트리밍 버전입니다. AI 메시지를 생성되는 대로 토큰 단위로 반환합니다.
         
-        return all_messages, new_messages
+        Args:
+            content: 사용자가 입력한 메시지
+            session_id: 대화 세션 ID
+            
+        Yields:
+            Dict[str, Any]: 스트림 이벤트
+                - {"type": "token", "index": int, "content": str}: index번째 새 AI 메시지의 텍스트 조각
+                - {"type": "done", "messages": List[Dict], "new_messages": List[Dict]}: 마지막 이벤트 (저장 완료 후)
+        """
+        messages, model_settings = Agent._prepare_user_message(content, session_id)
+        yield from Agent._stream_collector(messages, *model_settings, session_id)
     
     @staticmethod
     def initialize_chat(model_name: str, temperature: float, 
-                        model_type: str, api_key: Optional[str]) -> Tuple[List[Dict], List[Dict]]:
+                        model_type: str, api_key: Optional[str],
+                        session_id: str = DEFAULT_SESSION_ID) -> Tuple[List[Dict], List[Dict]]:
         """
         에이전트와의 채팅을 초기화하거나 재설정합니다.
         
@@ -64,20 +100,131 @@ class Agent:
             temperature: 모델 온도 설정 (높을수록 무작위성 증가)
             model_type: 모델 유형 ("ollama" 또는 "openai")
             api_key: OpenAI 모델 사용 시 필요한 API 키
+            session_id: 대화 세션 ID
+            
+        Returns:
+            Tuple[List[Dict], List[Dict]]: (모든 메시지, 새 AI 메시지만) 포함하는 튜플
+        """
+        # 모델 설정 업데이트 및 모든 타겟의 질문 미리 생성
+        StateManager.set_model_settings(model_name, temperature, model_type, api_key, session_id=session_id)
+        Agent.warmup(model_name, temperature, model_type, api_key)
+        
+        # 기존 메시지 가져오기
+        messages = StateManager.get_messages(session_id)
+        
+        # 에이전트로 처리
+        result = Agent._run_collector(messages, model_name, temperature, model_type, api_key, session_id)
+        return Agent._split_new_messages(result, messages)
+    
+    @staticmethod
+    def stream_initialize_chat(model_name: str, temperature: float,
+                               model_type: str, api_key: Optional[str],
+                               session_id: str = DEFAULT_SESSION_ID) -> Iterator[Dict[str, Any]]:
+        """
+        initialize_chat()의 스트리밍 버전입니다. 첫 질문을 생성되는 대로 토큰 단위로 반환합니다.
+        
+        Args:
+            model_name: 사용할 모델 이름
+            temperature: 모델 온도 설정 (높을수록 무작위성 증가)
+            model_type: 모델 유형 ("ollama" 또는 "openai")
+            api_key: OpenAI 모델 사용 시 필요한 API 키
+            session_id: 대화 세션 ID
+            
+        Yields:
+            Dict[str, Any]: 스트림 이벤트 (stream_user_message() 참고)
+        """
+        # 모델 설정 업데이트 및 모든 타겟의 질문 미리 생성
+        StateManager.set_model_settings(model_name, temperature, model_type, api_key, session_id=session_id)
+        Agent.warmup(model_name, temperature, model_type, api_key)
+        
+        # 기존 메시지 가져오기
+        messages = StateManager.get_messages(session_id)
+        yield from Agent._stream_collector(messages, model_name, temperature, model_type, api_key, session_id)
+    
+    @staticmethod
+    async def ainitialize_chat(model_name: str, temperature: float,
+                               model_type: str, api_key: Optional[str],
+                               session_id: str = DEFAULT_SESSION_ID) -> Tuple[List[Dict], List[Dict]]:
+        """
+        initialize_chat()의 비동기 버전입니다. (graph.ainvoke()로 워크플로우 실행)
+        
+        Args:
+            model_name: 사용할 모델 이름
+            temperature: 모델 온도 설정 (높을수록 무작위성 증가)
+            model_type: 모델 유형 ("ollama" 또는 "openai")
+            api_key: OpenAI 모델 사용 시 필요한 API 키
+            session_id: 대화 세션 ID
             
         Returns:
             Tuple[List[Dict], List[Dict]]: (모든 메시지, 새 AI 메시지만) 포함하는 튜플
         """
-        # 모델 설정 업데이트
-        StateManager.set_model_settings(model_name, temperature, model_type, api_key)
+        # 모델 설정 업데이트 및 모든 타겟의 질문 미리 생성
+        StateManager.set_model_settings(model_name, temperature, model_type, api_key, session_id=session_id)
+        Agent.warmup(model_name, temperature, model_type, api_key)
         
         # 기존 메시지 가져오기
-        messages = StateManager.get_messages()
+        messages = StateManager.get_messages(session_id)
         
         # 에이전트로 처리
-        result = Agent._run_collector(messages, model_name, temperature, model_type, api_key)
+        result = await Agent._arun_collector(messages, model_name, temperature, model_type, api_key, session_id)
+        return Agent._split_new_messages(result, messages)
+    
+    @staticmethod
+    def warmup(model_name: str, temperature: float, model_type: str, api_key: Optional[str]) -> int:
+        """
+        선택한 모델로 모든 필수 타겟의 질문을 백그라운드에서 미리 생성합니다.
+
+        COLLECTOR_QUESTION_WARMUP=true일 때만 동작하며, 미리 생성한 질문은
+        generate_question 노드가 LLM을 호출하지 않고 바로 사용합니다.
+
+        Args:
+            model_name: 사용할 모델 이름
+            temperature: 모델 온도 설정
+            model_type: 모델 유형 ("ollama" 또는 "openai")
+            api_key: OpenAI 모델의 API 키
+
+        Returns:
+            int: 새로 생성을 시작한 질문 수
+        """
+        model = {"name": model_name, "temperature": temperature, "type": model_type, "api_key": api_key}
+        try:
+            return warmup_questions(model)
+        except Exception as e:
+            # 미리 생성하지 못해도 질문은 generate_question 노드에서 생성되므로 대화는 계속 진행
+            logger.warning(f"질문 미리 생성 중 오류 발생: {str(e)}")
+            return 0
+    
+    @staticmethod
+    def _prepare_user_message(content: str, session_id: str) -> Tuple[List[Dict], Tuple]:
+        """
+        사용자 메시지를 상태에 추가하고, 워크플로우 실행에 필요한 메시지와 모델 설정을 가져옵니다.
+        
+        Args:
+            content: 사용자가 입력한 메시지
+            session_id: 대화 세션 ID
+            
+        Returns:
+            Tuple[List[Dict], Tuple]: (메시지 목록, (모델 이름, 온도, 모델 타입, API 키))
+        """
+        # 사용자 메시지를 상태에 추가
+        StateManager.append_message({"role": "human", "content": content}, session_id=session_id)
+        messages = StateManager.get_messages(session_id)
         
-        # 새 AI 메시지 가져오기
+        # 상태에서 모델 설정 가져오기
+        return messages, StateManager.get_model_settings(session_id)
+    
+    @staticmethod
+    def _split_new_messages(result: State, messages: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        워크플로우 결과에서 새로 추가된 AI 메시지를 골라냅니다.
+        
+        Args:
+            result: 워크플로우 실행 결과
+            messages: 실행 전 메시지 목록
+            
+        Returns:
+            Tuple[List[Dict], List[Dict]]: (모든 메시지, 새 AI 메시지만) 포함하는 튜플
+        """
         all_messages = result.get("messages", [])
         new_messages = []
         
@@ -87,7 +234,49 @@ class Agent:
         return all_messages, new_messages
     
     @staticmethod
-    def _create_collector_graph(entry_point: str) -> Any:
+    def _get_collector_graph() -> Any:
+        """
+        컴파일된 데이터 수집 워크플로우를 반환합니다. (처음 호출할 때 생성하여 캐시)
+        
+        컴파일된 그래프는 실행 상태를 가지지 않으므로 여러 세션과 스레드에서 함께 사용할 수 있습니다.
+        
+        Returns:
+            컴파일된 LangGraph 워크플로우
+        """
+        global _COLLECTOR_GRAPH
+        
+        if _COLLECTOR_GRAPH is None:
+            with _COLLECTOR_GRAPH_LOCK:
+                if _COLLECTOR_GRAPH is None:
+                    _COLLECTOR_GRAPH = Agent._create_collector_graph()
+        return _COLLECTOR_GRAPH
+    
+    @staticmethod
+    def _select_entry_point(messages: List[Dict]) -> str:
+        """
+        대화 상태에 따라 워크플로우 진입점을 결정합니다.
+        
+        Args:
+            messages: 대화 메시지 목록
+            
+        Returns:
+            str: 진입 노드 이름 또는 END
+        """
+        if len(messages) == 0:
+            # 메시지가 없으면 수집할 데이터 찾기부터 시작
+            return "find_missing"
+        elif messages[-1].get("role") == "human":
+            # 마지막 메시지가 사용자의 메시지면 응답 처리
+            return "process_answer"
+        elif messages[-1].get("role") == "ai":
+            # 마지막 메시지가 AI의 메시지면 종료 (이미 질문이 생성됨)
+            return END
+        else:
+            # 기타 경우 (예: 시스템 메시지) 데이터 찾기부터 시작
+            return "find_missing"
+    
+    @staticmethod
+    def _create_collector_graph() -> Any:
         """
         데이터 수집 워크플로우 그래프를 생성합니다.
         
@@ -98,8 +287,8 @@ class Agent:
                        |                                                      |
                        +------ [process_answer] <-- (사용자 응답) ------------+
         
-        Args:
-            entry_point: 워크플로우 진입점 ("find_missing", "process_answer" 또는 END)
+        진입점은 START의 조건부 엣지가 메시지 기록으로 결정하므로(_select_entry_point),
+        그래프 하나로 모든 턴을 처리합니다. 실행 시에는 _get_collector_graph()로 캐시된 그래프를 사용합니다.
             
         Returns:
             컴파일된 LangGraph 워크플로우
@@ -107,14 +296,15 @@ class Agent:
         workflow = StateGraph(State)
         
         # === 노드 추가 ===
+        # 각 노드는 동기/비동기 구현을 함께 등록하여 graph.invoke()와 graph.ainvoke() 모두 지원
         # 1. find_missing: 수집되지 않은 타겟 데이터 찾기
-        workflow.add_node("find_missing", find_missing)
+        workflow.add_node("find_missing", RunnableLambda(find_missing, afunc=afind_missing))
         
         # 2. generate_question: 사용자에게 질문 생성
-        workflow.add_node("generate_question", generate_question)
+        workflow.add_node("generate_question", RunnableLambda(generate_question, afunc=agenerate_question))
         
         # 3. process_answer: 사용자의 답변 처리
-        workflow.add_node("process_answer", process_answer)
+        workflow.add_node("process_answer", RunnableLambda(process_answer, afunc=aprocess_answer))
         
         # === 엣지 추가 ===
         # 1. find_missing 노드에서의 분기
@@ -156,18 +346,27 @@ class Agent:
             }
         )
         
-        # 워크플로우 진입점 설정
-        workflow.set_entry_point(entry_point)
+        # 4. 시작 분기: 대화 상태에 따라 진입점 결정
+        workflow.add_conditional_edges(
+            START,
+            lambda state: Agent._select_entry_point(state.get("messages", [])),
+            {
+                "find_missing": "find_missing",
+                "process_answer": "process_answer",
+                END: END
+            }
+        )
         
         # 컴파일된 워크플로우 반환
         return workflow.compile()
     
     @staticmethod
-    def _run_collector(messages: List[Dict], model_name: str, 
-                      temperature: float, model_type: str, 
-                      api_key: Optional[str]) -> State:
+    def _prepare_collector(messages: List[Dict], model_name: str,
+                           temperature: float, model_type: str,
+                           api_key: Optional[str],
+                           session_id: str = DEFAULT_SESSION_ID) -> Tuple[Any, State, Dict[str, Any]]:
         """
-        메시지와 모델 설정으로 데이터 수집 워크플로우를 실행합니다.
+        워크플로우 실행에 필요한 그래프, 초기 상태, 실행 설정을 준비합니다.
         
         Args:
             messages: 대화 메시지 목록
@@ -175,35 +374,29 @@ class Agent:
             temperature: 모델 온도 설정
             model_type: 모델 유형 ("ollama" 또는 "openai")
             api_key: OpenAI 모델의 API 키
+            session_id: 대화 세션 ID
             
         Returns:
-            State: 워크플로우 실행 후 업데이트된 상태
+            Tuple[Any, State, Dict[str, Any]]: (컴파일된 그래프, 초기 상태, 실행 설정)
         """
         # 저장된 상태 로드
-        saved_state = StateManager.load()
+        saved_state = StateManager.load(session_id)
+        # 전달받은 메시지 창의 전체 대화 내 위치 (그 사이 오래된 메시지가 보관되어도 전체 메시지 수는 같음)
+        message_offset = max(
+            saved_state.get("message_offset", 0) + len(saved_state.get("messages", [])) - len(messages), 0
+        )
         
-        # 대화 상태에 따른 워크플로우 진입점 결정
-        if len(messages) == 0:
-            # 메시지가 없으면 수집할 데이터 찾기부터 시작
-            entry_point = "find_missing"
-        elif messages[-1].get("role") == "human":
-            # 마지막 메시지가 사용자의 메시지면 응답 처리
-            entry_point = "process_answer"
-        elif messages[-1].get("role") == "ai":
-            # 마지막 메시지가 AI의 메시지면 종료 (이미 질문이 생성됨)
-            entry_point = END
-        else:
-            # 기타 경우 (예: 시스템 메시지) 데이터 찾기부터 시작
-            entry_point = "find_missing"
-            
-        logger.info(f"Entry point: {entry_point}")
+        logger.info(f"Entry point: {Agent._select_entry_point(messages)}")
 
-        # 초기 상태 구성
+        # 초기 상태 구성 (노드는 읽기 전용 뷰로 상태를 받으므로 복사하지 않고 원본 데이터를 전달)
         state: State = {
-            "messages": messages,
+            "messages": unwrap(messages),
+            "message_offset": message_offset,
             "node_result": "",
-            "results": saved_state.get("results", {}),
-            "current_target": saved_state.get("current_target"),
+            "results": unwrap(saved_state.get("results", {})),
+            "current_target": unwrap(saved_state.get("current_target")),
+            # 진행 중인 세션은 시작할 때의 타겟 카탈로그 버전을 계속 사용
+            "target_version": resolve_target_version(saved_state.get("target_version")),
             "model": {
                 "name": model_name,
                 "temperature": temperature,
@@ -212,28 +405,167 @@ class Agent:
             }
         }
         
-        # 워크플로우 그래프 생성 및 실행
-        graph = Agent._create_collector_graph(entry_point)
+        # 캐시된 워크플로우 그래프 사용
+        graph = Agent._get_collector_graph()
+        
+        # 세션 ID와 모델 설정은 실행 설정으로 노드에 전달 (노드가 상태 파일을 다시 읽지 않도록 함)
+        config = {"configurable": {"session_id": session_id, "model": state["model"]}}
+        return graph, state, config
+    
+    @staticmethod
+    def _finish_collector(result: State, session_id: str) -> State:
+        """
+        워크플로우 실행 결과를 마무리하고 저장합니다.
+        
+        Args:
+            result: 워크플로우 실행 결과
+            session_id: 대화 세션 ID
+            
+        Returns:
+            State: 저장된 상태
+        """
+        # 모든 데이터가 수집되었으면 요약 메시지 추가
+        if result.get("node_result") == RESULT_ALL_TARGETS_COMPLETE:
+            result["messages"].append({
+                "role": "ai", 
+                "content": Agent._create_summary_message(result)
+            })
+        
+        # 결과 저장 및 반환
+        StateManager.save(result, session_id)
+        return result
+    
+    @staticmethod
+    def _run_collector(messages: List[Dict], model_name: str, 
+                      temperature: float, model_type: str, 
+                      api_key: Optional[str],
+                      session_id: str = DEFAULT_SESSION_ID) -> State:
+        """
+        메시지와 모델 설정으로 데이터 수집 워크플로우를 실행합니다.
         
+        Args:
+            messages: 대화 메시지 목록
+            model_name: 사용할 모델 이름
+            temperature: 모델 온도 설정
+            model_type: 모델 유형 ("ollama" 또는 "openai")
+            api_key: OpenAI 모델의 API 키
+            session_id: 대화 세션 ID
+            
+        Returns:
+            State: 워크플로우 실행 후 업데이트된 상태
+        """
+        graph, state, config = Agent._prepare_collector(
+            messages, model_name, temperature, model_type, api_key, session_id
+        )
         try:
             # 워크플로우 실행
-            result = graph.invoke(state)
+            result = graph.invoke(state, config=config)
+            return Agent._finish_collector(result, session_id)
             
-            # 모든 데이터가 수집되었으면 요약 메시지 추가
-            if result.get("node_result") == RESULT_ALL_TARGETS_COMPLETE:
-                result["messages"].append({
-                    "role": "ai", 
-                    "content": Agent._create_summary_message(result)
-                })
+        except Exception as e:
+            # 오류 처리
+            logger.error(f"Error processing response: {str(e)}")
+            return {**state, "node_result": "error"}
+        finally:
+            # 턴이 끝났으므로 모아 둔 상태 변경을 기록
+            StateManager.flush(session_id)
+    
+    @staticmethod
+    async def _arun_collector(messages: List[Dict], model_name: str,
+                              temperature: float, model_type: str,
+                              api_key: Optional[str],
+                              session_id: str = DEFAULT_SESSION_ID) -> State:
+        """
+        _run_collector()의 비동기 버전입니다.
+        
+        LLM 응답을 기다리는 동안 이벤트 루프를 양보하므로 여러 세션을 한 루프에서 동시에 처리할 수 있습니다.
+        상태 로드/저장은 메모리 캐시와 로컬 파일을 사용하므로 동기로 처리합니다.
+        
+        Args:
+            messages: 대화 메시지 목록
+            model_name: 사용할 모델 이름
+            temperature: 모델 온도 설정
+            model_type: 모델 유형 ("ollama" 또는 "openai")
+            api_key: OpenAI 모델의 API 키
+            session_id: 대화 세션 ID
             
-            # 결과 저장 및 반환
-            StateManager.save(result)
-            return result
+        Returns:
+            State: 워크플로우 실행 후 업데이트된 상태
+        """
+        graph, state, config = Agent._prepare_collector(
+            messages, model_name, temperature, model_type, api_key, session_id
+        )
+        try:
+            # 워크플로우 실행
+            result = await graph.ainvoke(state, config=config)
+            return Agent._finish_collector(result, session_id)
             
         except Exception as e:
             # 오류 처리
             logger.error(f"Error processing response: {str(e)}")
             return {**state, "node_result": "error"}
+        finally:
+            # 턴이 끝났으므로 모아 둔 상태 변경을 기록
+            StateManager.flush(session_id)
+    
+    @staticmethod
+    def _stream_collector(messages: List[Dict], model_name: str,
+                          temperature: float, model_type: str,
+                          api_key: Optional[str],
+                          session_id: str = DEFAULT_SESSION_ID) -> Iterator[Dict[str, Any]]:
+        """
+        _run_collector()의 스트리밍 버전입니다.
+        
+        그래프를 stream_mode=["custom", "values"]로 실행하여 노드가 내보낸 토큰을 전달하고,
+        마지막 상태는 실행이 끝난 뒤 한 번만 저장합니다.
+        
+        Args:
+            messages: 대화 메시지 목록
+            model_name: 사용할 모델 이름
+            temperature: 모델 온도 설정
+            model_type: 모델 유형 ("ollama" 또는 "openai")
+            api_key: OpenAI 모델의 API 키
+            session_id: 대화 세션 ID
+            
+        Yields:
+            Dict[str, Any]: 스트림 이벤트 (stream_user_message() 참고)
+        """
+        graph, state, config = Agent._prepare_collector(
+            messages, model_name, temperature, model_type, api_key, session_id
+        )
+        # 노드가 LLM 응답을 스트리밍하도록 표시
+        config["configurable"]["stream_tokens"] = True
+        
+        result = state
+        index = 0
+        try:
+            # 워크플로우 실행 (custom: 노드가 내보낸 토큰, values: 단계별 전체 상태)
+            for mode, chunk in graph.stream(state, config=config, stream_mode=["custom", "values"]):
+                if mode == "values":
+                    result = chunk
+                elif chunk.get("type") == STREAM_TOKEN:
+                    yield {"type": STREAM_TOKEN, "index": index, "content": chunk["content"]}
+                elif chunk.get("type") == STREAM_MESSAGE_END:
+                    index += 1
+            
+            message_count = len(result.get("messages", []))
+            result = Agent._finish_collector(result, session_id)
+            
+            # 실행 후 추가된 요약 메시지 전달
+            for message in result["messages"][message_count:]:
+                yield {"type": STREAM_TOKEN, "index": index, "content": message["content"]}
+                index += 1
+            
+        except Exception as e:
+            # 오류 처리
+            logger.error(f"Error processing response: {str(e)}")
+            result = {**state, "node_result": "error"}
+        finally:
+            # 턴이 끝났으므로 모아 둔 상태 변경을 기록
+            StateManager.flush(session_id)
+        
+        all_messages, new_messages = Agent._split_new_messages(result, messages)
+        yield {"type": "done", "messages": all_messages, "new_messages": new_messages}
     
     @staticmethod
     def _create_summary_message(result: State) -> str:
@@ -2,7 +2,9 @@ import streamlit as st
 import logging
 import re
 import html
-from typing import List, Dict, Tuple
+import uuid
+import itertools
+from typing import Any, Dict, Iterable, List, Tuple
 
 # 로깅을 INFO 레벨 메시지로 표시하도록 구성
 logging.basicConfig(
@@ -14,9 +16,13 @@ logging.basicConfig(
 
 from src.agent import Agent
 from src.state import StateManager
+from src.diagnostics import Diagnostics, KIND_EVALUATION
 
 logger = logging.getLogger(__name__)
 
+# "이전 메시지 불러오기" 한 번에 추가로 표시할 메시지 수
+HISTORY_PAGE_SIZE = 50
+
 
 def configure_page():
     """Streamlit 페이지 설정 구성"""
@@ -28,21 +34,32 @@ def configure_page():
 
 def initialize_session_state():
     """세션 상태 변수 초기화"""
+    if "session_id" not in st.session_state:
+        # 새로고침 후에도 같은 대화를 이어가도록 URL 쿼리 파라미터에 세션 ID 유지
+        session_id = st.query_params.get("session")
+        if not session_id or not re.fullmatch(r"[A-Za-z0-9_-]{1,64}", session_id):
+            session_id = uuid.uuid4().hex
+            st.query_params["session"] = session_id
+        st.session_state.session_id = session_id
     if "initialized" not in st.session_state:
         st.session_state.initialized = False
     if "last_model_settings" not in st.session_state:
         st.session_state.last_model_settings = None
+    if "history_start" not in st.session_state:
+        # 화면에 표시할 첫 메시지 위치 (None이면 최근 메시지 창만 표시)
+        st.session_state.history_start = None
 
 def render_sidebar() -> Tuple[str, float, str, str]:
     """사이드바 UI 요소 렌더링 및 모델 설정 관리"""
+    session_id = st.session_state.session_id
     with st.sidebar:
         st.header("Model Settings")
         
         # 이전에 모델이 선택되었는지 확인
-        is_model_selected = StateManager.is_model_selected()
+        is_model_selected = StateManager.is_model_selected(session_id)
         
         # 저장된 모델 설정 가져오기
-        saved_model_name, saved_temperature, saved_model_type, saved_api_key = StateManager.get_model_settings()
+        saved_model_name, saved_temperature, saved_model_type, saved_api_key = StateManager.get_model_settings(session_id)
         
         # 모델 유형 기본값 설정 (모델이 선택되지 않았으면 None)
         model_type_index = 0  # 기본값은 None
@@ -85,7 +102,7 @@ def render_sidebar() -> Tuple[str, float, str, str]:
             # 모델 설정 업데이트
             current_settings = (model, 0.2, model_type_id, None)
             if st.session_state.last_model_settings != current_settings:
-                StateManager.set_model_settings(model, 0.2, model_type_id, None)
+                StateManager.set_model_settings(model, 0.2, model_type_id, None, session_id=session_id)
                 st.session_state.initialized = False
                 st.session_state.last_model_settings = current_settings
             
@@ -119,7 +136,7 @@ def render_sidebar() -> Tuple[str, float, str, str]:
             if is_valid_configuration:
                 current_settings = (model, 0.2, model_type_id, api_key)
                 if st.session_state.last_model_settings != current_settings:
-                    StateManager.set_model_settings(model, 0.2, model_type_id, api_key)
+                    StateManager.set_model_settings(model, 0.2, model_type_id, api_key, session_id=session_id)
                     st.session_state.initialized = False
                     st.session_state.last_model_settings = current_settings
                 
@@ -128,7 +145,7 @@ def render_sidebar() -> Tuple[str, float, str, str]:
             st.info("👆 Please select a model type to continue")
             # None 선택 시 상태에서 모델 설정 제거
             if st.session_state.last_model_settings is not None:
-                StateManager.set_model_selected(False)
+                StateManager.set_model_selected(False, session_id=session_id)
                 st.session_state.initialized = False
                 st.session_state.last_model_settings = None
         
@@ -148,7 +165,7 @@ def render_sidebar() -> Tuple[str, float, str, str]:
             if is_valid_configuration:
                 current_settings = (model, temperature, model_type_id, api_key)
                 if st.session_state.last_model_settings != current_settings:
-                    StateManager.set_model_settings(model, temperature, model_type_id, api_key)
+                    StateManager.set_model_settings(model, temperature, model_type_id, api_key, session_id=session_id)
                     st.session_state.initialized = False
                     st.session_state.last_model_settings = current_settings
         else:
@@ -161,9 +178,10 @@ def render_sidebar() -> Tuple[str, float, str, str]:
         # 모델이 선택된 경우에만 초기화 버튼 활성화
         st.markdown("---")
         st.header("Conversation Management")
-        if st.button("Reset", use_container_width=True, disabled=not StateManager.is_model_selected()):
+        if st.button("Reset", use_container_width=True, disabled=not StateManager.is_model_selected(session_id)):
             # 상태 초기화
-            if StateManager.reset():
+            if StateManager.reset(session_id):
+                Diagnostics.clear(session_id)
                 st.session_state.initialized = False
                 st.success("Conversation has been reset. Refreshing page...")
                 st.rerun()
@@ -196,7 +214,8 @@ def render_sidebar() -> Tuple[str, float, str, str]:
 
 def render_results_section():
     """수집 결과 표시"""
-    results = StateManager.get_results()
+    session_id = st.session_state.session_id
+    results = StateManager.get_results(session_id)
     st.header("Collected Data")
     if results:        
         for target_id in results:
@@ -206,8 +225,30 @@ def render_results_section():
 
 def render_chat_messages():
     """대화 메시지 표시"""
-    messages = StateManager.get_messages()
-    for message in messages:
+    session_id = st.session_state.session_id
+    messages = StateManager.get_messages(session_id)
+    window_start = StateManager.get_message_count(session_id) - len(messages)
+
+    # 보관된 이전 메시지는 요청할 때만 저장소에서 불러옴
+    history_start = st.session_state.history_start
+    if history_start is None or history_start > window_start:
+        history_start = window_start
+    if history_start > 0 and st.button(f"Load earlier messages ({history_start} more)"):
+        history_start = max(history_start - HISTORY_PAGE_SIZE, 0)
+        st.session_state.history_start = history_start
+    if history_start < window_start:
+        messages = StateManager.get_message_history(session_id, history_start)
+
+    # 디버그 평가 결과는 진단 정보에서 가져와 기록 시점의 메시지 위치에 표시
+    debug_records: Dict[int, List[Dict]] = {}
+    for record in Diagnostics.get_records(session_id, KIND_EVALUATION):
+        if record["position"] is not None and record["position"] >= history_start:
+            debug_records.setdefault(record["position"], []).append(record)
+
+    for position, message in enumerate(messages, start=history_start):
+        for record in debug_records.pop(position, []):
+            render_debug_message(record["content"])
+
         if message["role"] == "system":
             continue
         elif message["role"] == "human":
@@ -217,8 +258,35 @@ def render_chat_messages():
             with st.chat_message("assistant"):
                 st.markdown(message["content"])
         elif message["role"] == "debug":
-            with st.chat_message("debug"):
-                st.markdown(message["content"])
+            # 이전 버전에서 대화 상태에 저장된 디버그 메시지
+            render_debug_message(message["content"])
+
+    # 마지막 메시지 이후에 기록된 디버그 평가 결과
+    for position in sorted(debug_records):
+        for record in debug_records[position]:
+            render_debug_message(record["content"])
+
+def render_debug_message(content: str):
+    """디버그 메시지 표시"""
+    with st.chat_message("debug"):
+        st.markdown(content)
+
+def render_streamed_reply(events: Iterable[Dict[str, Any]]):
+    """
+    Agent의 스트림 이벤트를 AI 메시지마다 하나의 말풍선으로 표시합니다.
+
+    첫 토큰이 도착할 때까지만 스피너를 표시하고, 이후에는 토큰을 도착하는 대로 이어서 표시합니다.
+    """
+    # "done" 이벤트까지 소비해야 상태 저장이 끝나므로 토큰 이외의 이벤트는 건너뛰며 끝까지 순회
+    tokens = (event for event in events if event["type"] == "token")
+    with st.spinner("Thinking..."):
+        first = next(tokens, None)
+    if first is None:
+        return
+
+    for _, group in itertools.groupby(itertools.chain([first], tokens), key=lambda event: event["index"]):
+        with st.chat_message("assistant"):
+            st.write_stream(event["content"] for event in group)
 
 def main():
     """메인 애플리케이션 흐름"""
@@ -228,10 +296,11 @@ def main():
     st.title("📋 Data Collection Agent")
     st.markdown("An AI agent that collects information through conversations with users.")
     
+    session_id = st.session_state.session_id
     model, temperature, model_type, api_key = render_sidebar()
     
     # 모델이 선택되지 않은 경우 안내 메시지만 표시하고 함수 종료
-    if not StateManager.is_model_selected():
+    if not StateManager.is_model_selected(session_id):
         st.info("👈 모델을 선택해야 대화를 시작할 수 있습니다. 사이드바에서 모델을 선택해주세요.")
         return
     
@@ -241,38 +310,28 @@ def main():
     render_chat_messages()
     
     if not st.session_state.initialized:
-        # 에이전트 초기화 및 응답 표시
-        with st.spinner("Initializing agent..."):
-            # 모든 매개변수를 명시적으로 전달
-            model_settings = StateManager.get_model_settings()
-            _, new_messages = Agent.initialize_chat(
-                model_name=model_settings[0], 
-                temperature=model_settings[1], 
-                model_type=model_settings[2], 
-                api_key=model_settings[3]
-            )
-            
-            for msg in new_messages:
-                with st.chat_message("assistant"):
-                    st.markdown(msg["content"])
+        # 에이전트 초기화 및 응답을 생성되는 대로 표시
+        # 모든 매개변수를 명시적으로 전달
+        model_settings = StateManager.get_model_settings(session_id)
+        render_streamed_reply(Agent.stream_initialize_chat(
+            model_name=model_settings[0], 
+            temperature=model_settings[1], 
+            model_type=model_settings[2], 
+            api_key=model_settings[3],
+            session_id=session_id
+        ))
                     
         st.session_state.initialized = True
     
     # 채팅 입력 필드 표시 (모델이 선택된 경우에만 실행)
-    user_input = st.chat_input("Enter your message...", disabled=not StateManager.is_model_selected())
+    user_input = st.chat_input("Enter your message...", disabled=not StateManager.is_model_selected(session_id))
     if user_input:
         # UI에 사용자 메시지 추가
         with st.chat_message("user"):
             st.markdown(user_input)
         
-        # 에이전트로 처리하고 새 메시지 가져오기
-        with st.spinner("Thinking..."):
-            _, new_ai_messages = Agent.add_user_message(user_input)
-            
-            # 새 AI 응답 표시
-            for msg in new_ai_messages:
-                with st.chat_message("assistant"):
-                    st.markdown(msg["content"])
+        # 에이전트로 처리하고 새 AI 응답을 생성되는 대로 표시
+        render_streamed_reply(Agent.stream_user_message(user_input, session_id=session_id))
         
         # 필요한 경우에만 재실행 (사용자 입력 후 UI 업데이트를 위해)
         st.rerun()
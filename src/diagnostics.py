@@ -0,0 +1,160 @@
+"""
+진단 정보(디버그 평가 결과 등)를 대화 상태와 분리하여 보관하는 모듈
+
+노드가 만든 LLM 원본 평가 결과처럼 사용자에게 보여줄 대화가 아닌 진단 정보는
+State["messages"]에 넣지 않고 이 모듈에 기록합니다.
+따라서 상태 저장, 복사, 이후 프롬프트의 크기가 진단 정보만큼 커지지 않습니다.
+
+1. 세션마다 최근 기록만 유지하는 메모리 내 링 버퍼 (화면의 디버그 표시용)
+2. 선택적으로, 크기 기준으로 교체되는 JSON Lines 파일 (COLLECTOR_DIAGNOSTICS_FILE=true)
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from logging.handlers import RotatingFileHandler
+from typing import Any, Deque, Dict, List, Optional
+
+from src.storage import DEFAULT_SESSION_ID
+from src.utils.paths import get_project_paths
+from src.utils.settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+# === 진단 정보 설정 ===
+# 세션마다 메모리에 유지할 최근 기록 수
+_BUFFER_SIZE: int = get_setting("diagnostics_buffer_size", 50)
+# 진단 정보를 유지할 최대 세션 수 (초과 시 가장 오래 사용되지 않은 세션부터 제거)
+_MAX_SESSIONS: int = get_setting("diagnostics_max_sessions", 256)
+# 파일 기록 여부와 교체 기준 크기(바이트), 보관할 이전 파일 수
+_FILE_ENABLED: bool = get_setting("diagnostics_file", False)
+_FILE_MAX_BYTES: int = get_setting("diagnostics_file_max_bytes", 5 * 1024 * 1024)
+_FILE_BACKUP_COUNT: int = get_setting("diagnostics_file_backup_count", 3)
+
+# 진단 기록 종류
+KIND_EVALUATION = "evaluation"  # process_answer의 LLM 평가 결과
+
+# === 메모리 버퍼 변수 ===
+# 세션 ID → 최근 진단 기록 (가장 최근에 사용된 세션이 끝에 위치)
+_BUFFERS: "OrderedDict[str, Deque[Dict[str, Any]]]" = OrderedDict()
+_BUFFERS_LOCK = threading.Lock()
+
+# 파일 기록용 로거 (처음 기록할 때 설정)
+_FILE_LOGGER: Optional[logging.Logger] = None
+_FILE_LOGGER_LOCK = threading.Lock()
+
+
+def _get_file_logger() -> logging.Logger:
+    """
+    진단 파일 기록용 로거를 반환합니다. (없으면 생성)
+
+    애플리케이션 로그와 섞이지 않도록 상위 로거로 전파하지 않습니다.
+
+    Returns:
+        logging.Logger: 진단 파일 로거
+    """
+    global _FILE_LOGGER
+
+    with _FILE_LOGGER_LOCK:
+        if _FILE_LOGGER is None:
+            diagnostics_file = get_project_paths()["diagnostics_file"]
+            diagnostics_file.parent.mkdir(parents=True, exist_ok=True)
+
+            handler = RotatingFileHandler(diagnostics_file, maxBytes=_FILE_MAX_BYTES,
+                                          backupCount=_FILE_BACKUP_COUNT, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+
+            file_logger = logging.getLogger(f"{__name__}.file")
+            file_logger.setLevel(logging.INFO)
+            file_logger.propagate = False
+            file_logger.addHandler(handler)
+            _FILE_LOGGER = file_logger
+            logger.info(f"진단 정보를 파일에 기록합니다: {diagnostics_file}")
+        return _FILE_LOGGER
+
+
+class Diagnostics:
+    """
+    진단 정보 기록/조회를 위한 유틸리티 클래스
+
+    StateManager와 마찬가지로 정적 메서드로 구성되며, 모든 메서드는 session_id로 대상 세션을 지정합니다.
+    """
+
+    @staticmethod
+    def record(kind: str, content: str, session_id: str = DEFAULT_SESSION_ID,
+               position: Optional[int] = None, **extra: Any) -> Dict[str, Any]:
+        """
+        진단 정보를 기록합니다.
+
+        Args:
+            kind: 기록 종류 (예: KIND_EVALUATION)
+            content: 기록 내용
+            session_id: 세션 ID
+            position: 기록 시점의 전체 메시지 수 (화면에서 해당 메시지 뒤에 표시하는 데 사용)
+            **extra: 함께 기록할 추가 정보 (예: target_id)
+
+        Returns:
+            Dict[str, Any]: 기록된 항목
+        """
+        record = {
+            "time": time.time(),
+            "session_id": session_id,
+            "kind": kind,
+            "position": position,
+            "content": content,
+            **extra
+        }
+
+        with _BUFFERS_LOCK:
+            buffer = _BUFFERS.get(session_id)
+            if buffer is None:
+                buffer = deque(maxlen=_BUFFER_SIZE)
+                _BUFFERS[session_id] = buffer
+                # 세션 수 제한 초과 시 오래된 세션의 버퍼 제거
+                while len(_BUFFERS) > _MAX_SESSIONS:
+                    _BUFFERS.popitem(last=False)
+            else:
+                _BUFFERS.move_to_end(session_id)
+            buffer.append(record)
+
+        if _FILE_ENABLED:
+            try:
+                _get_file_logger().info(json.dumps(record, ensure_ascii=False))
+            except Exception as e:
+                logger.error(f"진단 정보 파일 기록 중 오류 발생: {str(e)}")
+
+        return record
+
+    @staticmethod
+    def get_records(session_id: str = DEFAULT_SESSION_ID, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        세션의 최근 진단 기록을 오래된 순서로 반환합니다.
+
+        Args:
+            session_id: 세션 ID
+            kind: 가져올 기록 종류 (None이면 모든 종류)
+
+        Returns:
+            List[Dict[str, Any]]: 진단 기록 목록
+        """
+        with _BUFFERS_LOCK:
+            records = list(_BUFFERS.get(session_id, ()))
+        if kind is not None:
+            records = [record for record in records if record["kind"] == kind]
+        return records
+
+    @staticmethod
+    def clear(session_id: Optional[str] = None) -> None:
+        """
+        메모리에 보관된 진단 기록을 삭제합니다. (파일 기록은 유지)
+
+        Args:
+            session_id: 삭제할 세션 ID (None이면 모든 세션)
+        """
+        with _BUFFERS_LOCK:
+            if session_id is None:
+                _BUFFERS.clear()
+            else:
+                _BUFFERS.pop(session_id, None)
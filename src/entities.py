@@ -5,7 +5,7 @@
 순환 참조를 방지하기 위해 타입 정의를 중앙화합니다.
 """
 
-from typing import Dict, List, Optional, Any, TypedDict, Union, Literal
+from typing import Annotated, Dict, List, Optional, Any, TypedDict, Union, Literal
 
 
 class TargetItem(TypedDict):
@@ -15,6 +15,8 @@ class TargetItem(TypedDict):
     required: bool  # 필수 여부
     example: Any  # 예시 데이터
     id: Optional[str]  # 항목 ID
+    group: Optional[str]  # 함께 질문할 그룹 이름 (target.json에서 선언, 선택)
+    members: Optional[Dict[str, Any]]  # 묶음 질문 대상인 경우 구성 항목 (ID → 항목)
 
 
 class Target(TypedDict):
@@ -30,13 +32,30 @@ class Model(TypedDict):
     api_key: Optional[str]  # OpenAI API 키 (type이 "openai"일 경우에만 사용)
 
 
+def append_messages(left: List[Dict[str, Any]], right: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """messages 리듀서: 노드가 반환한 새 메시지를 기존 메시지 뒤에 추가 (기존 목록은 변경하지 않음)"""
+    return [*left, *right]
+
+
+def merge_results(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """results 리듀서: 노드가 반환한 타겟별 결과를 기존 결과에 병합 (기존 사전은 변경하지 않음)"""
+    return {**left, **right}
+
+
 class State(TypedDict):
-    """LangGraph 워크플로우의 상태를 정의하는 타입"""
-    messages: List[Dict[str, Any]]  # 채팅 기록
+    """
+    LangGraph 워크플로우의 상태를 정의하는 타입
+
+    노드는 입력 상태를 변경하지 않고 바뀐 필드만 반환합니다.
+    messages와 results는 리듀서로 기존 값에 합쳐지고, 나머지 필드는 반환한 값으로 교체됩니다.
+    """
+    messages: Annotated[List[Dict[str, Any]], append_messages]  # 채팅 기록 (최근 메시지 창, 새 메시지만 반환)
+    message_offset: int  # 창 이전에 보관된 메시지 수 (messages[0]의 전체 대화 내 위치)
     node_result: str  # 현재 노드의 실행 결과 (문자열 상수)
-    results: Dict[str, Any]  # 수집된 결과 (대상 id를 키로 사용)
+    results: Annotated[Dict[str, Any], merge_results]  # 수집된 결과 (대상 id를 키로 사용, 새 결과만 반환)
     current_target: Optional[TargetItem]  # 현재 처리 중인 대상
     model: Optional[Model]  # 모델 설정
+    target_version: str  # 세션이 고정된 타겟 카탈로그 버전 (target.json 내용 해시)
 
 
 # 노드 결과 상수 정의
@@ -1,11 +1,14 @@
 """Nodes for the collector LangGraph workflow."""
 
-from src.nodes.find_missing import find_missing
-from src.nodes.generate_question import generate_question
-from src.nodes.process_answer import process_answer
+from src.nodes.find_missing import find_missing, afind_missing
+from src.nodes.generate_question import generate_question, agenerate_question
+from src.nodes.process_answer import process_answer, aprocess_answer
 
 __all__ = [
     "find_missing", 
     "generate_question",
-    "process_answer"
+    "process_answer",
+    "afind_missing",
+    "agenerate_question",
+    "aprocess_answer"
 ] 
\ No newline at end of file
@@ -1,57 +1,120 @@
-from typing import Dict, Any, Tuple, Optional, List
+from typing import Dict, Any, Iterator, Tuple, Optional, List
 from src.state import State
-from src.target import TargetItem, Target, find_first_missing_target, get_targets
+from src.target import (
+    TargetItem, Target, find_first_missing_target, get_targets, group_first_missing_target, get_member_items
+)
 import logging
 from src.utils.decorator import node
+from src.utils.settings import get_setting
 from src.entities import RESULT_TARGET_FOUND, RESULT_ALL_TARGETS_COMPLETE, RESULT_ERROR
 
 logger = logging.getLogger(__name__)
 
+# 작거나 관련된 항목(같은 group 선언, 같은 종류의 짧은 예시)을 한 질문으로 묶을지 여부
+_GROUPING: bool = get_setting("question_grouping", False)
+# 한 질문으로 묶을 최대 항목 수
+_GROUP_MAX: int = get_setting("question_group_max", 3)
+# 짧은 예시로 취급할 최대 문자열 길이
+_GROUP_SHORT_LENGTH: int = get_setting("question_group_short_length", 60)
+
+
+def select_next_target(targets: Dict[str, TargetItem], results: Dict[str, Any]) -> Optional[TargetItem]:
+    """
+    다음에 질문할 타겟을 고릅니다. (묶음 질문 설정이 켜져 있으면 함께 질문할 항목을 묶은 타겟)
+
+    Args:
+        targets: 대상 항목 (ID → 항목)
+        results: 수집된 결과
+
+    Returns:
+        Optional[TargetItem]: 다음 타겟 (id 포함, 모든 필수 타겟이 수집되었으면 None)
+    """
+    targets_wrapped: Target = {"__root__": targets}
+    if _GROUPING:
+        return group_first_missing_target(targets_wrapped, results, _GROUP_MAX, _GROUP_SHORT_LENGTH)
+
+    missing_target = find_first_missing_target(targets_wrapped, results)
+    if missing_target is None:
+        return None
+    target_id, target_item = missing_target
+    target_copy = dict(target_item)
+    target_copy["id"] = target_id
+    return target_copy
+
+
+def iter_question_targets(targets: Dict[str, TargetItem]) -> Iterator[TargetItem]:
+    """
+    모든 답변이 충분하다고 가정할 때 차례로 질문하게 될 타겟을 순서대로 반환합니다. (질문 미리 생성용)
+
+    Args:
+        targets: 대상 항목 (ID → 항목)
+
+    Yields:
+        TargetItem: 질문할 타겟 (묶음 타겟 포함)
+    """
+    results: Dict[str, Any] = {}
+    while True:
+        next_target = select_next_target(targets, results)
+        if next_target is None:
+            return
+        yield next_target
+        for target_id in get_member_items(next_target):
+            results[target_id] = None
+
 @node
 def find_missing(state: State) -> State:
     """외부에서 타겟이 제공되는 LangGraph 노드 함수"""
-    # 타겟 모듈에서 타겟 가져오기
-    targets = get_targets()
+    # 타겟 모듈에서 세션이 고정된 버전의 타겟 가져오기
+    targets = get_targets(state.get("target_version"))
     return find_missing_with_targets(state, targets) 
 
 
+@node
+async def afind_missing(state: State) -> State:
+    """find_missing()의 비동기 버전 (LLM 호출이 없으므로 이벤트 루프에서 바로 실행)"""
+    return find_missing_with_targets(state, get_targets(state.get("target_version")))
+
+
 def find_missing_with_targets(state: State, targets: Dict[str, TargetItem]) -> State:
-    """상태와 타겟을 가지고 다음 처리할 항목을 찾는 함수"""
+    """상태와 타겟을 가지고 다음 처리할 항목을 찾는 함수 (바뀐 필드만 반환)"""
     try:        
-        # 처리할 타겟 찾기
-        targets_wrapped: Target = {"__root__": targets}
+        # 처리할 타겟 찾기 (묶음 질문이면 여러 항목을 묶은 타겟)
         results = state.get("results", {})        
-        missing_target = find_first_missing_target(targets_wrapped, results)
+        next_target = select_next_target(targets, results)
         
-        if missing_target:
+        if next_target:
             # 타겟을 찾았을 때
-            target_id, target_item = missing_target
-            logger.info(f"처리할 타겟을 찾았습니다: {target_id}")
-            
-            # 현재 타겟 설정 - id 포함
-            target_copy = dict(target_item)
-            target_copy["id"] = target_id
+            logger.info(f"처리할 타겟을 찾았습니다: {next_target['id']}")
             
-            # 직접 상태 업데이트
-            state["current_target"] = target_copy
-            state["node_result"] = RESULT_TARGET_FOUND
-            return state
+            # 바뀐 필드만 반환 - id 포함
+            return {"current_target": next_target, "node_result": RESULT_TARGET_FOUND}
         else:
             # 모든 필수 타겟이 완료되었을 때
             logger.info("모든 필수 타겟이 완료되었습니다")
             
-            # 직접 상태 업데이트
-            state["current_target"] = None
-            state["node_result"] = RESULT_ALL_TARGETS_COMPLETE
-            return state
+            # 바뀐 필드만 반환
+            return {"current_target": None, "node_result": RESULT_ALL_TARGETS_COMPLETE}
     
     except Exception as e:
         # 예외 처리 - 오류 정보 로깅
         logger.error(f"find_missing 노드에서 오류 발생: {str(e)}")
         
-        # 직접 상태 업데이트
-        state["node_result"] = RESULT_ERROR
-        state["error"] = str(e)
-        return state
+        # 바뀐 필드만 반환
+        return {"node_result": RESULT_ERROR, "error": str(e)}
+
+
+def predict_next_target(state: State, current_target: TargetItem) -> Optional[TargetItem]:
+    """
+    현재 타겟이 충분한 답변으로 저장된다고 가정하고 find_missing이 다음에 고를 타겟을 예측합니다.
 
+    Args:
+        state: 현재 상태
+        current_target: 답변을 평가 중인 타겟
 
+    Returns:
+        Optional[TargetItem]: 다음 타겟 (id 포함, 남은 타겟이 없으면 None)
+    """
+    results = dict(state.get("results", {}))
+    for target_id in get_member_items(current_target):
+        results[target_id] = None
+    return select_next_target(get_targets(state.get("target_version")), results)
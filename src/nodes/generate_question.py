@@ -1,78 +1,328 @@
+import hashlib
 import json
 import logging
-from src.state import State
-from src.target import TargetItem
-from src.utils.model import invoke
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+from langchain_core.runnables import RunnableConfig
+from src.state import State, DEFAULT_SESSION_ID
+from src.target import TargetItem, get_targets, get_target_hash, get_target_version, add_catalog_listener
+from src.utils.model import invoke, ainvoke, get_model_config
 from src.utils.convert import dedent_prompt
 from src.utils.decorator import node
+from src.utils.settings import get_setting
+from src.utils.streaming import is_streaming, stream_invoke, end_message, emit_messages
+from src.utils import metrics, speculation
+from src.nodes.find_missing import iter_question_targets
+from src.utils.llm_cache import make_cache_key
+from src.utils.readonly import thaw
+from src.utils.warmup import WarmupCache
 from src.entities import RESULT_QUESTION_GENERATED, RESULT_ERROR
 
 logger = logging.getLogger(__name__)
 
-@node
-def generate_question(state: State) -> State:
-    try:       
-        # 프롬프트 템플릿
-        prompt_template = """\
-        <goal>
-            You are an assistant collecting information from users. You need to collect information about the following item:           
-            <name>{name}</name>
-            <description>{description}</description>
-            <example>{example}</example>
-        </goal>
-
-        <task>
-            Please generate a question to collect information for "<goal>".
-            Reference the description and examples, and if necessary, mention the examples to help the user understand how to respond.
-            Generate only the question. Do not include other explanations or meta information.
-        </task>
-
-        <thinking>
-            Please use Chain of Thought (CoT) method to break down your thinking process:
-            1. First, understand what kind of information is needed based on the name and description
-            2. Analyze the example data structure to understand what format is expected
-            3. Consider what is the best way to ask this question to get a clear and comprehensive answer
-            4. Formulate a question that will guide the user to provide information in the expected format
-            5. Ensure the question is clear, specific, and easy to understand
-        </thinking>
-
-        <output>
-            IMPORTANT: You MUST NOT include your thinking process in the final output. DO NOT include any text like "</thinking>" in your response.
-            
-            Your response must contain ONLY the direct question for the user. 
-            Do not include explanations, XML tags, or any other meta-information.
-            
-            Example of correct output format:
-            "What is the purpose of this project?"
-
-            Example of INCORRECT output format:
-            "Here's my thinking process: ..."
-            "Here's my formulated question: ..."
-            
-            REMEMBER: Your output should be ONLY a simple question. No explanations before or after.
-        </output>
-        """
+# 질문 생성 LLM 호출의 시간 예산 (초, 재시도 포함)
+_TIMEOUT: float = get_setting("generate_question_timeout", 60.0)
+
+# 모델을 선택하면 모든 필수 타겟의 질문을 백그라운드에서 미리 생성할지 여부
+_WARMUP: bool = get_setting("question_warmup", False)
+# 타겟 내용 해시와 모델별로 생성한 질문 (진행 중인 생성도 공유)
+_QUESTION_CACHE = WarmupCache(
+    max_entries=get_setting("question_cache_size", 256),
+    workers=get_setting("question_warmup_workers", 4),
+    name="question-warmup"
+)
+# 질문을 미리 생성한 모델 → 미리 생성한 타겟 카탈로그 버전
+# (키는 모델 타입, 이름, 온도, API 키 해시이며 API 키 자체는 보관하지 않음)
+_WARMED_MODELS: "OrderedDict[Tuple, str]" = OrderedDict()
+_WARMED_MODELS_MAX = 8
+# 요청 스레드와 카탈로그 교체 스레드가 함께 사용
+_WARMED_MODELS_LOCK = threading.Lock()
+
+def create_question_prompt(state: State) -> str:
+    """현재 타겟에 대한 질문 생성 프롬프트 생성"""
+    return create_target_question_prompt(thaw(state["current_target"]))
+
+
+def create_target_question_prompt(target: TargetItem) -> str:
+    """타겟에 대한 질문 생성 프롬프트 생성 (질문은 타겟 내용에만 의존)"""
+    # 프롬프트 템플릿
+    prompt_template = """\
+    <goal>
+        You are an assistant collecting information from users. You need to collect information about the following item:           
+        <name>{name}</name>
+        <description>{description}</description>
+        <example>{example}</example>
+    </goal>
+
+    <task>
+        Please generate a question to collect information for "<goal>".
+        Reference the description and examples, and if necessary, mention the examples to help the user understand how to respond.
+        Generate only the question. Do not include other explanations or meta information.
+    </task>
+
+    <thinking>
+        Please use Chain of Thought (CoT) method to break down your thinking process:
+        1. First, understand what kind of information is needed based on the name and description
+        2. Analyze the example data structure to understand what format is expected
+        3. Consider what is the best way to ask this question to get a clear and comprehensive answer
+        4. Formulate a question that will guide the user to provide information in the expected format
+        5. Ensure the question is clear, specific, and easy to understand
+    </thinking>
+
+    <output>
+        IMPORTANT: You MUST NOT include your thinking process in the final output. DO NOT include any text like "</thinking>" in your response.
         
-        # 프롬프트에 변수 채우기
-        prompt = dedent_prompt(prompt_template).format(
-            name=state["current_target"]["name"],
-            description=state["current_target"]["description"],
-            example=json.dumps(state["current_target"]["example"], ensure_ascii=False, indent=2)
-        )
-    
-        # 중앙 invoke 함수 호출
-        question = invoke(prompt)
+        Your response must contain ONLY the direct question for the user. 
+        Do not include explanations, XML tags, or any other meta-information.
         
-        # 프롬프트 실행 결과를 메시지에 추가
-        if "messages" not in state:
-            state["messages"] = []
+        Example of correct output format:
+        "What is the purpose of this project?"
+
+        Example of INCORRECT output format:
+        "Here's my thinking process: ..."
+        "Here's my formulated question: ..."
         
-        state["messages"].append({"role": "ai", "content": question})
-        state["node_result"] = RESULT_QUESTION_GENERATED
-        return state
+        REMEMBER: Your output should be ONLY a simple question. No explanations before or after.
+    </output>
+    """
+    
+    # 프롬프트에 변수 채우기
+    return dedent_prompt(prompt_template).format(
+        name=target["name"],
+        description=target["description"],
+        example=json.dumps(target["example"], ensure_ascii=False, indent=2)
+    )
+
+
+def _session_id(config: Optional[RunnableConfig]) -> str:
+    return ((config or {}).get("configurable") or {}).get("session_id", DEFAULT_SESSION_ID)
+
+
+def question_cache_key(model, target: TargetItem) -> str:
+    """
+    질문 캐시 키를 만듭니다. (질문은 타겟 내용과 모델에만 의존)
+
+    Args:
+        model: 모델 설정 (name, temperature, type, api_key)
+        target: 대상 항목
+
+    Returns:
+        str: 캐시 키
+    """
+    model = model or {}
+    return make_cache_key(model.get("type") or "ollama", model.get("name"), model.get("temperature"),
+                          get_target_hash(target))
+
+
+def warmup_questions(model, targets: Optional[Dict[str, TargetItem]] = None) -> int:
+    """
+    모든 필수 타겟의 질문을 백그라운드에서 미리 생성합니다. (COLLECTOR_QUESTION_WARMUP=true인 경우)
+
+    이미 생성했거나 생성 중인 질문은 다시 생성하지 않으며, 질문할 순서대로 시작하므로
+    첫 질문이 가장 먼저 준비됩니다. 묶음 질문 설정이 켜져 있으면 묶음 타겟의 질문을 생성합니다.
+    target.json의 항목으로 생성하는 경우, 같은 모델로 현재 카탈로그 버전의 질문을 이미 생성했으면 건너뜁니다.
+
+    Args:
+        model: 모델 설정 (name, temperature, type, api_key)
+        targets: 대상 항목 (None이면 target.json의 현재 버전 항목)
+
+    Returns:
+        int: 새로 생성을 시작한 질문 수
+    """
+    if not _WARMUP or model is None:
+        return 0
+
+    if targets is None:
+        version = get_target_version()
+        model_key = _warmed_model_key(model)
+        with _WARMED_MODELS_LOCK:
+            warmed = _WARMED_MODELS.get(model_key) == version
+            _WARMED_MODELS[model_key] = version
+            _WARMED_MODELS.move_to_end(model_key)
+            while len(_WARMED_MODELS) > _WARMED_MODELS_MAX:
+                _WARMED_MODELS.popitem(last=False)
+        if warmed:
+            return 0
+        targets = get_targets(version)
+
+    started = 0
+    for target in iter_question_targets(targets):
+        prompt = create_target_question_prompt(target)
+        if _QUESTION_CACHE.submit(question_cache_key(model, target),
+                                  lambda prompt=prompt: invoke(prompt, model=model, timeout=_TIMEOUT),
+                                  tag=get_target_hash(target)):
+            started += 1
+
+    if started:
+        logger.info(f"질문 {started}개를 미리 생성합니다: {model.get('name')}")
+    return started
+
+
+def _warmed_model_key(model) -> Tuple:
+    """미리 생성한 모델을 구분하는 키 (모델 타입, 이름, 온도, API 키 해시)"""
+    api_key = model.get("api_key")
+    api_key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest() if api_key else None
+    return (model.get("type") or "ollama", model.get("name"), model.get("temperature"), api_key_hash)
+
+
+def get_question_cache_stats() -> Dict[str, int]:
+    """
+    질문 캐시 통계를 반환합니다.
+
+    Returns:
+        Dict[str, int]: 생성 시작(submitted), 적중(hits), 적중 실패(misses), 생성 오류(failures) 횟수와 항목 수(entries)
+    """
+    return _QUESTION_CACHE.get_stats()
+
+
+def _is_question_cached(model, target: TargetItem) -> bool:
+    return _WARMUP and _QUESTION_CACHE.contains(question_cache_key(model, target))
+
+
+def _remember_question(model, target: TargetItem, question: str) -> None:
+    if _WARMUP:
+        _QUESTION_CACHE.put(question_cache_key(model, target), question, tag=get_target_hash(target))
+
+
+def _on_catalog_reload(old_targets: Dict[str, TargetItem], new_targets: Dict[str, TargetItem],
+                       changed: Set[str]) -> None:
+    """
+    타겟 카탈로그가 바뀌면 정의가 바뀐 타겟의 미리 생성한 질문만 버리고 새 정의의 질문을 미리 생성합니다.
+
+    질문 캐시 키는 타겟 내용 해시이므로 바뀌지 않은 타겟(묶음 질문이면 구성 항목이 모두 같은 묶음)의 질문은 그대로 사용됩니다.
+    API 키가 필요한 모델은 키를 보관하지 않으므로, 다음 대화 초기화 때 새 버전의 질문을 미리 생성합니다.
+    """
+    if not _WARMUP or not changed:
+        return
+    stale = {get_target_hash(target) for target in iter_question_targets(old_targets)} \
+        - {get_target_hash(target) for target in iter_question_targets(new_targets)}
+    discarded = _QUESTION_CACHE.discard_tags(stale)
+    logger.info(f"타겟 정의가 바뀌어 미리 생성한 질문 {discarded}개를 버립니다.")
+    with _WARMED_MODELS_LOCK:
+        model_keys = list(_WARMED_MODELS)
+    for model_type, name, temperature, api_key_hash in model_keys:
+        if api_key_hash is None:
+            warmup_questions({"name": name, "temperature": temperature, "type": model_type, "api_key": None})
+
+
+add_catalog_listener(_on_catalog_reload)
+
+
+def speculate_question(config: Optional[RunnableConfig], model, target: TargetItem) -> None:
+    """
+    다음 타겟의 질문 생성을 작업 스레드에서 미리 시작합니다.
+
+    결과는 같은 세션의 다음 generate_question()이 같은 프롬프트로 호출될 때 사용됩니다.
+
+    Args:
+        config: LangGraph 실행 설정 (세션 ID)
+        model: 모델 설정
+        target: 다음에 질문할 타겟
+    """
+    if _is_question_cached(model, target):
+        return
+    prompt = create_target_question_prompt(target)
+    speculation.start(_session_id(config), speculation.speculation_key(model, prompt),
+                      lambda: invoke(prompt, model=model, timeout=_TIMEOUT))
+
+
+def aspeculate_question(config: Optional[RunnableConfig], model, target: TargetItem) -> None:
+    """speculate_question()의 비동기 버전 (현재 이벤트 루프의 작업으로 시작)"""
+    if _is_question_cached(model, target):
+        return
+    prompt = create_target_question_prompt(target)
+    speculation.astart(_session_id(config), speculation.speculation_key(model, prompt),
+                       ainvoke(prompt, model=model, timeout=_TIMEOUT))
+
+
+def apply_question(question: str) -> State:
+    """생성된 질문을 메시지에 추가하는 상태 변경분"""
+    return {"messages": [{"role": "ai", "content": question}], "node_result": RESULT_QUESTION_GENERATED}
+
+
+def _deadline() -> Optional[float]:
+    """노드 시간 예산의 마감 시각 (예산이 0 이하이면 제한 없음)"""
+    return time.monotonic() + _TIMEOUT if _TIMEOUT > 0 else None
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    """
+    노드 시간 예산 중 남은 시간
+
+    다 쓴 경우 아주 작은 값을 반환하여 호출이 바로 시간 초과되도록 하고,
+    제한이 없으면 0(invoke()에서 제한 없음)을 반환합니다.
+    """
+    if deadline is None:
+        return 0
+    return max(deadline - time.monotonic(), 0.001)
+
+
+@node
+def generate_question(state: State, config: Optional[RunnableConfig] = None) -> State:
+    try:       
+        # 캐시/추측 결과를 기다리는 시간과 질문 생성 호출이 노드의 시간 예산을 나누어 사용
+        deadline = _deadline()
+        target = thaw(state["current_target"])
+        prompt = create_target_question_prompt(target)
+        model = get_model_config(config, state)
+
+        # 미리 생성한 질문(워밍업) 또는 이전 답변을 평가하는 동안 추측 생성한 질문이 있으면 사용
+        question = _QUESTION_CACHE.get(question_cache_key(model, target),
+                                       timeout=_remaining(deadline) or None) if _WARMUP else None
+        if question is not None:
+            metrics.record_cache_hit(metrics.CACHE_QUESTION)
+        else:
+            question = speculation.take(_session_id(config), speculation.speculation_key(model, prompt),
+                                        timeout=_remaining(deadline) or None)
+            if question is not None:
+                metrics.record_cache_hit(metrics.CACHE_SPECULATION)
+        if question is not None:
+            if is_streaming(config):
+                emit_messages([{"role": "ai", "content": question}])
+        elif is_streaming(config):
+            # 질문을 생성되는 대로 화면에 전달
+            question, _ = stream_invoke(prompt, model=model, timeout=_remaining(deadline))
+            end_message()
+        else:
+            # 중앙 invoke 함수 호출 (사용자가 기다리는 호출이므로 응답이 늦으면 헤지 요청)
+            question = invoke(prompt, model=model, timeout=_remaining(deadline), hedge=True)
+
+        _remember_question(model, target, question)
+        return apply_question(question)
+
+    except Exception as e:
+        logger.error(f"질문 생성 중 오류 발생: {str(e)}")
+        return {"node_result": RESULT_ERROR, "error": str(e)}
+
+
+@node
+async def agenerate_question(state: State, config: Optional[RunnableConfig] = None) -> State:
+    """generate_question()의 비동기 버전"""
+    try:
+        deadline = _deadline()
+        target = thaw(state["current_target"])
+        prompt = create_target_question_prompt(target)
+        model = get_model_config(config, state)
+
+        # 미리 생성한 질문(워밍업) 또는 이전 답변을 평가하는 동안 추측 생성한 질문이 있으면 사용
+        question = await _QUESTION_CACHE.aget(question_cache_key(model, target),
+                                              timeout=_remaining(deadline) or None) if _WARMUP else None
+        if question is not None:
+            metrics.record_cache_hit(metrics.CACHE_QUESTION)
+        else:
+            question = await speculation.atake(_session_id(config), speculation.speculation_key(model, prompt),
+                                               timeout=_remaining(deadline) or None)
+            if question is not None:
+                metrics.record_cache_hit(metrics.CACHE_SPECULATION)
+        if question is None:
+            # 중앙 ainvoke 함수 호출
+            question = await ainvoke(prompt, model=model, timeout=_remaining(deadline), hedge=True)
+
+        _remember_question(model, target, question)
+        return apply_question(question)
 
     except Exception as e:
         logger.error(f"질문 생성 중 오류 발생: {str(e)}")
-        state["node_result"] = RESULT_ERROR
-        state["error"] = str(e)
-        return state 
\ No newline at end of file
+        return {"node_result": RESULT_ERROR, "error": str(e)}
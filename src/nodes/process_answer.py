@@ -1,103 +1,587 @@
+import asyncio
+import contextvars
 import json
 import logging
-from typing import Any, Dict, List, Optional, Union
-from src.state import State
-from src.target import TargetItem
-from src.utils.model import invoke
-from src.utils.convert import convert_data, dedent_prompt
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple, Union
+from langchain_core.runnables import RunnableConfig
+from src.state import State, DEFAULT_SESSION_ID
+from src.diagnostics import Diagnostics, KIND_EVALUATION
+from src.target import TargetItem, get_targets, get_missing_target_items, get_member_items
+from src.utils.model import invoke, ainvoke, get_model_config
+from src.utils.convert import convert_data, aconvert_data, dedent_prompt, parse_llm_response
 from src.utils.decorator import node
+from src.utils.readonly import thaw
+from src.utils.settings import get_setting
+from src.utils.streaming import is_streaming, stream_invoke, end_message, emit_messages
+from src.utils import speculation
+from src.nodes.find_missing import predict_next_target
+from src.nodes.generate_question import speculate_question, aspeculate_question
 from src.entities import RESULT_ANSWER_SUFFICIENT, RESULT_ANSWER_INSUFFICIENT, RESULT_ERROR
 
 logger = logging.getLogger(__name__)
 
+# 답변 처리 노드의 시간 예산 (초, 평가와 데이터 변환 LLM 호출 및 재시도 포함)
+_TIMEOUT: float = get_setting("process_answer_timeout", 120.0)
+
+# 답변 처리 방식
+# - "two_step": XML 충분성 평가 후 충분하면 convert_data()로 데이터 변환 (LLM 호출 2회)
+# - "single_call": 충분성 평가와 데이터 추출을 JSON 응답 하나로 요청 (LLM 호출 1회, 실패 시 two_step으로 대체)
+MODE_TWO_STEP = "two_step"
+MODE_SINGLE_CALL = "single_call"
+_MODE: str = get_setting("process_answer_mode", MODE_TWO_STEP)
+
+# 답변을 평가하는 동안 다음 타겟의 질문을 미리 생성할지 여부
+# (충분한 답변의 턴 지연이 줄어드는 대신, 불충분한 답변에서는 질문 생성 호출이 버려짐)
+_SPECULATE: bool = get_setting("speculative_question", False)
+
+# 답변을 현재 타겟 외에 아직 수집되지 않은 다른 타겟에도 반영할지 여부
+# (현재 타겟 평가와 동시에 다른 타겟들을 한 번의 JSON 호출로 추출)
+_MULTI_TARGET: bool = get_setting("multi_target_extraction", False)
+# 한 번의 추출 호출에 포함할 최대 타겟 수 (프롬프트 길이 제한)
+_MULTI_TARGET_MAX: int = get_setting("multi_target_max", 10)
+# 동기 그래프에서 다른 타겟 추출에 사용하는 작업 스레드 수 (동시에 처리할 수 있는 답변 수)
+_MULTI_TARGET_WORKERS: int = get_setting("multi_target_workers", 4)
+_EXTRACT_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXTRACT_EXECUTOR_LOCK = threading.Lock()
+
+def create_evaluation_prompt(state: State, current_target: TargetItem) -> str:
+    """대화 내용이 현재 타겟을 충족하는지 평가하는 프롬프트 생성"""
+    # 프롬프트 템플릿
+    template = """\
+    <goal>
+        You are an assistant collecting specific information from users.  
+        Collect information clearly specified below:
+        <name>{name}</name>
+        <description>{description} (explicitly state required fields here)</description>
+        <example>{example}</example> <!-- Reference only, NOT for evaluation -->
+    </goal>
+
+    <task>
+        Evaluate if "<messages>" sufficiently fulfills "<goal>" and generate an XML response.
+        "<messages>" contains explicit conversation history between you and the user.
+        <messages>{messages}</messages>
+    </task>
+
+    <rules>
+        1. Evaluation MUST rely exclusively on explicit user responses in "<messages>".
+        2. Do NOT infer, assume, or imagine information not explicitly stated.
+        3. NEVER use "<example>" for evaluation.
+        4. Mark as SUFFICIENT only if user explicitly provides clearly relevant, usable information.
+        5. Mark as INSUFFICIENT if the user response is:
+            - Vague or uncertain (e.g., "hmm", "thinking...", "maybe", "not sure")
+            - Explicitly stating ignorance (e.g., "I don't know")
+            - Irrelevant to the required fields
+    </rules>
+
+    <thinking>
+        Follow these explicit evaluation steps (CoT):
+        1. Clearly restate exactly what required fields must be provided.
+        2. List explicitly provided information from "<messages>".
+        3. Confirm explicitly that no assumptions or inferred details are made.
+        4. Confirm explicitly that all rules above are precisely followed.
+        5. Provide an explicit reason for sufficient or insufficient judgment.
+    </thinking>
+
+    <output>
+        Provide response strictly in this XML format only:
+
+        <sufficient>
+            <code>SUFFICIENT</code>
+            <reason>Clearly state exactly why explicitly provided information meets the requirement.</reason>
+            <result>Explicitly provided fields and their values.</result>
+        </sufficient>
+
+        <insufficient>
+            <code>INSUFFICIENT</code>
+            <reason>Clearly specify the exact reason why information is insufficient (e.g., vague, unclear, irrelevant).</reason>
+            <result>Provide precise questions to collect missing required information.</result>
+        </insufficient>
+    </output>
+    """
+    
+    # 들여쓰기 제거 및 변수 대체
+    return dedent_prompt(template).format(
+        name=current_target["name"],
+        description=current_target["description"],
+        example=json.dumps(current_target["example"], ensure_ascii=False, indent=2),
+        # 이전 버전에서 저장된 디버그 메시지는 프롬프트에서 제외
+        messages=[message for message in state["messages"] if message.get("role") != "debug"]
+    )
+
+
+def create_evaluate_extract_prompt(state: State, current_target: TargetItem) -> str:
+    """충분성 평가와 데이터 추출을 한 번에 요청하는 JSON 응답 프롬프트 생성 (single_call 방식)"""
+    example = current_target["example"]
+    if isinstance(example, dict):
+        data_format = "a JSON object with exactly the same keys and nesting as <example>"
+    elif isinstance(example, list):
+        data_format = "a JSON array with the same element structure as <example>"
+    else:
+        data_format = "a JSON string"
+
+    # 프롬프트 템플릿
+    template = """\
+    <goal>
+        You are an assistant collecting specific information from users.  
+        Collect information clearly specified below:
+        <name>{name}</name>
+        <description>{description} (explicitly state required fields here)</description>
+        <example>{example}</example> <!-- Reference only, NOT for evaluation -->
+    </goal>
+
+    <task>
+        Evaluate if "<messages>" sufficiently fulfills "<goal>".
+        If it does, also extract the provided information in the structure of "<example>".
+        "<messages>" contains explicit conversation history between you and the user.
+        <messages>{messages}</messages>
+    </task>
+
+    <rules>
+        1. Evaluation MUST rely exclusively on explicit user responses in "<messages>".
+        2. Do NOT infer, assume, or imagine information not explicitly stated.
+        3. NEVER use "<example>" for evaluation, and NEVER copy values from "<example>" into "data".
+        4. Mark as sufficient only if user explicitly provides clearly relevant, usable information.
+        5. Mark as insufficient if the user response is:
+            - Vague or uncertain (e.g., "hmm", "thinking...", "maybe", "not sure")
+            - Explicitly stating ignorance (e.g., "I don't know")
+            - Irrelevant to the required fields
+    </rules>
+
+    <output>
+        Respond with a single JSON object only, without any other text:
+        {{
+            "sufficient": true or false,
+            "reason": "Why the explicitly provided information does or does not meet the requirement.",
+            "follow_up": "If insufficient, precise questions to collect missing required information. Otherwise an empty string.",
+            "data": "If sufficient, {data_format}. Otherwise null."
+        }}
+    </output>
+    """
+
+    # 들여쓰기 제거 및 변수 대체
+    return dedent_prompt(template).format(
+        name=current_target["name"],
+        description=current_target["description"],
+        example=json.dumps(example, ensure_ascii=False, indent=2),
+        data_format=data_format,
+        # 이전 버전에서 저장된 디버그 메시지는 프롬프트에서 제외
+        messages=[message for message in state["messages"] if message.get("role") != "debug"]
+    )
+
+
+def matches_example(data: Any, example: Union[Dict, List, str]) -> bool:
+    """추출한 데이터가 예시와 같은 타입이고 비어 있지 않은지 (딕셔너리는 예시의 키를 모두 포함하는지) 확인"""
+    if not isinstance(data, type(example)) or not data:
+        return False
+    return not isinstance(example, dict) or set(example) <= set(data)
+
+
+def parse_evaluate_extract(response: str, example: Union[Dict, List, str]) -> Optional[Dict[str, Any]]:
+    """
+    single_call 방식의 JSON 응답을 검증합니다.
+
+    Args:
+        response: LLM 응답
+        example: 타겟의 예시 (추출한 데이터의 타입 검증에 사용)
+
+    Returns:
+        Optional[Dict[str, Any]]: {"sufficient", "reason", "follow_up", "data"}
+            (응답 형식이 맞지 않으면 None - 호출자는 two_step 방식으로 대체)
+    """
+    parsed = parse_llm_response(response, dict)
+    if not isinstance(parsed, dict) or not isinstance(parsed.get("sufficient"), bool):
+        return None
+
+    data = parsed.get("data")
+    if parsed["sufficient"] and not matches_example(data, example):
+        return None
+
+    follow_up = parsed.get("follow_up")
+    return {
+        "sufficient": parsed["sufficient"],
+        "reason": str(parsed.get("reason") or ""),
+        "follow_up": follow_up.strip() if isinstance(follow_up, str) else "",
+        "data": data
+    }
+
+
+def apply_evaluate_extract(update: State, current_target: TargetItem, response: str) -> bool:
+    """
+    single_call 방식의 응답을 상태 변경분에 반영합니다.
+
+    Args:
+        update: 노드가 반환할 상태 변경분
+        current_target: 현재 타겟
+        response: LLM 응답
+
+    Returns:
+        bool: 반영했으면 True, 응답 형식이 맞지 않아 two_step 방식으로 대체해야 하면 False
+    """
+    parsed = parse_evaluate_extract(response, current_target["example"])
+    if parsed is None:
+        logger.warning(f"단일 호출 응답을 해석할 수 없어 2단계 처리로 대체합니다: {current_target['id']}")
+        return False
+
+    if parsed["sufficient"]:
+        save_sufficient_answer(update, current_target, parsed["data"])
+    else:
+        save_insufficient_answer(update, parsed["follow_up"] or None)
+    return True
+
+
+def create_multi_target_prompt(state: State, targets: Dict[str, TargetItem]) -> str:
+    """대화 내용에서 여러 타겟의 정보를 한 번에 추출하는 JSON 응답 프롬프트 생성"""
+    target_descriptions = "\n".join(
+        f'<target id="{target_id}"><name>{target["name"]}</name><description>{target["description"]}</description>'
+        f'<example>{json.dumps(target["example"], ensure_ascii=False)}</example></target>'
+        for target_id, target in targets.items()
+    )
+
+    # 프롬프트 템플릿
+    template = """\
+    <goal>
+        You are an assistant collecting specific information from users.
+        The user may have already answered some of the items below while answering another question.
+        <targets>
+    {targets}
+        </targets>
+    </goal>
+
+    <task>
+        For each target in "<targets>", decide if "<messages>" explicitly and sufficiently provides its information.
+        Extract the information only for those targets.
+        <messages>{messages}</messages>
+    </task>
+
+    <rules>
+        1. Rely exclusively on explicit user responses in "<messages>".
+        2. Do NOT infer, assume, or imagine information not explicitly stated.
+        3. NEVER copy values from "<example>".
+        4. Omit every target that is not clearly and fully answered. Omitting is always safe.
+    </rules>
+
+    <output>
+        Respond with a single JSON object only, without any other text.
+        Keys are target ids, values are the extracted data with the same type and structure as the target's "<example>".
+        Respond with {{}} if no target is answered.
+    </output>
+    """
+
+    # 들여쓰기 제거 및 변수 대체
+    return dedent_prompt(template).format(
+        targets=target_descriptions,
+        # 이전 버전에서 저장된 디버그 메시지는 프롬프트에서 제외
+        messages=[message for message in state["messages"] if message.get("role") != "debug"]
+    )
+
+
+def parse_multi_target_response(response: str, targets: Dict[str, TargetItem]) -> Dict[str, Any]:
+    """
+    여러 타겟 추출 응답에서 예시와 형식이 맞는 데이터만 골라냅니다.
+
+    Args:
+        response: LLM 응답
+        targets: 추출을 요청한 타겟 (타겟 ID → 타겟)
+
+    Returns:
+        Dict[str, Any]: 타겟 ID → 추출한 데이터 (형식이 맞지 않는 항목은 제외)
+    """
+    parsed = parse_llm_response(response, dict)
+    if not isinstance(parsed, dict):
+        return {}
+    return {
+        target_id: data for target_id, data in parsed.items()
+        if target_id in targets and matches_example(data, targets[target_id]["example"])
+    }
+
+
+def _other_missing_targets(state: State, current_target: TargetItem) -> Dict[str, TargetItem]:
+    """현재 타겟을 제외하고 아직 수집되지 않은 필수 타겟 (최대 _MULTI_TARGET_MAX개)"""
+    if not _MULTI_TARGET:
+        return {}
+    missing = get_missing_target_items({"__root__": get_targets(state.get("target_version"))},
+                                       state.get("results", {}))
+    for target_id in get_member_items(current_target):
+        missing.pop(target_id, None)
+    return dict(islice(missing.items(), max(_MULTI_TARGET_MAX, 0)))
+
+
+def _get_extract_executor() -> ThreadPoolExecutor:
+    global _EXTRACT_EXECUTOR
+
+    with _EXTRACT_EXECUTOR_LOCK:
+        if _EXTRACT_EXECUTOR is None:
+            _EXTRACT_EXECUTOR = ThreadPoolExecutor(max_workers=max(_MULTI_TARGET_WORKERS, 1),
+                                                    thread_name_prefix="multi-target")
+        return _EXTRACT_EXECUTOR
+
+
+def apply_multi_target_extraction(state: State, update: State, config: Optional[RunnableConfig],
+                                  targets: Dict[str, TargetItem], response: str) -> List[str]:
+    """
+    다른 타겟 추출 결과를 상태 변경분에 반영하고, 저장한 타겟을 알리는 메시지를 추가합니다.
+
+    Args:
+        state: 현재 상태 (읽기 전용)
+        update: 노드가 반환할 상태 변경분
+        config: LangGraph 실행 설정 (세션 ID)
+        targets: 추출을 요청한 타겟 (타겟 ID → 타겟)
+        response: LLM 응답
+
+    Returns:
+        List[str]: 저장한 타겟 ID 목록
+    """
+    Diagnostics.record(
+        KIND_EVALUATION, response, session_id=_session_id(config),
+        position=state.get("message_offset", 0) + len(state["messages"]) + len(update.get("messages", [])),
+        target_id=None, target_ids=list(targets)
+    )
+
+    extracted = parse_multi_target_response(response, targets)
+    for target_id, data in extracted.items():
+        logger.info(f"다른 타겟의 답변을 함께 저장합니다: {target_id}")
+        store_result(update, dict(targets[target_id], id=target_id), data)
+
+    if extracted:
+        names = ", ".join(f"'{targets[target_id]['name']}'" for target_id in extracted)
+        verb = "is" if len(extracted) == 1 else "are"
+        notice = {"role": "ai", "content": f"{names} {verb} also saved from your answer."}
+        messages = update.setdefault("messages", [])
+        if update.get("node_result") == RESULT_ANSWER_INSUFFICIENT and messages:
+            # 후속 질문이 사용자가 답할 마지막 메시지로 남도록 그 앞에 알림을 추가
+            messages.insert(len(messages) - 1, notice)
+        else:
+            messages.append(notice)
+    return list(extracted)
+
+
+def _start_multi_target_extraction(state: State, current_target: TargetItem, model,
+                                   deadline: Optional[float]) -> Tuple[Dict[str, TargetItem], Optional[Future]]:
+    """다른 타겟 추출을 작업 스레드에서 시작 (추출할 타겟이 없으면 None)"""
+    targets = _other_missing_targets(state, current_target)
+    if not targets:
+        return targets, None
+    prompt = create_multi_target_prompt(state, targets)
+    # 노드가 결과를 기다리는 호출이므로 현재 노드의 지표 스팬에 기록되도록 실행 컨텍스트를 전달
+    return targets, _get_extract_executor().submit(
+        contextvars.copy_context().run, invoke, prompt, model=model, timeout=_remaining(deadline), json_mode=True
+    )
+
+
+def _finish_multi_target_extraction(state: State, update: State, config: Optional[RunnableConfig],
+                                    targets: Dict[str, TargetItem], extraction: Optional[Future],
+                                    deadline: Optional[float]) -> None:
+    """다른 타겟 추출 결과를 기다려 반영 (실패해도 현재 타겟의 처리 결과는 유지)"""
+    if extraction is None:
+        return
+    try:
+        apply_multi_target_extraction(state, update, config, targets,
+                                      extraction.result(timeout=_remaining(deadline) or None))
+    except Exception as e:
+        logger.warning(f"다른 타겟 추출 중 오류 발생: {str(e)}")
+
+
+async def _afinish_multi_target_extraction(state: State, update: State, config: Optional[RunnableConfig],
+                                           targets: Dict[str, TargetItem], extraction: Optional[asyncio.Task],
+                                           deadline: Optional[float]) -> None:
+    """_finish_multi_target_extraction()의 비동기 버전"""
+    if extraction is None:
+        return
+    try:
+        response = await asyncio.wait_for(extraction, timeout=_remaining(deadline) or None)
+        apply_multi_target_extraction(state, update, config, targets, response)
+    except Exception as e:
+        logger.warning(f"다른 타겟 추출 중 오류 발생: {str(e)}")
+
+
+def _deadline() -> Optional[float]:
+    """노드 시간 예산의 마감 시각 (예산이 0 이하이면 제한 없음)"""
+    return time.monotonic() + _TIMEOUT if _TIMEOUT > 0 else None
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    """
+    노드 시간 예산 중 남은 시간
+
+    다 쓴 경우 아주 작은 값을 반환하여 호출이 바로 시간 초과되도록 하고,
+    제한이 없으면 0(invoke()에서 제한 없음)을 반환합니다.
+    """
+    if deadline is None:
+        return 0
+    return max(deadline - time.monotonic(), 0.001)
+
+
+def _session_id(config: Optional[RunnableConfig]) -> str:
+    return ((config or {}).get("configurable") or {}).get("session_id", DEFAULT_SESSION_ID)
+
+
+def _speculate_next_question(state: State, config: Optional[RunnableConfig], current_target: TargetItem,
+                             model, asynchronous: bool = False) -> bool:
+    """
+    답변이 충분하다고 가정하고 다음 타겟의 질문 생성을 평가와 동시에 시작합니다.
+
+    Returns:
+        bool: 추측 실행을 시작했는지 여부
+    """
+    if not _SPECULATE:
+        return False
+    next_target = predict_next_target(state, current_target)
+    if next_target is None:
+        return False
+    if asynchronous:
+        aspeculate_question(config, model, next_target)
+    else:
+        speculate_question(config, model, next_target)
+    return True
+
+
+def _discard_speculation(update: State, config: Optional[RunnableConfig], speculating: bool) -> None:
+    """답변이 충분하지 않았으면 미리 생성 중인 다음 질문을 버림 (다음 generate_question이 사용하지 않음)"""
+    if speculating and update.get("node_result") != RESULT_ANSWER_SUFFICIENT:
+        speculation.discard(_session_id(config))
+
+
+def record_evaluation(state: State, config: Optional[RunnableConfig], current_target: TargetItem,
+                      evaluation: str) -> None:
+    """평가 원본을 대화 상태가 아닌 진단 정보로 기록 (세션 ID는 그래프 실행 설정에서 전달됨)"""
+    Diagnostics.record(
+        KIND_EVALUATION, evaluation, session_id=_session_id(config),
+        position=state.get("message_offset", 0) + len(state["messages"]),
+        target_id=current_target.get("id")
+    )
+
+
 @node
-def process_answer(state: State) -> State:
+def process_answer(state: State, config: Optional[RunnableConfig] = None) -> State:
+    # 노드는 상태를 수정하지 않고 새 메시지와 결과만 담은 변경분을 반환 (리듀서가 병합)
+    update: State = {}
+    speculating = False
     try:      
         # current_target이 None인지 확인
-        current_target = state.get("current_target")
+        current_target = thaw(state.get("current_target"))
         if not current_target:
             logger.warning("처리할 타겟이 없습니다. 불충분 상태로 반환합니다.")
-            state["node_result"] = RESULT_ANSWER_INSUFFICIENT
-            return state
+            return {"node_result": RESULT_ANSWER_INSUFFICIENT}
         
-        # 프롬프트 템플릿
-        template = """\
-        <goal>
-            You are an assistant collecting specific information from users.  
-            Collect information clearly specified below:
-            <name>{name}</name>
-            <description>{description} (explicitly state required fields here)</description>
-            <example>{example}</example> <!-- Reference only, NOT for evaluation -->
-        </goal>
-
-        <task>
-            Evaluate if "<messages>" sufficiently fulfills "<goal>" and generate an XML response.
-            "<messages>" contains explicit conversation history between you and the user.
-            <messages>{messages}</messages>
-        </task>
-
-        <rules>
-            1. Evaluation MUST rely exclusively on explicit user responses in "<messages>".
-            2. Do NOT infer, assume, or imagine information not explicitly stated.
-            3. NEVER use "<example>" for evaluation.
-            4. Mark as SUFFICIENT only if user explicitly provides clearly relevant, usable information.
-            5. Mark as INSUFFICIENT if the user response is:
-                - Vague or uncertain (e.g., "hmm", "thinking...", "maybe", "not sure")
-                - Explicitly stating ignorance (e.g., "I don't know")
-                - Irrelevant to the required fields
-        </rules>
-
-        <thinking>
-            Follow these explicit evaluation steps (CoT):
-            1. Clearly restate exactly what required fields must be provided.
-            2. List explicitly provided information from "<messages>".
-            3. Confirm explicitly that no assumptions or inferred details are made.
-            4. Confirm explicitly that all rules above are precisely followed.
-            5. Provide an explicit reason for sufficient or insufficient judgment.
-        </thinking>
-
-        <output>
-            Provide response strictly in this XML format only:
-
-            <sufficient>
-                <code>SUFFICIENT</code>
-                <reason>Clearly state exactly why explicitly provided information meets the requirement.</reason>
-                <result>Explicitly provided fields and their values.</result>
-            </sufficient>
-
-            <insufficient>
-                <code>INSUFFICIENT</code>
-                <reason>Clearly specify the exact reason why information is insufficient (e.g., vague, unclear, irrelevant).</reason>
-                <result>Provide precise questions to collect missing required information.</result>
-            </insufficient>
-        </output>
-        """
-        
-        # 들여쓰기 제거 및 변수 대체
-        prompt = dedent_prompt(template).format(
-            name=current_target["name"],
-            description=current_target["description"],
-            example=json.dumps(current_target["example"], ensure_ascii=False, indent=2),
-            messages=state["messages"]
-        )
-        
-        # 중앙 invoke 함수 호출
-        evaluation = invoke(prompt)
-        state["messages"].append({"role": "debug", "content": evaluation})
+        model = get_model_config(config, state)
+        streaming = is_streaming(config)
+        # 평가와 데이터 변환이 노드의 시간 예산을 나누어 사용
+        deadline = _deadline()
+        # 다음 질문 생성과 다른 타겟 추출을 평가와 동시에 진행
+        speculating = _speculate_next_question(state, config, current_target, model)
+        other_targets, extraction = _start_multi_target_extraction(state, current_target, model, deadline)
+
+        handled, streamed = False, False
+        if _MODE == MODE_SINGLE_CALL:
+            # 평가와 데이터 추출을 한 번에 요청 (JSON 응답은 스트리밍하지 않고 완성된 메시지로 전달)
+            response = invoke(create_evaluate_extract_prompt(state, current_target), model=model,
+                              timeout=_remaining(deadline), json_mode=True)
+            record_evaluation(state, config, current_target, response)
+            handled = apply_evaluate_extract(update, current_target, response)
+
+        if not handled:
+            prompt = create_evaluation_prompt(state, current_target)
+            if streaming and extraction is None:
+                # 불충분 판정의 후속 질문은 평가가 생성되는 대로 화면에 전달
+                # (다른 타겟 추출 중이면 저장 알림이 후속 질문보다 먼저 보이도록 완성된 메시지를 순서대로 전달)
+                evaluation, streamed = stream_invoke(prompt, model=model, result_tag="insufficient",
+                                                     timeout=_remaining(deadline))
+            else:
+                # 중앙 invoke 함수 호출
+                evaluation, streamed = invoke(prompt, model=model, timeout=_remaining(deadline)), False
+            record_evaluation(state, config, current_target, evaluation)
+            
+            # 충분성에 따른 처리
+            if "<code>SUFFICIENT</code>" in evaluation:           
+                # 충분한 답변 처리
+                handle_sufficient_answer(update, current_target, evaluation, model, timeout=_remaining(deadline))
+            else:
+                # 불충분한 답변 처리
+                handle_insufficient_answer(update, evaluation)
+
+        # 같은 답변으로 채워진 다른 타겟 반영
+        _finish_multi_target_extraction(state, update, config, other_targets, extraction, deadline)
         
-        # 충분성에 따른 처리
-        if "<code>SUFFICIENT</code>" in evaluation:           
-            # 충분한 답변 처리
-            return handle_sufficient_answer(state, current_target, evaluation)
-        else:
-            # 불충분한 답변 처리
-            return handle_insufficient_answer(state, evaluation)
+        if streaming:
+            # 이미 스트리밍한 후속 질문(마지막 메시지)은 끝만 알리고, 나머지 새 메시지(저장 확인 등)는 한 번에 전달
+            new_messages = update.get("messages", [])
+            if streamed:
+                end_message()
+                if update["node_result"] == RESULT_ANSWER_INSUFFICIENT:
+                    new_messages = new_messages[:-1]
+            emit_messages(new_messages)
+        return update
         
     except Exception as e:
         logger.error(f"응답 처리 중 오류 발생: {str(e)}", exc_info=True)
-        state["node_result"] = RESULT_ERROR
-        state["error"] = str(e)
-        return state
+        update = {"node_result": RESULT_ERROR, "error": str(e)}
+        return update
+    finally:
+        _discard_speculation(update, config, speculating)
+
+
+@node
+async def aprocess_answer(state: State, config: Optional[RunnableConfig] = None) -> State:
+    """process_answer()의 비동기 버전"""
+    update: State = {}
+    speculating, extraction = False, None
+    try:
+        # current_target이 None인지 확인
+        current_target = thaw(state.get("current_target"))
+        if not current_target:
+            logger.warning("처리할 타겟이 없습니다. 불충분 상태로 반환합니다.")
+            return {"node_result": RESULT_ANSWER_INSUFFICIENT}
+
+        # 평가와 데이터 변환이 노드의 시간 예산을 나누어 사용
+        model = get_model_config(config, state)
+        deadline = _deadline()
+        # 다음 질문 생성과 다른 타겟 추출을 평가와 동시에 진행
+        speculating = _speculate_next_question(state, config, current_target, model, asynchronous=True)
+        other_targets = _other_missing_targets(state, current_target)
+        extraction = asyncio.ensure_future(
+            ainvoke(create_multi_target_prompt(state, other_targets), model=model,
+                    timeout=_remaining(deadline), json_mode=True)
+        ) if other_targets else None
+
+        handled = False
+        if _MODE == MODE_SINGLE_CALL:
+            # 평가와 데이터 추출을 한 번에 요청
+            response = await ainvoke(create_evaluate_extract_prompt(state, current_target), model=model,
+                                     timeout=_remaining(deadline), json_mode=True)
+            record_evaluation(state, config, current_target, response)
+            handled = apply_evaluate_extract(update, current_target, response)
+
+        if not handled:
+            # 중앙 ainvoke 함수 호출
+            prompt = create_evaluation_prompt(state, current_target)
+            evaluation = await ainvoke(prompt, model=model, timeout=_remaining(deadline))
+            record_evaluation(state, config, current_target, evaluation)
+
+            # 충분성에 따른 처리
+            if "<code>SUFFICIENT</code>" in evaluation:
+                # 충분한 답변 처리
+                await ahandle_sufficient_answer(update, current_target, evaluation, model,
+                                                timeout=_remaining(deadline))
+            else:
+                # 불충분한 답변 처리
+                handle_insufficient_answer(update, evaluation)
+
+        # 같은 답변으로 채워진 다른 타겟 반영
+        await _afinish_multi_target_extraction(state, update, config, other_targets, extraction, deadline)
+        return update
+
+    except Exception as e:
+        logger.error(f"응답 처리 중 오류 발생: {str(e)}", exc_info=True)
+        update = {"node_result": RESULT_ERROR, "error": str(e)}
+        return update
+    finally:
+        _discard_speculation(update, config, speculating)
+        if extraction is not None and not extraction.done():
+            extraction.cancel()
 
 
 def extract_result(evaluation: str, tag_name: str) -> Optional[str]:
@@ -115,7 +599,7 @@ def extract_result(evaluation: str, tag_name: str) -> Optional[str]:
     return result
 
 
-def handle_sufficient_answer(state: State, current_target, evaluation) -> State:
+def handle_sufficient_answer(update: State, current_target, evaluation, model=None, timeout=None) -> State:
     """충분한 답변 처리"""
     # XML에서 결과 추출
     result = extract_result(evaluation, "sufficient")
@@ -127,39 +611,95 @@ def handle_sufficient_answer(state: State, current_target, evaluation) -> State:
         current_target["name"], 
         current_target["description"], 
         current_target["example"], 
-        result
+        result,
+        model=model,
+        timeout=timeout
+    )
+    return save_sufficient_answer(update, current_target, formatted_answer)
+
+
+async def ahandle_sufficient_answer(update: State, current_target, evaluation, model=None, timeout=None) -> State:
+    """충분한 답변 처리 (비동기)"""
+    # XML에서 결과 추출
+    result = extract_result(evaluation, "sufficient")
+    if result is None:
+        raise ValueError("결과를 추출할 수 없습니다.")
+
+    formatted_answer = await aconvert_data(
+        current_target["name"],
+        current_target["description"],
+        current_target["example"],
+        result,
+        model=model,
+        timeout=timeout
     )
+    return save_sufficient_answer(update, current_target, formatted_answer)
+
+
+def save_sufficient_answer(update: State, current_target, formatted_answer) -> State:
+    """형식화된 답변을 결과 변경분에 저장하고 확인 메시지 추가"""
     logger.info(f"형식화된 답변: {formatted_answer}")
-    target_id = current_target["id"]
-    
-    # 결과 저장을 위한 상태 업데이트
-    if "results" not in state:
-        state["results"] = {}
-    
-    # 타겟 이름과 설명으로 결과 저장
-    state["results"][target_id] = {
-        "name": current_target["name"],
-        "description": current_target["description"],
-        "data": formatted_answer
-    }
-    
-    # 확인 메시지 생성
-    message = f"'{current_target['name']}' is successfully saved. Let's move on to the next item."
+    if current_target.get("members"):
+        # 묶음 질문은 구성 항목별로 나누어 저장 (답하지 않은 항목은 다음 질문에서 다시 수집)
+        saved = store_group_result(update, current_target, formatted_answer)
+        if not saved:
+            raise ValueError("결과를 추출할 수 없습니다.")
+        names = ", ".join(f"'{name}'" for name in saved)
+        verb = "is" if len(saved) == 1 else "are"
+        message = f"{names} {verb} successfully saved. Let's move on to the next item."
+    else:
+        store_result(update, current_target, formatted_answer)
+        message = f"'{current_target['name']}' is successfully saved. Let's move on to the next item."
     
-    state["messages"].append({"role": "ai", "content": message})
-    state["node_result"] = RESULT_ANSWER_SUFFICIENT
+    update.setdefault("messages", []).append({"role": "ai", "content": message})
+    update["node_result"] = RESULT_ANSWER_SUFFICIENT
     
-    return state
+    return update
 
 
-def handle_insufficient_answer(state: State, evaluation: str) -> State:
+def handle_insufficient_answer(update: State, evaluation: str) -> State:
     """불충분한 답변 처리"""
     # XML에서 결과 추출
     result = extract_result(evaluation, "insufficient")
-    if result is None:
-        result = "More information is needed. Please provide more details."   
+    return save_insufficient_answer(update, result)
+
+
+def store_result(update: State, target: TargetItem, data: Any) -> None:
+    """타겟 이름과 설명으로 결과 변경분에 저장 (기존 결과와의 병합은 results 리듀서가 담당)"""
+    update.setdefault("results", {})[target["id"]] = {
+        "name": target["name"],
+        "description": target["description"],
+        "data": data
+    }
+
+
+def store_group_result(update: State, group_target: TargetItem, data: Any) -> List[str]:
+    """
+    묶음 질문의 답변을 구성 항목별 결과로 나누어 저장합니다.
+
+    Args:
+        update: 노드가 반환할 상태 변경분
+        group_target: 묶음 타겟 (members 포함)
+        data: 구성 항목 ID를 키로 하는 추출 데이터
+
+    Returns:
+        List[str]: 저장한 구성 항목 이름 목록 (예시와 형식이 맞는 항목만 저장)
+    """
+    saved = []
+    for target_id, member in get_member_items(group_target).items():
+        value = data.get(target_id) if isinstance(data, dict) else None
+        if matches_example(value, member["example"]):
+            store_result(update, member, value)
+            saved.append(member["name"])
+    return saved
+
+
+def save_insufficient_answer(update: State, follow_up: Optional[str]) -> State:
+    """후속 질문 메시지를 추가하고 불충분 상태로 표시"""
+    if follow_up is None:
+        follow_up = "More information is needed. Please provide more details."   
    
-    state["messages"].append({"role": "ai", "content": result})
-    state["node_result"] = RESULT_ANSWER_INSUFFICIENT
+    update.setdefault("messages", []).append({"role": "ai", "content": follow_up})
+    update["node_result"] = RESULT_ANSWER_INSUFFICIENT
     
-    return state
\ No newline at end of file
+    return update
\ No newline at end of file
@@ -7,428 +7,1183 @@ LangGraph 워크플로우의 상태를 관리하는 모듈
 3. 수집된 결과 데이터 관리
 4. 상태 파일로의 영구 저장
 
-상태는 메모리 내 캐싱과 파일 기반 영구 저장소를 통해 관리됩니다.
-캐싱을 통해 파일 I/O를 최소화하고 성능을 향상시킵니다.
+상태는 세션 ID별로 분리되어 관리됩니다. 각 세션은 자신만의 상태 파일을 가지며,
+최근에 사용된 세션의 상태는 크기가 제한된 메모리 내 LRU 캐시에 유지됩니다.
+캐시에서 밀려난 세션은 다음 접근 시 파일에서 다시 로드됩니다.
+잠금은 세션 단위로 걸리므로 서로 다른 세션은 동시에 처리될 수 있습니다.
+
+파일 기록은 src.storage 패키지의 백엔드에 위임하며, COLLECTOR_STATE_STORAGE 환경 변수로 선택합니다:
+- "json" (기본값): 저장할 때마다 상태 파일 전체를 다시 기록
+- "journal": 변경분만 저널 파일에 추가하고 주기적으로 상태 파일 스냅샷을 기록
+- "sqlite": 모든 세션을 SQLite 데이터베이스에 저장
+StateManager.set_backend()로 다른 StateBackend 구현을 직접 지정할 수도 있습니다.
+
+기록 시점은 COLLECTOR_STATE_WRITE_MODE 환경 변수로 선택합니다:
+- "sync" (기본값): 상태가 바뀔 때마다 즉시 기록
+- "behind": 변경을 메모리에 모아 두었다가 백그라운드 스레드가 주기적으로, 대기 중인 변경이
+  임계값을 넘을 때, 또는 대화 턴이 끝날 때(StateManager.flush) 한 번에 기록
+어느 방식이든 durable=True로 호출하면 즉시 기록하고 디스크 동기화(fsync)까지 수행합니다.
+
+여러 프로세스(예: Streamlit 워커 여러 개)가 같은 저장소를 공유할 수 있도록,
+캐시를 반환하기 전에 백엔드의 서명(파일 stat 또는 SQLite 버전 번호)을 비교하여
+다른 프로세스가 상태를 바꿨으면 다시 로드합니다. 기록되지 않은 변경이 있는 세션은 검증하지 않습니다.
 """
 
 import json
 import os
+import re
+import atexit
 import logging
-import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Literal, Optional, Union, Any, Tuple, cast
-from copy import deepcopy
+from typing import Dict, Iterable, Iterator, List, Literal, Mapping, Optional, Sequence, Union, Any, Tuple, cast
 
 from src.utils.paths import get_project_paths
-from src.entities import State, TargetItem
+from src.utils.settings import get_setting
+from src.storage import StateBackend, DEFAULT_SESSION_ID, create_backend
+from src.utils.readonly import readonly, thaw
+from src.utils.codec import StateCodec
+from src.utils import speculation
+from src.entities import RESULT_ALL_TARGETS_COMPLETE, State, TargetItem
 
 logger = logging.getLogger(__name__)
 
+# === 저장 방식 설정 ===
+# 현재 저장 방식 ("json", "journal" 또는 "sqlite")
+_STORAGE_MODE: str = get_setting("state_storage", "json")
+# 저널 모드에서 스냅샷을 새로 기록하기 전까지 허용하는 저널 항목 수
+_JOURNAL_COMPACT_THRESHOLD: int = get_setting("state_journal_compact_threshold", 100)
+# 상태 파일 직렬화 형식 ("json", "compact_json" 또는 "msgpack")과 압축 방식 ("none", "gzip" 또는 "zstd")
+_STATE_FORMAT: str = get_setting("state_format", "json")
+_STATE_COMPRESSION: str = get_setting("state_compression", "none")
+# 이 크기(바이트) 이상인 상태 파일만 압축
+_STATE_COMPRESS_THRESHOLD: int = get_setting("state_compress_threshold", 65536)
+# 상태를 기록하는 백엔드 (처음 사용할 때 생성)
+_BACKEND: Optional[StateBackend] = None
+
+# === 기록 시점 설정 ===
+# 기록 방식 ("sync": 즉시 기록, "behind": 모아서 기록)
+_WRITE_MODE: str = get_setting("state_write_mode", "sync")
+# behind 방식에서 백그라운드 스레드가 기록하는 주기 (초)
+_FLUSH_INTERVAL: float = get_setting("state_flush_interval", 1.0)
+# behind 방식에서 이 개수 이상의 변경이 대기 중이면 주기를 기다리지 않고 기록
+_FLUSH_MAX_PENDING: int = get_setting("state_flush_max_pending", 50)
+
+# === 캐시 검증 설정 ===
+# 캐시를 반환하기 전에 저장소의 변경 여부를 확인할지 여부
+_COHERENCE_CHECK: bool = get_setting("state_coherence_check", True)
+
+# === 메시지 기록 설정 ===
+# 메모리에 유지할 최근 메시지 수 (0 이하이면 보관하지 않고 모든 메시지 유지)
+_HISTORY_WINDOW: int = get_setting("state_history_window", 200)
+# 창을 넘은 오래된 메시지를 보관하는 구간 크기
+_HISTORY_SEGMENT_SIZE: int = get_setting("state_history_segment_size", 50)
+
+# === 세션 설정 ===
+# 세션 ID 형식 (파일 이름으로 사용되므로 경로 구분자 등은 허용하지 않음)
+_SESSION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+# 메모리에 유지할 최대 세션 수
+_SESSION_CACHE_SIZE: int = get_setting("state_cache_size", 256)
+
+
+class _SessionEntry:
+    """
+    메모리 캐시에 올라온 세션 하나의 상태
+
+    상태 객체와 필드별 변경 버전, 세션 단위 잠금을 함께 보관합니다.
+
+    최상위 필드가 변경될 때마다 해당 필드의 버전이 증가하며,
+    마지막으로 파일에 기록한 시점의 버전과 비교하여 기록이 필요한 필드(dirty)를 판단합니다.
+    """
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        # 상태 객체의 메모리 내 캐시 (아직 로드하지 않았으면 None)
+        self.state: Optional[State] = None
+        # 마지막으로 파일에 기록된 상태 (저널 변경분 계산용, 캐시와 구조 공유)
+        self.flushed_state: Optional[State] = None
+        # 필드별 변경 버전
+        self.versions: Dict[str, int] = {}
+        # 마지막으로 파일에 기록한 시점의 필드별 버전
+        self.flushed_versions: Dict[str, int] = {}
+        # 같은 세션에 대한 동시 수정을 막는 잠금
+        self.lock = threading.RLock()
+        # LRU 캐시에서 제거되었는지 여부
+        self.evicted = False
+        # 제거하기 위해 기록 중인지 여부 (_SESSIONS_LOCK을 잡은 상태에서만 변경)
+        self.evicting = False
+        # 마지막 기록 이후 아직 기록되지 않은 변경 횟수
+        self.pending_mutations = 0
+        # 마지막으로 로드하거나 기록한 시점의 저장소 서명 (StateBackend.signature)
+        self.signature: Any = None
+
+    def dirty_fields(self) -> List[str]:
+        """
+        마지막 기록 이후 변경된 최상위 필드 목록을 반환합니다.
+
+        Returns:
+            List[str]: 변경된 필드 이름 목록
+        """
+        return [
+            field for field, version in self.versions.items()
+            if self.flushed_versions.get(field) != version
+        ]
+
+
 # === 메모리 캐싱 변수 ===
-# 상태 객체의 메모리 내 캐시
-_STATE_CACHE: Optional[State] = None
-# 캐시된 상태의 해시값 (변경 여부 확인용)
-_STATE_HASH: Optional[str] = None
-
-def _calculate_state_hash(state: State) -> str:
-    """
-    상태 객체의 해시값을 계산합니다.
-    
-    이 해시값은 상태가 변경되었는지 확인하는 데 사용되며,
-    변경이 없는 경우 파일 쓰기 작업을 건너뛰어 성능을 향상시킵니다.
-    
+# 세션 ID → 세션 캐시 항목 (가장 최근에 사용된 세션이 끝에 위치)
+_SESSIONS: "OrderedDict[str, _SessionEntry]" = OrderedDict()
+# _SESSIONS 사전 자체를 보호하는 잠금 (세션 상태 처리 중에는 잡지 않음)
+_SESSIONS_LOCK = threading.Lock()
+
+# === 지연 기록 변수 ===
+# 기록을 기다리는 세션 (세션 ID → 세션 캐시 항목)
+_DIRTY_SESSIONS: Dict[str, _SessionEntry] = {}
+_DIRTY_LOCK = threading.Lock()
+# 백그라운드 기록 스레드와 즉시 기록 요청 이벤트
+_FLUSHER: Optional[threading.Thread] = None
+_FLUSH_EVENT = threading.Event()
+
+# === 기록 통계 ===
+# mutations: 상태 변경 횟수, flushes: 실제 기록 횟수, coalesced_writes: 합쳐져서 생략된 기록 횟수,
+# bytes_written: 기록한 바이트 수, bytes_saved: 생략된 기록의 추정 바이트 수, flush_errors: 기록 실패 횟수
+_WRITE_STATS: Dict[str, int] = {
+    "mutations": 0,
+    "flushes": 0,
+    "coalesced_writes": 0,
+    "bytes_written": 0,
+    "bytes_saved": 0,
+    "flush_errors": 0
+}
+_WRITE_STATS_LOCK = threading.Lock()
+
+
+def _validate_session_id(session_id: str) -> str:
+    """
+    세션 ID 형식을 검사합니다.
+
     Args:
-        state: 해시값을 계산할 상태 객체
-        
+        session_id: 검사할 세션 ID
+
+    Returns:
+        str: 검사를 통과한 세션 ID
+
+    Raises:
+        ValueError: 세션 ID 형식이 올바르지 않은 경우
+    """
+    if not isinstance(session_id, str) or not _SESSION_ID_PATTERN.match(session_id):
+        raise ValueError(f"올바르지 않은 세션 ID입니다: {session_id!r}")
+    return session_id
+
+
+def _get_backend() -> StateBackend:
+    """
+    상태를 기록할 백엔드를 반환합니다.
+
+    StateManager.set_backend()로 지정하지 않았으면 COLLECTOR_STATE_STORAGE 설정에 따라 생성합니다.
+
     Returns:
-        str: 상태 객체의 MD5 해시값
+        StateBackend: 상태 저장소 백엔드
     """
-    # 상태를 정렬된 JSON 문자열로 변환 후 해시 계산
-    state_json = json.dumps(state, sort_keys=True)
-    return hashlib.md5(state_json.encode('utf-8')).hexdigest()
+    global _BACKEND
+
+    if _BACKEND is None:
+        codec = StateCodec(_STATE_FORMAT, _STATE_COMPRESSION, _STATE_COMPRESS_THRESHOLD)
+        _BACKEND = create_backend(_STORAGE_MODE, get_project_paths(), _JOURNAL_COMPACT_THRESHOLD, codec)
+        logger.info(f"상태 저장 방식: {_BACKEND.name} (형식: {codec.format}, 압축: {codec.compression})")
+    return _BACKEND
 
-def _save_state(state: State) -> bool:
+
+def _read_signature(session_id: str) -> Any:
     """
-    상태 데이터를 state.json 파일에 저장합니다.
-    
-    성능 최적화를 위해 상태가 변경된 경우에만 파일에 씁니다.
-    
+    저장소에 기록된 세션 상태의 서명을 읽습니다.
+
     Args:
-        state: 저장할 상태 객체
-        
+        session_id: 세션 ID
+
     Returns:
-        bool: 저장 성공 여부
+        Any: 저장소 서명 (읽을 수 없으면 None)
     """
-    global _STATE_CACHE, _STATE_HASH
-    
-    # 현재 상태의 해시 계산
-    current_hash = _calculate_state_hash(state)
-    
-    # 해시가 동일하면 (변경 없음) 저장 건너뛰기
-    if _STATE_HASH == current_hash:
-        logger.debug("상태가 변경되지 않았습니다. 파일 쓰기를 건너뜁니다.")
-        return True
-    
-    # 프로젝트 경로 가져오기
-    paths = get_project_paths()
-    state_file = paths["state_file"]
-    
     try:
-        # 디렉토리가 없으면 생성
-        state_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # State 객체를 JSON으로 직렬화
-        serializable_state = dict(state)
-        
-        # 파일에 저장
-        with open(state_file, "w", encoding="utf-8") as f:
-            json.dump(serializable_state, f, ensure_ascii=False, indent=2)
-        
-        # 메모리 캐시 업데이트
-        _STATE_CACHE = deepcopy(state)
-        _STATE_HASH = current_hash
-        
-        logger.info(f"상태 파일을 성공적으로 저장했습니다: {state_file}")
-        return True
-    
+        return _get_backend().signature(session_id)
     except Exception as e:
-        logger.error(f"상태 파일 저장 중 오류 발생: {str(e)}")
+        logger.warning(f"상태 서명 확인 중 오류 발생: {str(e)}")
+        return None
+
+
+def _is_stale(entry: _SessionEntry) -> bool:
+    """
+    다른 프로세스가 세션 상태를 기록하여 캐시가 오래되었는지 확인합니다.
+
+    Args:
+        entry: 잠금을 획득한 세션 캐시 항목
+
+    Returns:
+        bool: 저장소 서명이 마지막으로 확인한 서명과 다르면 True
+    """
+    if not _COHERENCE_CHECK:
         return False
+    return _read_signature(entry.session_id) != entry.signature
 
 
-def _load_state() -> State:
+def _get_session_entry(session_id: str) -> _SessionEntry:
     """
-    state.json 파일에서 상태 데이터를 로드합니다.
-    
-    캐시된 상태가 있으면 파일을 다시 읽지 않고 캐시를 반환합니다.
-    파일이 없는 경우 기본 상태 객체를 반환합니다.
-    
+    세션 캐시 항목을 가져오거나 새로 만듭니다.
+
+    캐시 크기를 넘으면 가장 오래 사용되지 않은 세션부터 제거합니다.
+    다른 스레드가 사용 중인 세션은 제거하지 않습니다.
+    기록되지 않은 변경이 있는 세션은 먼저 기록한 뒤 제거하므로(기록에 실패하면 제거하지 않음)
+    제거된 세션은 다음 접근 시 파일에서 다시 로드됩니다.
+
+    제거할 세션은 _SESSIONS_LOCK 안에서 고르고, 기록은 잠금을 놓은 뒤 수행하므로
+    한 세션의 디스크 기록이 다른 세션 조회를 막지 않습니다.
+    기록 중인 세션은 세션 잠금을 잡고 있으므로, 그 세션에 접근하는 스레드만 기록이 끝날 때까지 기다렸다가
+    제거된 항목이면 새 항목으로 다시 로드합니다.
+
+    Args:
+        session_id: 세션 ID
+
     Returns:
-        State: 로드된 상태 객체 또는 기본 상태
+        _SessionEntry: 세션 캐시 항목
+    """
+    with _SESSIONS_LOCK:
+        entry = _SESSIONS.get(session_id)
+        if entry is not None:
+            _SESSIONS.move_to_end(session_id)
+            return entry
+
+        entry = _SessionEntry(session_id)
+        _SESSIONS[session_id] = entry
+        victims = _select_eviction_victims(entry)
+
+    for victim in victims:
+        _evict_session(victim)
+    return entry
+
+
+def _select_eviction_victims(entry: _SessionEntry) -> List[_SessionEntry]:
+    """
+    캐시 크기를 넘은 만큼 제거할 세션을 고르고 세션 잠금을 잡아 둡니다. (_SESSIONS_LOCK을 잡은 상태에서 호출)
+
+    Args:
+        entry: 방금 추가한 세션 항목 (제거하지 않음)
+
+    Returns:
+        List[_SessionEntry]: 잠금을 잡은 제거 대상 (이미 제거 중인 세션은 제외)
+    """
+    excess = len(_SESSIONS) - _SESSION_CACHE_SIZE - sum(1 for item in _SESSIONS.values() if item.evicting)
+    victims: List[_SessionEntry] = []
+    for candidate in list(_SESSIONS.values()):
+        if len(victims) >= excess:
+            break
+        if candidate is entry or candidate.evicting or not candidate.lock.acquire(blocking=False):
+            continue
+        candidate.evicting = True
+        victims.append(candidate)
+    return victims
+
+
+def _evict_session(victim: _SessionEntry) -> None:
+    """
+    잠금을 잡아 둔 세션의 변경을 기록하고 캐시에서 제거합니다. (_SESSIONS_LOCK 밖에서 호출)
+
+    Args:
+        victim: _select_eviction_victims()가 고른 세션 항목
+    """
+    flushed = False
+    try:
+        flushed = _flush_session(victim)
+    finally:
+        with _SESSIONS_LOCK:
+            victim.evicting = False
+            # 기록에 실패하면 제거하지 않음 (다음 제거 시 다시 시도)
+            if flushed and _SESSIONS.get(victim.session_id) is victim:
+                victim.evicted = True
+                del _SESSIONS[victim.session_id]
+                logger.debug(f"세션을 메모리 캐시에서 제거했습니다: {victim.session_id}")
+        victim.lock.release()
+    if flushed:
+        # 캐시에서 밀려난 세션의 다음 질문 추측은 오래 쓰이지 않을 가능성이 높으므로 버림
+        speculation.discard(victim.session_id)
+
+
+@contextmanager
+def _locked_session(session_id: str) -> Iterator[_SessionEntry]:
+    """
+    세션 캐시 항목을 잠근 상태로 제공하는 컨텍스트 매니저
+
+    잠금을 얻는 사이에 항목이 캐시에서 제거되었으면 새 항목으로 다시 시도합니다.
+    같은 스레드에서 중첩하여 사용할 수 있습니다.
+
+    Args:
+        session_id: 세션 ID
+    """
+    _validate_session_id(session_id)
+    while True:
+        entry = _get_session_entry(session_id)
+        with entry.lock:
+            if entry.evicted:
+                continue
+            yield entry
+            return
+
+
+def _changed_fields(old_state: Optional[State], new_state: State,
+                   fields: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    두 상태를 비교하여 값이 바뀐 최상위 필드 목록을 반환합니다.
+
+    상태 전체를 직렬화하여 해시를 계산하지 않고 필드 단위로만 비교합니다.
+    메시지는 추가 전용으로 다루므로 객체 동일성, 개수, 마지막 메시지만 확인합니다.
+    나머지 필드(결과, 현재 타겟, 모델 설정, 노드 결과)는 크기가 작으므로 값을 직접 비교합니다.
+
+    Args:
+        old_state: 기존 상태 (없으면 모든 필드가 변경된 것으로 간주)
+        new_state: 새 상태
+        fields: 비교할 필드 목록 (None이면 두 상태의 모든 필드)
+
+    Returns:
+        List[str]: 변경된 필드 이름 목록
+    """
+    if old_state is None:
+        return list(new_state.keys())
+
+    if fields is None:
+        fields = list(new_state.keys()) + [key for key in old_state if key not in new_state]
+
+    changed = []
+    for field in fields:
+        if field not in new_state or field not in old_state:
+            if (field in new_state) != (field in old_state):
+                changed.append(field)
+            continue
+
+        old_value = old_state[field]
+        new_value = new_state[field]
+        if old_value is new_value:
+            continue
+        if field == "messages":
+            if len(old_value) != len(new_value) or (new_value and new_value[-1] != old_value[-1]):
+                changed.append(field)
+        elif old_value != new_value:
+            changed.append(field)
+    return changed
+
+
+def _create_default_state() -> State:
+    """
+    기본 상태 객체를 생성합니다.
+
+    Returns:
+        State: 비어 있는 기본 상태
     """
-    global _STATE_CACHE, _STATE_HASH
-    
-    # 캐시된 상태가 있으면 반환 (성능 최적화)
-    if _STATE_CACHE is not None:
-        logger.debug("캐시된 상태를 반환합니다.")
-        return deepcopy(_STATE_CACHE)  # 원본 보존을 위해 깊은 복사 사용
-    
-    # 프로젝트 경로 가져오기
-    paths = get_project_paths()
-    state_file = paths["state_file"]
-    
-    # 기본 상태 객체 정의
-    default_state: State = {
-        "messages": [],      # 대화 메시지
+    return {
+        "messages": [],      # 대화 메시지 (최근 메시지 창)
+        "message_offset": 0,  # 보관된 메시지 수
         "node_result": "",   # 워크플로우 노드 결과
         "results": {},       # 수집된 데이터
         "current_target": None,  # 현재 타겟
         "model": None        # 모델 설정
     }
-    
-    # 상태 파일이 없으면 기본 상태 반환
-    if not state_file.exists():
-        logger.info(f"상태 파일이 없습니다. 필요시 새로 생성됩니다: {state_file}")
-        _STATE_CACHE = deepcopy(default_state)
-        _STATE_HASH = _calculate_state_hash(default_state)
-        return deepcopy(default_state)
-    
+
+
+def _record_write_stats(**increments: int) -> None:
+    """기록 통계 값을 증가시킵니다."""
+    with _WRITE_STATS_LOCK:
+        for key, value in increments.items():
+            _WRITE_STATS[key] += value
+
+
+def _archive_messages(entry: _SessionEntry, durable: bool = False) -> int:
+    """
+    메시지 창을 넘은 오래된 메시지를 고정 크기 구간으로 보관하고 창에서 제거합니다.
+
+    창에는 항상 최근 _HISTORY_WINDOW개 이상의 메시지가 남으며,
+    창이 _HISTORY_WINDOW + _HISTORY_SEGMENT_SIZE개를 넘을 때 구간 단위로 보관합니다.
+    보관에 실패하면 창을 그대로 두고 다음 기록 때 다시 시도합니다.
+
+    Args:
+        entry: 잠금을 획득한 세션 캐시 항목
+        durable: True이면 디스크 동기화(fsync)까지 수행
+
+    Returns:
+        int: 기록한 바이트 수
+    """
+    messages = entry.state.get("messages", [])
+    if _HISTORY_WINDOW <= 0 or len(messages) <= _HISTORY_WINDOW + _HISTORY_SEGMENT_SIZE:
+        return 0
+
+    offset = entry.state.get("message_offset", 0)
+    count = (len(messages) - _HISTORY_WINDOW) // _HISTORY_SEGMENT_SIZE * _HISTORY_SEGMENT_SIZE
+    backend = _get_backend()
+
+    written = 0
+    try:
+        for start in range(0, count, _HISTORY_SEGMENT_SIZE):
+            written += backend.write_segment(entry.session_id, offset + start,
+                                             messages[start:start + _HISTORY_SEGMENT_SIZE], durable=durable)
+    except NotImplementedError:
+        logger.debug(f"메시지 보관을 지원하지 않는 백엔드입니다: {backend.name}")
+        return written
+    except Exception as e:
+        logger.error(f"메시지 보관 중 오류 발생: {str(e)}")
+        return written
+
+    # 캐시 교체 (기존 메시지 목록은 수정하지 않으므로 이미 반환된 뷰는 그대로 유효)
+    entry.state = {**entry.state, "messages": messages[count:], "message_offset": offset + count}
+    for field in ("messages", "message_offset"):
+        entry.versions[field] = entry.versions.get(field, 0) + 1
+
+    logger.info(f"오래된 메시지 {count}개를 보관했습니다: {entry.session_id} (보관 메시지 수: {offset + count})")
+    return written
+
+
+def _flush_session(entry: _SessionEntry, durable: bool = False) -> bool:
+    """
+    마지막 기록 이후 변경된 필드가 있으면 세션 상태를 파일에 기록합니다.
+
+    변경된 필드가 없으면 파일 쓰기를 건너뜁니다.
+    기록에 실패하면 변경 표시가 그대로 남아 다음 기록 때 다시 시도됩니다.
+
+    Args:
+        entry: 잠금을 획득한 세션 캐시 항목
+        durable: True이면 디스크 동기화(fsync)까지 수행
+
+    Returns:
+        bool: 기록 성공 여부 (기록할 내용이 없으면 True)
+    """
+    dirty_fields = entry.dirty_fields()
+    if not dirty_fields:
+        logger.debug("상태가 변경되지 않았습니다. 파일 쓰기를 건너뜁니다.")
+        return True
+
+    # 메시지가 늘었으면 창을 넘은 오래된 메시지부터 보관
+    archived = _archive_messages(entry, durable) if "messages" in dirty_fields else 0
+    dirty_fields = entry.dirty_fields()
+
+    backend = _get_backend()
+    flushed_state = entry.flushed_state
+
+    if flushed_state is not None and _is_stale(entry):
+        # 마지막 기록 이후 다른 프로세스가 기록했으므로 변경분 대신 전체 상태를 기록 (마지막 기록이 우선)
+        logger.warning(f"다른 프로세스의 변경을 덮어씁니다: {entry.session_id}")
+        flushed_state = None
+        dirty_fields = list(entry.state.keys())
+
     try:
-        # 파일에서 상태 데이터 로드
-        with open(state_file, "r", encoding="utf-8") as f:
-            state_data = json.load(f)
-        
-        # JSON 데이터를 State 타입으로 변환
-        state: State = cast(State, state_data)
-        
-        # 필수 필드가 없으면 기본값으로 초기화
-        if "results" not in state:
-            state["results"] = {}
-            
-        for key in default_state:
-            if key not in state:
-                state[key] = default_state[key]
-                
-        logger.info(f"상태 파일을 성공적으로 로드했습니다")
-        
-        # 메모리 캐시 업데이트
-        _STATE_CACHE = deepcopy(state)
-        _STATE_HASH = _calculate_state_hash(state)
-        
-        return deepcopy(state)
-    
-    except json.JSONDecodeError as e:
-        # JSON 파싱 오류 처리
-        logger.error(f"상태 파일 파싱 중 오류 발생: {str(e)}")
-        _STATE_CACHE = deepcopy(default_state)
-        _STATE_HASH = _calculate_state_hash(default_state)
-        return deepcopy(default_state)
+        # 변경된 필드 목록과 마지막 기록 상태를 넘겨 백엔드가 변경분만 기록할 수 있도록 함
+        written = archived + backend.write(entry.session_id, entry.state, flushed_state, dirty_fields,
+                                           durable=durable)
+
+        entry.flushed_state = entry.state
+        entry.flushed_versions = dict(entry.versions)
+        entry.signature = _read_signature(entry.session_id)
+
+        # 한 번의 기록으로 합쳐진 변경 수 집계
+        # (생략된 기록은 이번 기록과 같은 크기였다고 가정하여 절약한 바이트 수를 추정)
+        coalesced = max(entry.pending_mutations - 1, 0)
+        entry.pending_mutations = 0
+        with _DIRTY_LOCK:
+            _DIRTY_SESSIONS.pop(entry.session_id, None)
+        _record_write_stats(flushes=1, coalesced_writes=coalesced,
+                            bytes_written=written or 0, bytes_saved=coalesced * (written or 0))
+
+        logger.info(f"상태를 성공적으로 저장했습니다: {entry.session_id} (변경 필드: {', '.join(dirty_fields)})")
+        return True
+
     except Exception as e:
-        # 기타 오류 처리
-        logger.error(f"상태 파일 로드 중 오류 발생: {str(e)}")
-        _STATE_CACHE = deepcopy(default_state)
-        _STATE_HASH = _calculate_state_hash(default_state)
-        return deepcopy(default_state)
+        _record_write_stats(flush_errors=1)
+        logger.error(f"상태 저장 중 오류 발생: {str(e)}")
+        return False
+
+
+def _flusher_loop() -> None:
+    """백그라운드 기록 스레드 본문: 주기마다 또는 요청이 있을 때 대기 중인 세션을 기록합니다."""
+    while True:
+        _FLUSH_EVENT.wait(_FLUSH_INTERVAL)
+        _FLUSH_EVENT.clear()
+        _flush_dirty_sessions()
+
+
+def _schedule_flush(entry: _SessionEntry) -> None:
+    """
+    세션을 지연 기록 대상으로 등록합니다.
+
+    백그라운드 기록 스레드가 없으면 시작하고,
+    대기 중인 변경 수가 임계값 이상이면 즉시 기록을 요청합니다.
+
+    Args:
+        entry: 잠금을 획득한 세션 캐시 항목
+    """
+    global _FLUSHER
+
+    with _DIRTY_LOCK:
+        _DIRTY_SESSIONS[entry.session_id] = entry
+        pending = sum(dirty_entry.pending_mutations for dirty_entry in _DIRTY_SESSIONS.values())
+
+        if _FLUSHER is None or not _FLUSHER.is_alive():
+            _FLUSHER = threading.Thread(target=_flusher_loop, name="state-flusher", daemon=True)
+            _FLUSHER.start()
+
+    if pending >= _FLUSH_MAX_PENDING:
+        _FLUSH_EVENT.set()
+
+
+def _flush_dirty_sessions(session_id: Optional[str] = None, durable: bool = False) -> bool:
+    """
+    기록을 기다리는 세션의 상태를 기록합니다.
+
+    Args:
+        session_id: 기록할 세션 ID (None이면 대기 중인 모든 세션)
+        durable: True이면 디스크 동기화(fsync)까지 수행
+
+    Returns:
+        bool: 모든 기록이 성공했으면 True
+    """
+    if session_id is not None:
+        with _locked_session(session_id) as entry:
+            return _flush_session(entry, durable)
+
+    with _DIRTY_LOCK:
+        entries = list(_DIRTY_SESSIONS.values())
+
+    success = True
+    for entry in entries:
+        with entry.lock:
+            # 그 사이 캐시에서 제거되었거나 무효화된 세션은 이미 처리됨
+            if entry.evicted or entry.state is None:
+                continue
+            success = _flush_session(entry, durable) and success
+    return success
+
+
+# 프로세스 종료 시 기록되지 않은 변경 저장
+atexit.register(_flush_dirty_sessions)
+
+
+def _persist_state(entry: _SessionEntry, state: State, changed_fields: List[str],
+                   durable: bool = False) -> bool:
+    """
+    메모리 캐시를 새 상태로 교체하고 변경된 필드의 버전을 올린 뒤 파일에 기록합니다.
+
+    behind 기록 방식에서는 기록을 백그라운드 스레드에 맡기고 바로 반환합니다.
+    전달된 상태는 그대로 캐시가 되므로 이후에 수정되면 안 됩니다.
+
+    Args:
+        entry: 잠금을 획득한 세션 캐시 항목
+        state: 새 상태 객체 (캐시와 구조를 공유해도 됨)
+        changed_fields: 이전 상태와 비교하여 바뀐 필드 목록
+        durable: True이면 기록 방식과 무관하게 즉시 기록하고 디스크 동기화(fsync)까지 수행
+
+    Returns:
+        bool: 저장 성공 여부 (지연 기록 시 항상 True)
+    """
+    if not changed_fields:
+        logger.debug("상태가 변경되지 않았습니다. 파일 쓰기를 건너뜁니다.")
+        return True
+
+    # 메모리 캐시 교체 (기존 캐시 객체는 수정하지 않으므로 이미 반환된 뷰는 그대로 유효)
+    entry.state = state
+    for field in changed_fields:
+        entry.versions[field] = entry.versions.get(field, 0) + 1
+    entry.pending_mutations += 1
+    _record_write_stats(mutations=1)
+    if state.get("node_result") == RESULT_ALL_TARGETS_COMPLETE:
+        # 더 이상 질문하지 않으므로 남은 추측을 버림
+        speculation.discard(entry.session_id)
+
+    if durable or _WRITE_MODE != "behind":
+        return _flush_session(entry, durable)
+
+    _schedule_flush(entry)
+    return True
+
+
+def _save_state(state: State, session_id: str = DEFAULT_SESSION_ID, durable: bool = False) -> bool:
+    """
+    상태 데이터를 세션의 상태 파일에 저장합니다.
+
+    바뀐 필드만 복사하여 캐시에 반영하고, 바뀌지 않은 필드는 기존 캐시 객체를 그대로 사용합니다.
+    추가 전용인 메시지는 새로 추가된 메시지만 복사합니다.
+    호출자가 이후에 상태를 수정해도 캐시에는 영향이 없습니다.
+
+    Args:
+        state: 저장할 상태 객체 (읽기 전용 뷰도 가능)
+        session_id: 세션 ID
+        durable: True이면 즉시 기록하고 디스크 동기화(fsync)까지 수행
+
+    Returns:
+        bool: 저장 성공 여부
+    """
+    with _locked_session(session_id) as entry:
+        old_state = _load_state(session_id)
+        changed_fields = _changed_fields(old_state, state)
+
+        new_state = {key: value for key, value in old_state.items() if key in state}
+        for field in changed_fields:
+            if field not in state:
+                continue
+            old_value = old_state.get(field)
+            new_value = state[field]
+            if field == "messages" and old_value and len(new_value) > len(old_value) \
+                    and new_value[len(old_value) - 1] == old_value[-1]:
+                # 기존 메시지 객체는 공유하고 새 메시지만 복사
+                new_state[field] = [*old_value, *thaw(new_value[len(old_value):])]
+            else:
+                new_state[field] = thaw(new_value)
 
+        return _persist_state(entry, new_state, changed_fields, durable)
 
-def _invalidate_cache() -> None:
+
+def _update_state(session_id: str, updates: Dict[str, Any], durable: bool = False) -> State:
+    """
+    상태의 일부 최상위 필드만 교체하여 저장합니다.
+
+    변경되지 않은 필드는 기존 캐시와 객체를 공유하므로(구조 공유)
+    상태 전체를 복사하지 않습니다.
+
+    Args:
+        session_id: 세션 ID
+        updates: 교체할 최상위 필드 (호출자가 이후에 수정하지 않는 객체여야 함)
+        durable: True이면 즉시 기록하고 디스크 동기화(fsync)까지 수행
+
+    Returns:
+        State: 저장된 상태 (캐시와 공유되므로 수정하면 안 됨)
+    """
+    with _locked_session(session_id) as entry:
+        old_state = _load_state(session_id)
+        state = {**old_state, **updates}
+        _persist_state(entry, state, _changed_fields(old_state, state, updates.keys()), durable)
+        return entry.state
+
+
+def _load_state(session_id: str = DEFAULT_SESSION_ID) -> State:
+    """
+    세션의 상태 파일에서 상태 데이터를 로드합니다.
+
+    캐시된 상태가 있으면 파일을 다시 읽지 않고 캐시를 반환합니다.
+    단, 기록되지 않은 변경이 없고 다른 프로세스가 상태를 기록했으면(서명 불일치) 다시 로드합니다.
+    파일이 없는 경우 기본 상태 객체를 반환합니다.
+
+    반환된 상태는 캐시 자체이므로 복사 비용이 없지만, 절대 직접 수정하면 안 됩니다.
+    외부에 노출할 때는 readonly()로 감싸고, 변경은 _update_state()/_save_state()로만 합니다.
+
+    Args:
+        session_id: 세션 ID
+
+    Returns:
+        State: 로드된 상태 객체 또는 기본 상태
+    """
+    with _locked_session(session_id) as entry:
+        # 캐시된 상태가 있으면 반환 (성능 최적화)
+        if entry.state is not None:
+            # 기록되지 않은 변경이 있으면 캐시가 최신이므로 검증하지 않음
+            if entry.pending_mutations or entry.dirty_fields() or not _is_stale(entry):
+                logger.debug("캐시된 상태를 반환합니다.")
+                return entry.state
+            logger.info(f"다른 프로세스에서 상태가 변경되었습니다. 다시 로드합니다: {session_id}")
+
+        # 기본 상태 객체 정의
+        default_state = _create_default_state()
+        # 로드 도중 다른 프로세스가 기록하면 다음 접근 때 다시 로드되도록 서명을 먼저 읽음
+        signature = _read_signature(session_id)
+
+        try:
+            # 백엔드에서 상태 데이터 로드
+            state_data = _get_backend().load(session_id)
+
+            if state_data is None:
+                # 저장된 상태가 없으면 기본 상태 사용
+                logger.info(f"저장된 상태가 없습니다. 필요시 새로 생성됩니다: {session_id}")
+                state = default_state
+                flushed_state = None
+            else:
+                # JSON 데이터를 State 타입으로 변환
+                state = cast(State, state_data)
+
+                # 필수 필드가 없으면 기본값으로 초기화
+                for key in default_state:
+                    if key not in state:
+                        state[key] = default_state[key]
+
+                logger.info(f"상태를 성공적으로 로드했습니다: {session_id}")
+                flushed_state = state
+
+        except json.JSONDecodeError as e:
+            # JSON 파싱 오류 처리
+            logger.error(f"상태 파일 파싱 중 오류 발생: {str(e)}")
+            state = default_state
+            flushed_state = None
+        except Exception as e:
+            # 기타 오류 처리
+            logger.error(f"상태 로드 중 오류 발생: {str(e)}")
+            state = default_state
+            flushed_state = None
+
+        # 메모리 캐시 업데이트 (파일과 동일하므로 변경 필드 없음)
+        entry.state = state
+        entry.flushed_state = flushed_state
+        entry.versions = {}
+        entry.flushed_versions = {}
+        entry.pending_mutations = 0
+        entry.signature = signature
+        return state
+
+
+def _invalidate_cache(session_id: Optional[str] = None) -> None:
     """
     메모리 캐시를 무효화합니다.
-    
+
     다음 _load_state() 호출 시 파일에서 상태를 다시 로드하도록 합니다.
     외부 프로세스에서 파일이 변경된 경우 사용합니다.
+    기록되지 않은 변경이 있으면 먼저 기록합니다.
+
+    Args:
+        session_id: 무효화할 세션 ID (None이면 모든 세션)
     """
-    global _STATE_CACHE, _STATE_HASH
-    _STATE_CACHE = None
-    _STATE_HASH = None
+    with _SESSIONS_LOCK:
+        session_ids = list(_SESSIONS.keys()) if session_id is None else [session_id]
+
+    for target_session_id in session_ids:
+        with _locked_session(target_session_id) as entry:
+            if not _flush_session(entry):
+                logger.warning(f"기록되지 않은 변경을 버리고 캐시를 무효화합니다: {target_session_id}")
+                with _DIRTY_LOCK:
+                    _DIRTY_SESSIONS.pop(target_session_id, None)
+            entry.state = None
+            entry.flushed_state = None
+            entry.versions = {}
+            entry.flushed_versions = {}
+            entry.pending_mutations = 0
     logger.debug("상태 캐시가 무효화되었습니다")
 
 
-def _reset_state() -> bool:
+def _reset_state(session_id: str = DEFAULT_SESSION_ID) -> bool:
     """
-    상태를 완전히 초기화합니다.
-    
-    1. state.json 파일 삭제
+    세션의 상태를 완전히 초기화합니다.
+
+    1. 저장된 상태 삭제
     2. 메모리 캐시 초기화
     3. 기본 상태로 재설정
-    
+
+    Args:
+        session_id: 세션 ID
+
     Returns:
         bool: 초기화 성공 여부
     """
-    global _STATE_CACHE, _STATE_HASH
-    
-    # 프로젝트 경로 가져오기
-    paths = get_project_paths()
-    state_file = paths["state_file"]
-    
-    try:
-        # 파일이 존재하면 삭제
-        if state_file.exists():
-            state_file.unlink()
-            logger.info(f"상태 파일을 삭제했습니다: {state_file}")
-        
-        # 기본 상태 객체 생성
-        default_state: State = {
-            "messages": [],
-            "node_result": "",
-            "results": {},
-            "current_target": None,
-            "model": None
-        }
-        
-        # 메모리 캐시 초기화
-        _STATE_CACHE = deepcopy(default_state)
-        _STATE_HASH = _calculate_state_hash(default_state)
-        
-        return True
-    
-    except Exception as e:
-        logger.error(f"상태 초기화 중 오류 발생: {str(e)}")
-        return False
+    with _locked_session(session_id) as entry:
+        try:
+            # 백엔드에 저장된 상태 삭제
+            _get_backend().delete(session_id)
+
+            # 기본 상태 객체 생성
+            default_state = _create_default_state()
+
+            # 메모리 캐시 초기화
+            entry.state = default_state
+            entry.flushed_state = None
+            entry.versions = {}
+            entry.flushed_versions = {}
+            entry.pending_mutations = 0
+            entry.signature = _read_signature(session_id)
+            with _DIRTY_LOCK:
+                _DIRTY_SESSIONS.pop(session_id, None)
+            speculation.discard(session_id)
+
+            return True
+
+        except Exception as e:
+            logger.error(f"상태 초기화 중 오류 발생: {str(e)}")
+            return False
 
 
 class StateManager:
     """
     상태 관리를 위한 유틸리티 클래스
-    
+
     이 클래스는 애플리케이션의 다양한 부분에서 상태에 접근하고 수정하기 위한
-    정적 메서드를 제공합니다. 내부적으로는 _load_state()와 _save_state() 함수를
-    사용하여 상태의 일관성을 유지합니다.
+    정적 메서드를 제공합니다. 내부적으로는 _load_state()와 _update_state(), _save_state()
+    함수를 사용하여 상태의 일관성을 유지합니다.
+
+    조회 메서드는 캐시를 복사하지 않고 읽기 전용 뷰(ReadOnlyDict/ReadOnlyList)를 반환하므로
+    대화 길이와 무관하게 O(1)입니다. 상태 변경은 set_*/append_message/update_state/save로만 합니다.
+    수정 가능한 복사본이 필요하면 src.utils.readonly.thaw()를 사용하세요.
+
+    모든 메서드는 session_id 인자로 대상 세션을 지정합니다.
+    지정하지 않으면 기본 세션(state.json)을 사용합니다.
     """
-    
+
     @staticmethod
-    def get_messages() -> List[Dict]:
+    def get_messages(session_id: str = DEFAULT_SESSION_ID) -> Sequence[Mapping]:
         """
         상태에서 대화 메시지 목록을 가져옵니다.
-        
+
+        메모리에 유지되는 최근 메시지 창만 반환합니다.
+        보관된 이전 메시지까지 필요하면 get_message_history()를 사용하세요.
+
+        Args:
+            session_id: 세션 ID
+
         Returns:
-            List[Dict]: 메시지 목록
+            Sequence[Mapping]: 메시지 목록의 읽기 전용 뷰
+        """
+        state = _load_state(session_id)
+        return readonly(state.get("messages", []))
+
+    @staticmethod
+    def get_message_count(session_id: str = DEFAULT_SESSION_ID) -> int:
+        """
+        보관된 메시지를 포함한 전체 메시지 수를 반환합니다.
+
+        Args:
+            session_id: 세션 ID
+
+        Returns:
+            int: 전체 메시지 수
+        """
+        state = _load_state(session_id)
+        return state.get("message_offset", 0) + len(state.get("messages", []))
+
+    @staticmethod
+    def get_message_history(session_id: str = DEFAULT_SESSION_ID, start: int = 0,
+                            end: Optional[int] = None) -> Sequence[Mapping]:
+        """
+        보관된 메시지를 포함한 전체 대화 중 [start, end) 구간을 가져옵니다.
+
+        메모리 창 이전의 메시지는 필요한 구간만 저장소에서 읽어오며 캐시에 올리지 않습니다.
+
+        Args:
+            session_id: 세션 ID
+            start: 첫 메시지 위치
+            end: 마지막 메시지 다음 위치 (None이면 대화 끝까지)
+
+        Returns:
+            Sequence[Mapping]: 메시지 목록의 읽기 전용 뷰
+        """
+        with _locked_session(session_id):
+            state = _load_state(session_id)
+            offset = state.get("message_offset", 0)
+            window = state.get("messages", [])
+
+            start = max(start, 0)
+            end = offset + len(window) if end is None else min(end, offset + len(window))
+            if start >= end:
+                return readonly([])
+            if start >= offset:
+                # 창 안의 구간은 복사하지 않고 그대로 반환
+                return readonly(window[start - offset:end - offset])
+
+            archived = _get_backend().load_messages(session_id, start, min(end, offset))
+            return readonly([*archived, *window[:max(end - offset, 0)]])
+
+    @staticmethod
+    def iter_message_history(session_id: str = DEFAULT_SESSION_ID) -> Iterator[Mapping]:
+        """
+        보관된 메시지를 포함한 전체 대화를 처음부터 순서대로 반환합니다.
+
+        구간 단위로 읽으므로 대화 길이와 무관하게 메모리 사용량이 일정합니다. (내보내기용)
+
+        Args:
+            session_id: 세션 ID
+
+        Yields:
+            Mapping: 메시지의 읽기 전용 뷰
         """
-        state = _load_state()
-        return state.get("messages", [])
-    
+        batch_size = max(_HISTORY_SEGMENT_SIZE, 1)
+        for start in range(0, StateManager.get_message_count(session_id), batch_size):
+            yield from StateManager.get_message_history(session_id, start, start + batch_size)
+
     @staticmethod
-    def get_results() -> Dict:
+    def get_results(session_id: str = DEFAULT_SESSION_ID) -> Mapping:
         """
         상태에서 수집된 결과 데이터를 가져옵니다.
-        
+
+        Args:
+            session_id: 세션 ID
+
         Returns:
-            Dict: 수집된 결과 데이터
+            Mapping: 수집된 결과 데이터의 읽기 전용 뷰
         """
-        state = _load_state()
-        return state.get("results", {})
-    
+        state = _load_state(session_id)
+        return readonly(state.get("results", {}))
+
     @staticmethod
-    def get_node_result() -> str:
+    def get_node_result(session_id: str = DEFAULT_SESSION_ID) -> str:
         """
         상태에서 워크플로우 노드 결과를 가져옵니다.
-        
+
+        Args:
+            session_id: 세션 ID
+
         Returns:
             str: 노드 결과 문자열
         """
-        state = _load_state()
+        state = _load_state(session_id)
         return state.get("node_result", "")
-    
+
     @staticmethod
-    def get_current_target() -> Optional[TargetItem]:
+    def get_current_target(session_id: str = DEFAULT_SESSION_ID) -> Optional[Mapping]:
         """
         상태에서 현재 처리 중인 타겟을 가져옵니다.
-        
+
+        Args:
+            session_id: 세션 ID
+
         Returns:
-            Optional[TargetItem]: 현재 타겟 또는 None
+            Optional[Mapping]: 현재 타겟의 읽기 전용 뷰 또는 None
         """
-        state = _load_state()
-        return state.get("current_target")
-    
+        state = _load_state(session_id)
+        return readonly(state.get("current_target"))
+
     @staticmethod
-    def get_model_settings() -> Tuple[str, float, str, Optional[str]]:
+    def get_model_settings(session_id: str = DEFAULT_SESSION_ID) -> Tuple[str, float, str, Optional[str]]:
         """
         상태에서 모델 설정을 가져옵니다.
-        
+
+        Args:
+            session_id: 세션 ID
+
         Returns:
-            Tuple[str, float, str, Optional[str]]: 
+            Tuple[str, float, str, Optional[str]]:
                 (모델 이름, 온도, 모델 유형, API 키)
         """
-        state = _load_state()
+        state = _load_state(session_id)
         model = state.get("model")
-        
+
         if model is None:
             # 모델이 선택되지 않은 경우 None 반환
             return None, None, None, None
-        
+
         return (
-            model.get("name"), 
+            model.get("name"),
             model.get("temperature"),
             model.get("type"),
             model.get("api_key")
         )
-    
+
     @staticmethod
-    def set_model_settings(model_name: str, temperature: float, model_type: str, api_key: Optional[str] = None) -> None:
+    def set_model_settings(model_name: str, temperature: float, model_type: str, api_key: Optional[str] = None,
+                           session_id: str = DEFAULT_SESSION_ID, durable: bool = False) -> None:
         """
         상태에 모델 설정을 업데이트합니다.
-        
+
         Args:
             model_name: 사용할 모델 이름
             temperature: 모델 온도 설정 (높을수록 무작위성 증가)
             model_type: 모델 유형 ("ollama" 또는 "openai")
             api_key: OpenAI 모델 사용 시 필요한 API 키
+            session_id: 세션 ID
+            durable: True이면 즉시 기록하고 디스크 동기화(fsync)까지 수행
         """
-        state = _load_state()
-        
         # 새 모델 설정 생성
-        state["model"] = {
-            "name": model_name,
-            "temperature": temperature,
-            "type": model_type,
-            "api_key": api_key
-        }
-        
-        _save_state(state)
-    
+        _update_state(session_id, {
+            "model": {
+                "name": model_name,
+                "temperature": temperature,
+                "type": model_type,
+                "api_key": api_key
+            }
+        }, durable)
+
     @staticmethod
-    def append_message(message: Dict) -> List[Dict]:
+    def append_message(message: Dict, session_id: str = DEFAULT_SESSION_ID,
+                       durable: bool = False) -> Sequence[Mapping]:
         """
         상태에 새 메시지를 추가합니다.
-        
+
+        기존 메시지 객체는 새 목록과 공유되며, 추가되는 메시지만 복사됩니다.
+
         Args:
             message: 추가할 메시지 객체
-            
+            session_id: 세션 ID
+            durable: True이면 즉시 기록하고 디스크 동기화(fsync)까지 수행
+
         Returns:
-            List[Dict]: 업데이트된 메시지 목록
-        """
-        state = _load_state()
-        messages = state.get("messages", [])
-        messages.append(message)
-        state["messages"] = messages
-        _save_state(state)
-        return messages
-    
+            Sequence[Mapping]: 업데이트된 메시지 목록의 읽기 전용 뷰
+        """
+        with _locked_session(session_id):
+            messages = [*_load_state(session_id).get("messages", []), thaw(message)]
+            _update_state(session_id, {"messages": messages}, durable)
+            return readonly(messages)
+
     @staticmethod
-    def update_state(state_update: Dict) -> State:
+    def update_state(state_update: Dict, session_id: str = DEFAULT_SESSION_ID, durable: bool = False) -> Mapping:
         """
         상태를 업데이트하고 저장합니다.
-        
+
         Args:
             state_update: 업데이트할 상태 필드
-            
+            session_id: 세션 ID
+            durable: True이면 즉시 기록하고 디스크 동기화(fsync)까지 수행
+
         Returns:
-            State: 업데이트된 상태
+            Mapping: 업데이트된 상태의 읽기 전용 뷰
         """
-        state = _load_state()
-        state.update(state_update)
-        _save_state(state)
-        return state
-    
+        return readonly(_update_state(session_id, thaw(state_update), durable))
+
     @staticmethod
-    def load() -> State:
+    def load(session_id: str = DEFAULT_SESSION_ID) -> Mapping:
         """
         현재 상태를 로드합니다.
-        
+
+        Args:
+            session_id: 세션 ID
+
         Returns:
-            State: 현재 상태 객체
+            Mapping: 현재 상태의 읽기 전용 뷰
         """
-        return _load_state()
-    
+        return readonly(_load_state(session_id))
+
     @staticmethod
-    def save(state: State) -> bool:
+    def save(state: State, session_id: str = DEFAULT_SESSION_ID, durable: bool = False) -> bool:
         """
         제공된 상태를 저장합니다.
-        
+
         Args:
             state: 저장할 상태 객체
-            
+            session_id: 세션 ID
+            durable: True이면 즉시 기록하고 디스크 동기화(fsync)까지 수행
+
         Returns:
             bool: 저장 성공 여부
         """
-        return _save_state(state)
-    
+        return _save_state(state, session_id, durable)
+
+    @staticmethod
+    def flush(session_id: Optional[str] = None, durable: bool = False) -> bool:
+        """
+        기록을 기다리는 변경을 즉시 기록합니다.
+
+        behind 기록 방식에서 대화 턴이 끝날 때 호출합니다. sync 방식에서는 기록할 내용이 없습니다.
+
+        Args:
+            session_id: 기록할 세션 ID (None이면 대기 중인 모든 세션)
+            durable: True이면 디스크 동기화(fsync)까지 수행
+
+        Returns:
+            bool: 기록 성공 여부
+        """
+        return _flush_dirty_sessions(session_id, durable)
+
+    @staticmethod
+    def get_write_stats() -> Dict[str, int]:
+        """
+        상태 기록 통계를 반환합니다.
+
+        Returns:
+            Dict[str, int]: 변경 횟수(mutations), 기록 횟수(flushes), 합쳐진 기록 수(coalesced_writes),
+                기록한 바이트 수(bytes_written), 절약한 추정 바이트 수(bytes_saved), 기록 실패 횟수(flush_errors)
+        """
+        with _WRITE_STATS_LOCK:
+            return dict(_WRITE_STATS)
+
     @staticmethod
-    def invalidate_cache() -> None:
+    def invalidate_cache(session_id: Optional[str] = None) -> None:
         """
         캐시를 무효화합니다.
-        
-        외부에서 상태 파일이 변경된 경우 호출하세요.
+
+        외부 프로세스의 변경은 저장소 서명으로 자동 감지되므로,
+        서명으로 감지할 수 없는 변경(예: 수정 시각을 보존한 파일 복원)이 있을 때만 호출하세요.
         다음 로드 시 파일에서 다시 읽습니다.
+
+        Args:
+            session_id: 무효화할 세션 ID (None이면 모든 세션)
         """
-        _invalidate_cache()
-        
+        _invalidate_cache(session_id)
+
     @staticmethod
-    def reset() -> bool:
+    def reset(session_id: str = DEFAULT_SESSION_ID) -> bool:
         """
         상태를 완전히 초기화합니다.
-        
+
         모든 메시지, 결과 데이터, 모델 설정을 초기화합니다.
-        
+
+        Args:
+            session_id: 세션 ID
+
         Returns:
             bool: 초기화 성공 여부
         """
-        return _reset_state()
-    
+        return _reset_state(session_id)
+
     @staticmethod
-    def is_model_selected() -> bool:
+    def is_model_selected(session_id: str = DEFAULT_SESSION_ID) -> bool:
         """
         모델이 선택되었는지 확인합니다.
-        
+
+        Args:
+            session_id: 세션 ID
+
         Returns:
             bool: 모델이 선택되었으면 True, 아니면 False
         """
-        state = _load_state()
+        state = _load_state(session_id)
         return state.get("model") is not None
-    
+
     @staticmethod
-    def set_model_selected(selected: bool) -> None:
+    def set_model_selected(selected: bool, session_id: str = DEFAULT_SESSION_ID) -> None:
         """
         모델 선택 상태를 설정합니다.
-        
+
         Args:
             selected: 모델 선택 여부 (True/False)
+            session_id: 세션 ID
         """
-        state = _load_state()
-        
         if not selected:
             # 모델 선택 해제
-            state["model"] = None
+            _update_state(session_id, {"model": None})
         # 모델 선택 설정은 set_model_settings에서 처리
-        
-        _save_state(state)
\ No newline at end of file
+
+    @staticmethod
+    def list_sessions() -> List[str]:
+        """
+        저장된 세션 ID 목록을 반환합니다.
+
+        Returns:
+            List[str]: 세션 ID 목록
+        """
+        return [
+            session_id for session_id in _get_backend().list_sessions()
+            if _SESSION_ID_PATTERN.match(session_id)
+        ]
+
+    @staticmethod
+    def find_sessions_missing_target(target_id: str) -> List[str]:
+        """
+        특정 타겟의 결과가 아직 수집되지 않은 세션 목록을 반환합니다.
+
+        sqlite 저장 방식에서는 색인 조회로 처리하므로 세션 상태를 메모리에 올리지 않습니다.
+
+        Args:
+            target_id: 타겟 ID
+
+        Returns:
+            List[str]: 세션 ID 목록
+        """
+        return _get_backend().sessions_missing_target(target_id)
+
+    @staticmethod
+    def set_backend(backend: StateBackend) -> None:
+        """
+        상태 저장소 백엔드를 교체합니다.
+
+        기록되지 않은 변경은 기존 백엔드에 먼저 기록하고,
+        메모리 캐시를 비우므로 이후 조회는 새 백엔드에서 다시 로드됩니다.
+
+        Args:
+            backend: 사용할 StateBackend 구현
+        """
+        global _BACKEND
+
+        if _BACKEND is not None:
+            _flush_dirty_sessions()
+        with _SESSIONS_LOCK:
+            _SESSIONS.clear()
+        with _DIRTY_LOCK:
+            _DIRTY_SESSIONS.clear()
+        if _BACKEND is not None and _BACKEND is not backend:
+            _BACKEND.close()
+        _BACKEND = backend
@@ -0,0 +1,50 @@
+"""
+상태 저장소 백엔드 패키지
+
+StateManager가 세션 상태를 기록하는 백엔드를 제공합니다:
+- json: 세션마다 JSON 파일 하나에 전체 상태를 기록
+- journal: 세션 JSON 파일을 스냅샷으로 두고 변경분만 저널 파일에 추가
+- sqlite: 모든 세션을 SQLite 데이터베이스(WAL 모드)에 저장
+"""
+
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.storage.base import StateBackend, DEFAULT_SESSION_ID
+from src.storage.json_file import JsonFileBackend
+from src.storage.journal import JournalBackend
+from src.storage.sqlite import SqliteBackend
+from src.utils.codec import StateCodec
+
+
+def create_backend(name: str, paths: Dict[str, Path], journal_compact_threshold: int = 100,
+                   codec: Optional[StateCodec] = None) -> StateBackend:
+    """
+    이름에 해당하는 상태 저장소 백엔드를 생성합니다.
+
+    Args:
+        name: 백엔드 이름 ("json", "journal", "sqlite")
+        paths: get_project_paths()가 반환한 프로젝트 경로
+        journal_compact_threshold: journal 백엔드의 스냅샷 기록 기준 저널 항목 수
+        codec: json/journal 백엔드의 상태 파일 직렬화 코덱 (None이면 들여쓰기된 JSON)
+
+    Returns:
+        StateBackend: 생성된 백엔드
+
+    Raises:
+        ValueError: 알 수 없는 백엔드 이름인 경우
+    """
+    if name == JsonFileBackend.name:
+        return JsonFileBackend(paths["state_file"], paths["sessions_dir"], codec)
+    if name == JournalBackend.name:
+        return JournalBackend(paths["state_file"], paths["sessions_dir"], journal_compact_threshold, codec)
+    if name == SqliteBackend.name:
+        return SqliteBackend(paths["state_db"])
+    raise ValueError(f"알 수 없는 상태 저장 방식입니다: {name}")
+
+
+__all__ = [
+    "StateBackend", "DEFAULT_SESSION_ID",
+    "JsonFileBackend", "JournalBackend", "SqliteBackend",
+    "create_backend"
+]
@@ -0,0 +1,150 @@
+"""
+상태 저장소 백엔드 인터페이스 모듈
+
+StateManager는 세션 상태를 메모리에 캐싱하고, 파일 기록은 이 인터페이스를 구현한 백엔드에 위임합니다.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+# 세션 ID를 지정하지 않았을 때 사용하는 기본 세션
+DEFAULT_SESSION_ID = "default"
+
+
+class StateBackend(ABC):
+    """
+    세션 상태 저장소 백엔드의 기본 클래스
+
+    모든 메서드는 같은 세션에 대해 동시에 호출되지 않습니다. (StateManager가 세션 단위로 잠금)
+    서로 다른 세션에 대해서는 여러 스레드에서 동시에 호출될 수 있습니다.
+    """
+
+    #: 백엔드 이름 (COLLECTOR_STATE_STORAGE 값과 동일)
+    name: str = ""
+
+    @abstractmethod
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        세션 상태를 읽어옵니다.
+
+        Args:
+            session_id: 세션 ID
+
+        Returns:
+            Optional[Dict[str, Any]]: 저장된 상태 (저장된 적이 없으면 None)
+        """
+
+    @abstractmethod
+    def write(self, session_id: str, state: Dict[str, Any],
+              flushed_state: Optional[Dict[str, Any]], fields: List[str],
+              durable: bool = False) -> int:
+        """
+        세션 상태의 변경분을 기록합니다.
+
+        Args:
+            session_id: 세션 ID
+            state: 기록할 현재 상태
+            flushed_state: 마지막으로 기록된 상태 (처음 기록하는 경우 None)
+            fields: 마지막 기록 이후 변경된 최상위 필드 목록
+            durable: True이면 반환 전에 기록 내용을 디스크에 동기화(fsync)
+
+        Returns:
+            int: 기록한 바이트 수
+
+        Raises:
+            Exception: 기록에 실패한 경우 (호출자는 변경 표시를 유지하고 다음에 다시 시도)
+        """
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """
+        세션 상태를 삭제합니다.
+
+        Args:
+            session_id: 세션 ID
+        """
+
+    @abstractmethod
+    def list_sessions(self) -> List[str]:
+        """
+        저장된 세션 ID 목록을 반환합니다.
+
+        Returns:
+            List[str]: 정렬된 세션 ID 목록
+        """
+
+    def write_segment(self, session_id: str, start: int, messages: List[Dict[str, Any]],
+                      durable: bool = False) -> int:
+        """
+        메모리 창에서 밀려난 오래된 메시지 구간을 보관합니다.
+
+        구간은 한 번 기록되면 바뀌지 않으며, 같은 구간을 다시 기록해도 결과가 같아야 합니다.
+        (상태 기록에 실패하면 다음 기록 때 같은 구간을 다시 보관할 수 있음)
+
+        Args:
+            session_id: 세션 ID
+            start: 구간 첫 메시지의 전체 대화 내 위치
+            messages: 보관할 메시지 목록
+            durable: True이면 반환 전에 디스크에 동기화(fsync)
+
+        Returns:
+            int: 기록한 바이트 수
+
+        Raises:
+            NotImplementedError: 메시지 보관을 지원하지 않는 백엔드인 경우
+        """
+        raise NotImplementedError(f"{type(self).__name__}는 메시지 보관을 지원하지 않습니다")
+
+    def load_messages(self, session_id: str, start: int, end: int) -> List[Dict[str, Any]]:
+        """
+        보관된 메시지 중 [start, end) 구간을 읽어옵니다.
+
+        Args:
+            session_id: 세션 ID
+            start: 읽을 첫 메시지의 전체 대화 내 위치
+            end: 읽을 마지막 메시지 다음 위치
+
+        Returns:
+            List[Dict[str, Any]]: 보관된 메시지 목록 (보관되지 않은 위치는 제외)
+        """
+        return []
+
+    def signature(self, session_id: str) -> Any:
+        """
+        저장된 세션 상태의 변경 여부를 판단하기 위한 서명을 반환합니다.
+
+        StateManager는 캐시를 반환하기 전에 서명을 비교하여, 다른 프로세스가 상태를 바꿨으면 다시 로드합니다.
+        전체 상태를 읽지 않고 구할 수 있는 값(파일 stat, 버전 번호 등)이어야 합니다.
+
+        저장된 상태가 없을 때도 값(예: None)을 반환해야 하며, 기본 구현은 항상 None을 반환하므로
+        캐시가 항상 유효한 것으로 간주됩니다.
+
+        Args:
+            session_id: 세션 ID
+
+        Returns:
+            Any: 비교 가능한 서명 값
+        """
+        return None
+
+    def sessions_missing_target(self, target_id: str) -> List[str]:
+        """
+        특정 타겟의 결과가 아직 수집되지 않은 세션 목록을 반환합니다.
+
+        기본 구현은 모든 세션을 로드하여 확인합니다. 색인을 지원하는 백엔드는 재정의합니다.
+
+        Args:
+            target_id: 타겟 ID
+
+        Returns:
+            List[str]: 정렬된 세션 ID 목록
+        """
+        missing = []
+        for session_id in self.list_sessions():
+            state = self.load(session_id) or {}
+            if target_id not in state.get("results", {}):
+                missing.append(session_id)
+        return missing
+
+    def close(self) -> None:
+        """백엔드가 사용하는 자원(연결 등)을 정리합니다."""
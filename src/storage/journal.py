@@ -0,0 +1,98 @@
+"""
+저널 상태 저장소 백엔드 모듈
+
+세션 상태 파일을 스냅샷으로 사용하고, 변경분은 <상태 파일 이름>.journal 파일에 추가합니다.
+저널 형식과 재생/압축 로직은 src.utils.journal.StateJournal을 사용합니다.
+"""
+
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.storage.base import DEFAULT_SESSION_ID
+from src.storage.json_file import JsonFileBackend
+from src.utils.codec import StateCodec
+from src.utils.journal import StateJournal, diff_state
+from src.utils.paths import file_signature
+
+
+class JournalBackend(JsonFileBackend):
+    """변경분만 저널에 추가하고 주기적으로 스냅샷을 기록하는 백엔드"""
+
+    name = "journal"
+
+    def __init__(self, state_file: Path, sessions_dir: Path, compact_threshold: int = 100,
+                 codec: Optional[StateCodec] = None):
+        """
+        Args:
+            state_file: 기본 세션의 상태(스냅샷) 파일 경로
+            sessions_dir: 그 외 세션의 상태 파일을 두는 디렉토리
+            compact_threshold: 스냅샷을 새로 기록하기 전까지 허용하는 저널 항목 수
+            codec: 스냅샷 직렬화 코덱 (None이면 들여쓰기된 JSON)
+        """
+        super().__init__(state_file, sessions_dir, codec)
+        self.compact_threshold = compact_threshold
+        # 세션 ID → 저널 객체 (저널 항목 수를 유지하기 위해 재사용)
+        self._journals: Dict[str, StateJournal] = {}
+        self._journals_lock = threading.Lock()
+
+    def get_journal(self, session_id: str) -> StateJournal:
+        """
+        세션의 StateJournal 객체를 반환합니다.
+
+        Args:
+            session_id: 세션 ID
+
+        Returns:
+            StateJournal: 상태 저널 객체
+        """
+        with self._journals_lock:
+            journal = self._journals.get(session_id)
+            if journal is None:
+                state_file = self.get_state_file(session_id)
+                journal = StateJournal(
+                    snapshot_file=state_file,
+                    journal_file=state_file.with_suffix(".journal"),
+                    compact_threshold=self.compact_threshold,
+                    codec=self.codec
+                )
+                self._journals[session_id] = journal
+            return journal
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        # 스냅샷 + 저널 재생으로 상태 복원
+        return self.get_journal(session_id).load()
+
+    def write(self, session_id: str, state: Dict[str, Any],
+              flushed_state: Optional[Dict[str, Any]], fields: List[str],
+              durable: bool = False) -> int:
+        journal = self.get_journal(session_id)
+
+        # 기록된 상태가 없으면 비교 대상이 없으므로 스냅샷부터 기록
+        if flushed_state is None:
+            return journal.compact(state, durable=durable)
+
+        written = journal.append(diff_state(flushed_state, state, fields), durable=durable)
+        if journal.needs_compaction():
+            written += journal.compact(state, durable=durable)
+        return written
+
+    def signature(self, session_id: str) -> Any:
+        # 스냅샷 교체와 저널 추가를 모두 감지
+        journal = self.get_journal(session_id)
+        return (file_signature(journal.snapshot_file), file_signature(journal.journal_file))
+
+    def delete(self, session_id: str) -> None:
+        super().delete(session_id)
+        self.get_journal(session_id).reset()
+        with self._journals_lock:
+            self._journals.pop(session_id, None)
+
+    def list_sessions(self) -> List[str]:
+        session_ids = set(super().list_sessions())
+        if self.state_file.with_suffix(".journal").exists():
+            session_ids.add(DEFAULT_SESSION_ID)
+        if self.sessions_dir.exists():
+            for path in self.sessions_dir.glob("*.journal"):
+                session_ids.add(path.stem)
+        return sorted(session_ids)
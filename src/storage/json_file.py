@@ -0,0 +1,136 @@
+"""
+JSON 파일 상태 저장소 백엔드 모듈
+
+세션마다 JSON 파일 하나에 전체 상태를 기록합니다.
+기본 세션은 기존 state.json을, 그 외 세션은 sessions/<세션 ID>.json을 사용합니다.
+파일 이름은 직렬화 형식과 무관하게 .json을 유지하며(형식은 로드 시 내용으로 판별),
+파일은 임시 파일에 쓴 뒤 교체하므로 여러 프로세스가 같은 파일을 안전하게 공유할 수 있습니다.
+"""
+
+import logging
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.storage.base import StateBackend, DEFAULT_SESSION_ID
+from src.utils.codec import StateCodec
+from src.utils.paths import write_file_atomic, file_signature
+
+logger = logging.getLogger(__name__)
+
+
+class JsonFileBackend(StateBackend):
+    """저장할 때마다 세션의 상태 파일 전체를 다시 기록하는 백엔드"""
+
+    name = "json"
+
+    # 세션 상태 파일 확장자
+    suffix = ".json"
+
+    def __init__(self, state_file: Path, sessions_dir: Path, codec: Optional[StateCodec] = None):
+        """
+        Args:
+            state_file: 기본 세션의 상태 파일 경로
+            sessions_dir: 그 외 세션의 상태 파일을 두는 디렉토리
+            codec: 상태 파일 직렬화 코덱 (None이면 들여쓰기된 JSON)
+        """
+        self.state_file = state_file
+        self.sessions_dir = sessions_dir
+        self.codec = codec or StateCodec()
+
+    def get_state_file(self, session_id: str) -> Path:
+        """
+        세션의 상태 파일 경로를 반환합니다.
+
+        Args:
+            session_id: 세션 ID
+
+        Returns:
+            Path: 상태 파일 경로
+        """
+        if session_id == DEFAULT_SESSION_ID:
+            return self.state_file
+        return self.sessions_dir / f"{session_id}.json"
+
+    def get_history_dir(self, session_id: str) -> Path:
+        """
+        세션의 보관 메시지 구간 파일을 두는 디렉토리 경로를 반환합니다.
+
+        구간 파일 이름은 "<시작 위치>-<끝 위치>.json"이므로 파일 목록이 곧 위치 색인입니다.
+
+        Args:
+            session_id: 세션 ID
+
+        Returns:
+            Path: 디렉토리 경로
+        """
+        return self.get_state_file(session_id).with_suffix(".history")
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        state_file = self.get_state_file(session_id)
+        if not state_file.exists():
+            return None
+        # 형식은 내용으로 판별하므로 기록 형식이 바뀌어도 기존 파일을 읽을 수 있음
+        return StateCodec.decode(state_file.read_bytes())
+
+    def write(self, session_id: str, state: Dict[str, Any],
+              flushed_state: Optional[Dict[str, Any]], fields: List[str],
+              durable: bool = False) -> int:
+        # 임시 파일에 쓴 뒤 교체하므로 다른 프로세스가 기록 중인 파일을 읽지 않음
+        data = self.codec.encode(state)
+        write_file_atomic(self.get_state_file(session_id), data, durable=durable)
+        return len(data)
+
+    def signature(self, session_id: str) -> Any:
+        return file_signature(self.get_state_file(session_id))
+
+    def write_segment(self, session_id: str, start: int, messages: List[Dict[str, Any]],
+                      durable: bool = False) -> int:
+        end = start + len(messages)
+        data = self.codec.encode({"start": start, "messages": messages})
+        write_file_atomic(self.get_history_dir(session_id) / f"{start:010d}-{end:010d}.json", data,
+                          durable=durable)
+        return len(data)
+
+    def load_messages(self, session_id: str, start: int, end: int) -> List[Dict[str, Any]]:
+        history_dir = self.get_history_dir(session_id)
+        if not history_dir.exists():
+            return []
+
+        messages: List[Dict[str, Any]] = []
+        for segment_start, segment_end, path in self._list_segments(history_dir):
+            # 요청 구간과 겹치는 구간 파일만 읽음
+            if segment_end <= start or segment_start >= end:
+                continue
+            segment = StateCodec.decode(path.read_bytes())["messages"]
+            messages.extend(segment[max(start - segment_start, 0):end - segment_start])
+        return messages
+
+    @staticmethod
+    def _list_segments(history_dir: Path) -> List[Tuple[int, int, Path]]:
+        """구간 파일을 (시작 위치, 끝 위치, 경로) 목록으로 정렬하여 반환합니다."""
+        segments = []
+        for path in history_dir.glob("*-*.json"):
+            try:
+                segment_start, segment_end = (int(value) for value in path.stem.split("-"))
+            except ValueError:
+                continue
+            segments.append((segment_start, segment_end, path))
+        return sorted(segments)
+
+    def delete(self, session_id: str) -> None:
+        state_file = self.get_state_file(session_id)
+        if state_file.exists():
+            state_file.unlink()
+            logger.info(f"상태 파일을 삭제했습니다: {state_file}")
+        shutil.rmtree(self.get_history_dir(session_id), ignore_errors=True)
+
+    def list_sessions(self) -> List[str]:
+        session_ids = set()
+        if self.state_file.exists():
+            session_ids.add(DEFAULT_SESSION_ID)
+        if self.sessions_dir.exists():
+            for path in self.sessions_dir.iterdir():
+                if path.suffix == self.suffix:
+                    session_ids.add(path.stem)
+        return sorted(session_ids)
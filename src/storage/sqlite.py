@@ -0,0 +1,375 @@
+"""
+SQLite 상태 저장소 백엔드 모듈
+
+모든 세션의 상태를 로컬 SQLite 데이터베이스 하나에 저장합니다.
+
+테이블 구성:
+- sessions: 세션별 노드 결과, 현재 타겟, 기타 필드 및 기록할 때마다 증가하는 버전 번호
+- messages: 세션별 대화 메시지 (세션 ID + 순번으로 색인)
+- results: 세션별 수집 결과 (세션 ID + 타겟 ID로 색인)
+- model_settings: 세션별 모델 설정
+
+WAL 모드를 사용하므로 기록 중에도 다른 연결에서 읽을 수 있으며,
+메시지 추가는 새 행만 삽입하므로 대화 길이와 무관하게 O(1)입니다.
+메모리 창에서 밀려난 메시지(message_offset 이전)도 messages 테이블에 그대로 남으며,
+로드할 때는 창에 해당하는 행만 읽습니다.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.storage.base import StateBackend
+
+logger = logging.getLogger(__name__)
+
+# 전용 테이블/컬럼에 저장되는 상태 필드 (그 외 필드는 sessions.extra에 JSON으로 저장)
+_DEDICATED_FIELDS = ("messages", "results", "model", "node_result", "current_target")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    node_result TEXT NOT NULL DEFAULT '',
+    current_target TEXT,
+    extra TEXT NOT NULL DEFAULT '{}',
+    version INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS messages (
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    message TEXT NOT NULL,
+    PRIMARY KEY (session_id, seq)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS results (
+    session_id TEXT NOT NULL,
+    target_id TEXT NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (session_id, target_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_results_target ON results (target_id, session_id);
+
+CREATE TABLE IF NOT EXISTS model_settings (
+    session_id TEXT PRIMARY KEY,
+    name TEXT,
+    temperature REAL,
+    type TEXT,
+    api_key TEXT
+);
+"""
+
+
+def _dumps(value: Any) -> str:
+    """값을 공백 없는 JSON 문자열로 변환합니다."""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+class SqliteBackend(StateBackend):
+    """모든 세션을 SQLite 데이터베이스에 저장하는 백엔드"""
+
+    name = "sqlite"
+
+    def __init__(self, db_file: Path):
+        """
+        Args:
+            db_file: SQLite 데이터베이스 파일 경로
+        """
+        self.db_file = db_file
+        # sqlite3 연결은 스레드 간에 공유하지 않으므로 스레드마다 별도 연결 사용
+        # (종료된 스레드의 연결은 새 연결을 만들 때 닫아 연결과 파일 디스크립터가 쌓이지 않도록 함)
+        self._connections: Dict[threading.Thread, sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        현재 스레드의 데이터베이스 연결을 반환합니다. (없으면 생성하고 스키마 초기화)
+
+        Returns:
+            sqlite3.Connection: 데이터베이스 연결
+        """
+        thread = threading.current_thread()
+        connection = self._connections.get(thread)
+        if connection is not None:
+            return connection
+
+        self._close_finished_threads()
+
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        # 트랜잭션은 직접 관리 (BEGIN IMMEDIATE ... COMMIT)
+        connection = sqlite3.connect(str(self.db_file), timeout=30, isolation_level=None,
+                                     check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA foreign_keys=ON")
+        connection.executescript(_SCHEMA)
+
+        # 버전 컬럼이 없는 이전 데이터베이스 갱신
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(sessions)")}
+        if "version" not in columns:
+            connection.execute("ALTER TABLE sessions ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+
+        with self._connections_lock:
+            self._connections[thread] = connection
+        return connection
+
+    def _close_finished_threads(self) -> None:
+        """종료된 스레드가 사용하던 연결을 닫습니다."""
+        with self._connections_lock:
+            finished = [thread for thread in self._connections if not thread.is_alive()]
+            connections = [self._connections.pop(thread) for thread in finished]
+        for connection in connections:
+            connection.close()
+        if connections:
+            logger.debug(f"종료된 스레드의 SQLite 연결 {len(connections)}개 닫음")
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        connection = self._connect()
+        row = connection.execute(
+            "SELECT node_result, current_target, extra FROM sessions WHERE session_id = ?",
+            (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        node_result, current_target, extra = row
+        state: Dict[str, Any] = json.loads(extra)
+        state["node_result"] = node_result
+        state["current_target"] = json.loads(current_target) if current_target is not None else None
+
+        # 보관된 메시지를 제외한 메모리 창만 로드
+        state["messages"] = [
+            json.loads(message)
+            for (message,) in connection.execute(
+                "SELECT message FROM messages WHERE session_id = ? AND seq >= ? ORDER BY seq",
+                (session_id, state.get("message_offset", 0))
+            )
+        ]
+        state["results"] = {
+            target_id: json.loads(result)
+            for target_id, result in connection.execute(
+                "SELECT target_id, result FROM results WHERE session_id = ?", (session_id,)
+            )
+        }
+
+        model_row = connection.execute(
+            "SELECT name, temperature, type, api_key FROM model_settings WHERE session_id = ?",
+            (session_id,)
+        ).fetchone()
+        state["model"] = None if model_row is None else {
+            "name": model_row[0],
+            "temperature": model_row[1],
+            "type": model_row[2],
+            "api_key": model_row[3]
+        }
+        return state
+
+    def write(self, session_id: str, state: Dict[str, Any],
+              flushed_state: Optional[Dict[str, Any]], fields: List[str],
+              durable: bool = False) -> int:
+        if flushed_state is None:
+            # 처음 기록하는 경우 모든 필드를 기록
+            flushed_state = {}
+            fields = list(set(fields) | set(state.keys()) | set(_DEDICATED_FIELDS))
+
+        connection = self._connect()
+        now = time.time()
+        written = 0
+
+        # WAL + synchronous=NORMAL은 커밋마다 fsync하지 않으므로 영속 기록 시에만 FULL로 전환
+        if durable:
+            connection.execute("PRAGMA synchronous=FULL")
+
+        # 변경분 전체를 하나의 트랜잭션으로 기록
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            extra = {key: value for key, value in state.items() if key not in _DEDICATED_FIELDS}
+            session_row = (
+                session_id,
+                state.get("node_result") or "",
+                _dumps(state["current_target"]) if state.get("current_target") is not None else None,
+                _dumps(extra),
+                now,
+                now
+            )
+            written += sum(len(value) for value in session_row[1:4] if value)
+            connection.execute(
+                """
+                INSERT INTO sessions (session_id, node_result, current_target, extra, version, created_at, updated_at)
+                VALUES (?, ?, ?, ?, 1, ?, ?)
+                ON CONFLICT (session_id) DO UPDATE SET
+                    node_result = excluded.node_result,
+                    current_target = excluded.current_target,
+                    extra = excluded.extra,
+                    version = sessions.version + 1,
+                    updated_at = excluded.updated_at
+                """,
+                session_row
+            )
+
+            if "messages" in fields or "message_offset" in fields:
+                written += self._write_messages(connection, session_id,
+                                                state.get("messages", []), state.get("message_offset", 0),
+                                                flushed_state.get("messages", []),
+                                                flushed_state.get("message_offset", 0))
+            if "results" in fields:
+                written += self._write_results(connection, session_id, state.get("results", {}),
+                                               flushed_state.get("results", {}))
+            if "model" in fields:
+                self._write_model(connection, session_id, state.get("model"))
+
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        finally:
+            if durable:
+                connection.execute("PRAGMA synchronous=NORMAL")
+        return written
+
+    def signature(self, session_id: str) -> Any:
+        # 기본 키 조회 한 번으로 다른 연결(프로세스)의 기록 여부 확인
+        row = self._connect().execute(
+            "SELECT version FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def _write_messages(self, connection: sqlite3.Connection, session_id: str,
+                        messages: List[Dict[str, Any]], offset: int,
+                        flushed_messages: List[Dict[str, Any]], flushed_offset: int) -> int:
+        """
+        메시지 변경분을 기록하고 기록한 바이트 수를 반환합니다. 추가된 메시지는 새 행만 삽입합니다.
+
+        메시지 행의 순번(seq)은 전체 대화 내 위치(offset + 창 내 위치)입니다.
+        """
+        # 마지막으로 기록된 메시지 다음 위치부터 기록
+        start = flushed_offset + len(flushed_messages)
+        is_append_only = (
+            offset <= start <= offset + len(messages)
+            and (not flushed_messages or start - 1 < offset
+                 or messages[start - 1 - offset] == flushed_messages[-1])
+        )
+        if not is_append_only:
+            # 추가 이외의 방식으로 바뀐 경우 창 전체를 다시 기록 (보관된 메시지 행은 유지)
+            connection.execute("DELETE FROM messages WHERE session_id = ? AND seq >= ?", (session_id, offset))
+            start = offset
+
+        rows = [
+            (session_id, seq, message.get("role", ""), _dumps(message))
+            for seq, message in enumerate(messages[start - offset:], start=start)
+        ]
+        connection.executemany(
+            "INSERT OR REPLACE INTO messages (session_id, seq, role, message) VALUES (?, ?, ?, ?)",
+            rows
+        )
+        return sum(len(row[3]) for row in rows)
+
+    def write_segment(self, session_id: str, start: int, messages: List[Dict[str, Any]],
+                      durable: bool = False) -> int:
+        # 보관 구간도 messages 테이블의 행이므로 같은 순번의 행을 덮어씀 (이미 기록된 행이면 내용이 같음)
+        rows = [
+            (session_id, seq, message.get("role", ""), _dumps(message))
+            for seq, message in enumerate(messages, start=start)
+        ]
+        connection = self._connect()
+        if durable:
+            connection.execute("PRAGMA synchronous=FULL")
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany(
+                "INSERT OR REPLACE INTO messages (session_id, seq, role, message) VALUES (?, ?, ?, ?)", rows
+            )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        finally:
+            if durable:
+                connection.execute("PRAGMA synchronous=NORMAL")
+        return sum(len(row[3]) for row in rows)
+
+    def load_messages(self, session_id: str, start: int, end: int) -> List[Dict[str, Any]]:
+        return [
+            json.loads(message)
+            for (message,) in self._connect().execute(
+                "SELECT message FROM messages WHERE session_id = ? AND seq >= ? AND seq < ? ORDER BY seq",
+                (session_id, start, end)
+            )
+        ]
+
+    def _write_results(self, connection: sqlite3.Connection, session_id: str,
+                       results: Dict[str, Any], flushed_results: Dict[str, Any]) -> int:
+        """타겟별 결과 중 바뀐 행만 기록하고, 없어진 타겟의 행은 삭제합니다. 기록한 바이트 수를 반환합니다."""
+        rows = [
+            (session_id, target_id, _dumps(result))
+            for target_id, result in results.items()
+            if target_id not in flushed_results or flushed_results[target_id] != result
+        ]
+        connection.executemany(
+            "INSERT OR REPLACE INTO results (session_id, target_id, result) VALUES (?, ?, ?)",
+            rows
+        )
+        connection.executemany(
+            "DELETE FROM results WHERE session_id = ? AND target_id = ?",
+            [(session_id, target_id) for target_id in flushed_results if target_id not in results]
+        )
+        return sum(len(row[2]) for row in rows)
+
+    def _write_model(self, connection: sqlite3.Connection, session_id: str,
+                     model: Optional[Dict[str, Any]]) -> None:
+        """모델 설정을 기록합니다. 모델 선택이 해제되면 행을 삭제합니다."""
+        if model is None:
+            connection.execute("DELETE FROM model_settings WHERE session_id = ?", (session_id,))
+            return
+        connection.execute(
+            "INSERT OR REPLACE INTO model_settings (session_id, name, temperature, type, api_key) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (session_id, model.get("name"), model.get("temperature"), model.get("type"), model.get("api_key"))
+        )
+
+    def delete(self, session_id: str) -> None:
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            for table in ("messages", "results", "model_settings", "sessions"):
+                connection.execute(f"DELETE FROM {table} WHERE session_id = ?", (session_id,))
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        logger.info(f"세션 상태를 삭제했습니다: {session_id}")
+
+    def list_sessions(self) -> List[str]:
+        connection = self._connect()
+        return [row[0] for row in connection.execute("SELECT session_id FROM sessions ORDER BY session_id")]
+
+    def sessions_missing_target(self, target_id: str) -> List[str]:
+        # results의 기본 키 색인을 사용하므로 세션 상태를 로드하지 않음
+        connection = self._connect()
+        return [
+            row[0] for row in connection.execute(
+                """
+                SELECT s.session_id FROM sessions AS s
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM results AS r
+                    WHERE r.session_id = s.session_id AND r.target_id = ?
+                )
+                ORDER BY s.session_id
+                """,
+                (target_id,)
+            )
+        ]
+
+    def close(self) -> None:
+        with self._connections_lock:
+            for connection in self._connections.values():
+                connection.close()
+            self._connections.clear()
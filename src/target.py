@@ -1,46 +1,216 @@
 """
 수집 대상 항목을 정의하는 모듈입니다.
+
+target.json은 프로세스를 다시 시작하지 않고 수정할 수 있습니다.
+get_targets()는 일정 간격(COLLECTOR_TARGET_RELOAD_INTERVAL)마다 파일 서명(수정 시각/크기/inode)을 확인하고,
+서명이 바뀌었으면 내용 해시를 비교하여 내용이 바뀐 경우에만 검증 후 새 버전의 카탈로그로 교체합니다.
+검증에 실패하면 기존 카탈로그를 그대로 사용합니다.
+
+카탈로그 버전은 파일 내용 해시이며, 진행 중인 세션은 상태의 target_version으로 시작한 버전에 고정됩니다.
+교체 시 정의가 바뀐 항목만 등록된 리스너(예: 미리 생성한 질문 캐시)에 알립니다.
 """
 
+import hashlib
 import json
 import logging
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Optional, Any, List, Iterator, Tuple, cast
+from typing import Callable, Dict, Optional, Any, List, Iterator, Set, Tuple, cast
 
-from src.utils.paths import get_project_paths
+from src.utils.paths import get_project_paths, file_signature
+from src.utils.settings import get_setting
 from src.entities import TargetItem, Target
 
 logger = logging.getLogger(__name__)
 
-# 전역 변수로 targets 캐싱
-_cached_targets: Optional[Dict[str, TargetItem]] = None
+# === 카탈로그 설정 ===
+# target.json 변경을 확인하는 최소 간격 (초, 0이면 매번 확인, 음수이면 처음 로드한 카탈로그를 계속 사용)
+_RELOAD_INTERVAL: float = get_setting("target_reload_interval", 2.0)
+# 고정된 세션을 위해 메모리에 유지할 이전 카탈로그 버전 수 (현재 버전 포함)
+_VERSIONS_KEPT: int = get_setting("target_versions_kept", 8)
+
+# 카탈로그 교체 리스너: (이전 타겟, 새 타겟, 정의가 바뀐 항목 ID 집합)
+CatalogListener = Callable[[Dict[str, TargetItem], Dict[str, TargetItem], Set[str]], None]
+
+
+class _Catalog:
+    """로드된 target.json 한 버전"""
+
+    def __init__(self, version: str, targets: Dict[str, TargetItem],
+                 signature: Optional[Tuple[int, int, int]]):
+        self.version = version
+        self.targets = targets
+        self.signature = signature
+
+
+# 현재 카탈로그 (교체는 참조를 바꾸는 것이므로 읽을 때는 잠금이 필요 없음)
+_CATALOG: Optional[_Catalog] = None
+# 버전 → 타겟 (가장 최근에 로드한 버전이 끝에 위치)
+_VERSIONS: "OrderedDict[str, Dict[str, TargetItem]]" = OrderedDict()
+_CATALOG_LOCK = threading.Lock()
+# 마지막으로 파일을 확인한 시각 (time.monotonic())
+_LAST_CHECK: float = 0.0
+# 검증에 실패한 내용 해시 (같은 내용을 다시 해석하지 않음)
+_REJECTED_VERSION: Optional[str] = None
+_LISTENERS: List[CatalogListener] = []
 
 
-def get_targets() -> Dict[str, TargetItem]:
+def get_targets(version: Optional[str] = None) -> Dict[str, TargetItem]:
     """
     target.json 파일에서 타겟 항목들을 로드하고 캐싱하여 반환합니다.
+
+    Args:
+        version: 세션이 고정된 카탈로그 버전 (None이거나 더 이상 유지되지 않는 버전이면 현재 버전)
+
+    Returns:
+        Dict[str, TargetItem]: 타겟 ID → 타겟 (수정하면 안 됨)
     """
-    global _cached_targets
-    
-    # 캐시된 값이 있으면 그대로 반환
-    if _cached_targets is not None:
-        return _cached_targets
-    
-    # 타겟 로드 및 캐싱
-    target = load_target()
-    _cached_targets = get_target_items(target)
-    
-    return _cached_targets
+    catalog = _get_catalog()
+    if version is None or version == catalog.version:
+        return catalog.targets
+    targets = _VERSIONS.get(version)
+    if targets is None:
+        logger.info(f"타겟 카탈로그 버전 {version}이 없어 현재 버전 {catalog.version}을 사용합니다.")
+        return catalog.targets
+    return targets
 
 
-def load_target() -> Target:
+def get_target_version() -> str:
     """
-    target.json 파일을 로드하여 수집할 대상 항목들을 반환합니다.
-    target.json은 필수 정적 리소스 파일입니다.
+    현재 타겟 카탈로그 버전을 반환합니다.
+
+    Returns:
+        str: target.json 내용 해시 (앞 12자리)
+    """
+    return _get_catalog().version
+
+
+def resolve_target_version(version: Optional[str]) -> str:
+    """
+    세션이 사용할 카탈로그 버전을 결정합니다.
+
+    Args:
+        version: 세션 상태에 저장된 버전 (새 세션이면 None)
+
+    Returns:
+        str: 저장된 버전이 아직 유지되고 있으면 그 버전, 아니면 현재 버전
+    """
+    catalog = _get_catalog()
+    if version is not None and version in _VERSIONS:
+        return version
+    return catalog.version
+
+
+def add_catalog_listener(listener: CatalogListener) -> None:
+    """
+    카탈로그가 새 버전으로 교체될 때 호출할 함수를 등록합니다.
+
+    Args:
+        listener: (이전 타겟, 새 타겟, 정의가 바뀐 항목 ID 집합)을 받는 함수
+            (추가/삭제된 항목도 바뀐 항목에 포함되며, 교체한 스레드에서 잠금 밖에서 호출됨)
+    """
+    _LISTENERS.append(listener)
+
+
+def reload_targets(force: bool = False) -> bool:
+    """
+    target.json이 바뀌었으면 다시 로드하여 현재 카탈로그를 교체합니다.
+
+    Args:
+        force: True이면 확인 간격과 무관하게 바로 확인
+
+    Returns:
+        bool: 새 버전으로 교체했으면 True
+    """
+    global _CATALOG, _LAST_CHECK, _REJECTED_VERSION
+
+    with _CATALOG_LOCK:
+        now = time.monotonic()
+        if _CATALOG is not None and not force:
+            if _RELOAD_INTERVAL < 0 or now - _LAST_CHECK < _RELOAD_INTERVAL:
+                return False
+        _LAST_CHECK = now
+
+        target_file = get_project_paths()["target_file"]
+        signature = file_signature(target_file)
+        if _CATALOG is not None:
+            if signature is None:
+                logger.warning(f"target.json 파일이 없어 기존 카탈로그를 계속 사용합니다: {target_file}")
+                return False
+            if signature == _CATALOG.signature:
+                return False
+
+        if _CATALOG is None:
+            # 처음 로드할 때는 파일 오류를 그대로 전달
+            content = _read_target_file(target_file)
+            version = _content_version(content)
+            targets = parse_target_data(json.loads(content))
+            logger.info(f"target.json 파일을 성공적으로 로드했습니다. {len(targets)}개 항목이 있습니다.")
+            _install(_Catalog(version, targets, signature))
+            return True
+
+        try:
+            content = target_file.read_bytes()
+        except OSError as e:
+            logger.warning(f"target.json 파일을 읽을 수 없어 기존 카탈로그를 계속 사용합니다: {str(e)}")
+            return False
+        version = _content_version(content)
+        if version == _CATALOG.version or version == _REJECTED_VERSION:
+            # 내용이 같으면(touch 등) 서명만 갱신
+            _CATALOG.signature = signature
+            return False
+        try:
+            targets = parse_target_data(json.loads(content))
+        except (ValueError, TypeError) as e:
+            logger.error(f"target.json 검증에 실패하여 기존 카탈로그(버전 {_CATALOG.version})를 계속 사용합니다: {str(e)}")
+            _REJECTED_VERSION = version
+            return False
+
+        previous = _CATALOG
+        _install(_Catalog(version, targets, signature))
+
+    changed = get_changed_target_ids(previous.targets, targets)
+    logger.info(f"target.json을 다시 로드했습니다: 버전 {previous.version} → {version}, 바뀐 항목 {sorted(changed)}")
+    for listener in list(_LISTENERS):
+        try:
+            listener(previous.targets, targets, changed)
+        except Exception as e:
+            logger.warning(f"타겟 카탈로그 교체 알림 중 오류 발생: {str(e)}")
+    return True
+
+
+def _get_catalog() -> _Catalog:
+    """현재 카탈로그를 반환합니다. (확인 간격이 지났으면 파일 변경을 먼저 확인)"""
+    if _CATALOG is None or (_RELOAD_INTERVAL >= 0 and time.monotonic() - _LAST_CHECK >= _RELOAD_INTERVAL):
+        reload_targets()
+    return cast(_Catalog, _CATALOG)
+
+
+def _install(catalog: _Catalog) -> None:
+    """새 카탈로그를 현재 버전으로 설정합니다. (잠금을 잡은 상태에서 호출)"""
+    global _CATALOG
+
+    _VERSIONS[catalog.version] = catalog.targets
+    _VERSIONS.move_to_end(catalog.version)
+    while len(_VERSIONS) > max(_VERSIONS_KEPT, 1):
+        _VERSIONS.popitem(last=False)
+    _CATALOG = catalog
+
+
+def _content_version(content: bytes) -> str:
+    """target.json 내용으로 카탈로그 버전을 만듭니다."""
+    return hashlib.sha256(content).hexdigest()[:12]
+
+
+def _read_target_file(target_file: Path) -> bytes:
+    """
+    target.json 파일 내용을 읽습니다. target.json은 필수 정적 리소스 파일입니다.
+
+    Raises:
+        FileNotFoundError: 파일이 없는 경우
     """
-    paths = get_project_paths()
-    target_file = paths["target_file"]
-    
     # target.json 파일이 없는 경우 오류 발생
     if not target_file.exists():
         raise FileNotFoundError(
@@ -49,24 +219,34 @@ def load_target() -> Target:
             f"예시 형식:\n"
             f'{{"project_overview": {{"name": "프로젝트 개요", "description": "프로젝트의 주요 목적", "required": true, "example": "예시 데이터"}}}}'
         )
+    return target_file.read_bytes()
+
+
+def get_changed_target_ids(old: Dict[str, TargetItem], new: Dict[str, TargetItem]) -> Set[str]:
+    """
+    두 카탈로그 사이에 정의가 바뀐 항목 ID를 반환합니다.
+
+    Args:
+        old: 이전 타겟
+        new: 새 타겟
+
+    Returns:
+        Set[str]: 추가, 삭제되었거나 이름/설명/예시/필수 여부/그룹이 바뀐 항목 ID
+    """
+    return {target_id for target_id in old.keys() | new.keys() if old.get(target_id) != new.get(target_id)}
+
+
+def load_target() -> Target:
+    """
+    target.json 파일을 로드하여 수집할 대상 항목들을 반환합니다.
+    target.json은 필수 정적 리소스 파일입니다.
+    """
+    paths = get_project_paths()
+    target_file = paths["target_file"]
     
     try:
         # 파일 로드
-        with open(target_file, "r", encoding="utf-8") as f:
-            target_data = json.load(f)
-        
-        # 각 항목에 id 필드 추가
-        target_items: Dict[str, TargetItem] = {}
-        for target_id, item in target_data.items():
-            # TypedDict에 맞게 데이터 변환
-            target_item: TargetItem = {
-                "name": item["name"],
-                "description": item["description"],
-                "required": item.get("required", True),
-                "example": item["example"],
-                "id": target_id
-            }
-            target_items[target_id] = target_item
+        target_items = parse_target_data(json.loads(_read_target_file(target_file)))
             
         # Target 객체 생성
         target: Target = {"__root__": target_items}
@@ -82,6 +262,47 @@ def load_target() -> Target:
         raise
 
 
+def parse_target_data(target_data: Any) -> Dict[str, TargetItem]:
+    """
+    target.json 내용을 검증하고 타겟 항목으로 변환합니다.
+
+    Args:
+        target_data: JSON으로 해석한 target.json 내용
+
+    Returns:
+        Dict[str, TargetItem]: 타겟 ID → 타겟 (id 필드 포함)
+
+    Raises:
+        ValueError: 형식이 맞지 않는 경우 (최상위가 객체가 아니거나, 항목에 name/description/example이 없는 경우 등)
+    """
+    if not isinstance(target_data, dict) or not target_data:
+        raise ValueError("target.json은 항목 ID를 키로 하는 비어 있지 않은 객체여야 합니다.")
+
+    # 각 항목에 id 필드 추가
+    target_items: Dict[str, TargetItem] = {}
+    for target_id, item in target_data.items():
+        if not isinstance(item, dict):
+            raise ValueError(f"'{target_id}' 항목은 객체여야 합니다.")
+        missing = [key for key in ("name", "description", "example") if key not in item]
+        if missing:
+            raise ValueError(f"'{target_id}' 항목에 필수 필드가 없습니다: {', '.join(missing)}")
+        if not isinstance(item["name"], str) or not isinstance(item["description"], str):
+            raise ValueError(f"'{target_id}' 항목의 name과 description은 문자열이어야 합니다.")
+
+        # TypedDict에 맞게 데이터 변환
+        target_item: TargetItem = {
+            "name": item["name"],
+            "description": item["description"],
+            "required": item.get("required", True),
+            "example": item["example"],
+            "id": target_id
+        }
+        if item.get("group"):
+            target_item["group"] = item["group"]
+        target_items[target_id] = target_item
+    return target_items
+
+
 # Helper 함수들
 def get_target_items(target: Target) -> Dict[str, TargetItem]:
     """대상 항목 사전 반환"""
@@ -108,6 +329,116 @@ def get_missing_target_items(target: Target, results: Dict[str, Any]) -> Dict[st
     }
 
 
+def get_target_hash(item: TargetItem) -> str:
+    """
+    대상 항목 내용(이름, 설명, 예시)의 해시를 반환합니다.
+
+    Args:
+        item: 대상 항목
+
+    Returns:
+        str: SHA-256 해시 문자열 (내용이 같으면 id나 required가 달라도 같은 값)
+    """
+    payload = json.dumps([item["name"], item["description"], item["example"]], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def is_small_target(item: TargetItem, short_length: int) -> Optional[str]:
+    """
+    다른 항목과 한 질문으로 묶을 수 있는 작은 항목인지 확인합니다.
+
+    Args:
+        item: 대상 항목
+        short_length: 짧은 문자열로 취급할 최대 길이
+
+    Returns:
+        Optional[str]: 작은 항목의 종류 ("string": 짧은 문자열, "string_list": 짧은 문자열 목록), 아니면 None
+    """
+    example = item["example"]
+    if isinstance(example, str) and len(example) <= short_length:
+        return "string"
+    if isinstance(example, list) and example and all(
+        isinstance(value, str) and len(value) <= short_length for value in example
+    ):
+        return "string_list"
+    return None
+
+
+def make_group_target(members: Dict[str, TargetItem]) -> TargetItem:
+    """
+    여러 항목을 한 번에 질문하는 묶음 항목을 만듭니다.
+
+    예시는 구성 항목 ID를 키로 하는 딕셔너리이므로, 기존 평가/변환 과정에서
+    구성 항목의 데이터가 함께 추출됩니다.
+
+    Args:
+        members: 구성 항목 (ID → 항목, 순서 유지)
+
+    Returns:
+        TargetItem: 묶음 항목 (id는 구성 항목 ID를 "+"로 연결한 값)
+    """
+    return {
+        "id": "+".join(members),
+        "name": ", ".join(item["name"] for item in members.values()),
+        "description": "; ".join(f"{target_id} - {item['name']}: {item['description']}"
+                                 for target_id, item in members.items()),
+        "required": True,
+        "example": {target_id: item["example"] for target_id, item in members.items()},
+        "members": {target_id: dict(item, id=target_id) for target_id, item in members.items()}
+    }
+
+
+def get_member_items(item: TargetItem) -> Dict[str, TargetItem]:
+    """묶음 항목이면 구성 항목을, 아니면 항목 자신을 반환합니다. (ID → 항목)"""
+    return item.get("members") or {item["id"]: item}
+
+
+def group_first_missing_target(target: Target, results: Dict[str, Any], max_size: int,
+                               short_length: int) -> Optional[TargetItem]:
+    """
+    아직 수집되지 않은 첫 번째 필수 항목과 함께 질문할 항목들을 찾습니다.
+
+    - 첫 항목에 group이 선언되어 있으면: 같은 group의 미수집 항목
+    - 첫 항목이 작은 항목이면: 바로 뒤이어 오는 같은 종류의 작은 항목 (group이 선언되지 않은 항목만)
+
+    Args:
+        target: 대상 컨테이너
+        results: 수집된 결과
+        max_size: 한 질문으로 묶을 최대 항목 수
+        short_length: 짧은 문자열로 취급할 최대 길이
+
+    Returns:
+        Optional[TargetItem]: 묶음 항목 또는 단일 항목 (id 포함, 남은 항목이 없으면 None)
+    """
+    missing_items = get_missing_target_items(target, results)
+    if not missing_items:
+        return None
+
+    item_ids = list(missing_items)
+    first_id = item_ids[0]
+    first = missing_items[first_id]
+    members = {first_id: first}
+
+    if first.get("group"):
+        for target_id in item_ids[1:]:
+            if len(members) >= max_size:
+                break
+            if missing_items[target_id].get("group") == first["group"]:
+                members[target_id] = missing_items[target_id]
+    else:
+        kind = is_small_target(first, short_length)
+        for target_id in item_ids[1:]:
+            item = missing_items[target_id]
+            if kind is None or len(members) >= max_size or item.get("group") \
+                    or is_small_target(item, short_length) != kind:
+                break
+            members[target_id] = item
+
+    if len(members) == 1:
+        return dict(first, id=first_id)
+    return make_group_target(members)
+
+
 def find_first_missing_target(target: Target, results: Dict[str, Any]) -> Optional[Tuple[str, TargetItem]]:
     """아직 수집되지 않은 첫 번째 필수 대상 항목 찾기"""
     missing_items = get_missing_target_items(target, results)
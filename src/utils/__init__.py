@@ -7,17 +7,54 @@
 # 텍스트/프롬프트 및 JSON 변환 관련 함수들
 from src.utils.convert import (
     dedent_prompt,
-    convert_data
+    convert_data,
+    aconvert_data
 )
 
 # 경로 관련 함수들
 from src.utils.paths import (
-    get_project_paths
+    get_project_paths,
+    write_file_atomic,
+    file_signature
+)
+
+# 실행 설정 관련 함수들
+from src.utils.settings import (
+    get_setting
 )
 
 # LLM 모델 관련 함수들
 from src.utils.model import (
-    invoke
+    invoke,
+    ainvoke,
+    stream,
+    get_model_config,
+    get_llm_pool_stats,
+    close_llm_clients,
+    get_llm_cache_stats,
+    clear_llm_cache
+)
+
+# LLM 호출 안정성 관련 함수들
+from src.utils.resilience import (
+    get_llm_call_stats,
+    LLMTimeoutError,
+    CircuitOpenError
+)
+
+# 추측 실행 관련 함수들
+from src.utils.speculation import (
+    get_speculation_stats
+)
+
+# 노드 실행 지표 관련 함수들
+from src.utils.metrics import (
+    get_metrics_summary,
+    render_openmetrics,
+    reset_metrics,
+    add_sink,
+    remove_sink,
+    MetricsSink
 )
 
 # 데코레이터 유틸리티 - 순환 참조 방지를 위해 타입만 노출
@@ -29,12 +66,41 @@ __all__ = [
     
     # JSON 변환 관련 함수들
     "convert_data",
+    "aconvert_data",
     
     # 경로 관련 함수들
     "get_project_paths",
+    "write_file_atomic",
+    "file_signature",
+    
+    # 실행 설정 관련 함수들
+    "get_setting",
     
     # LLM 모델 관련 함수들
     "invoke",
+    "ainvoke",
+    "stream",
+    "get_model_config",
+    "get_llm_pool_stats",
+    "close_llm_clients",
+    "get_llm_cache_stats",
+    "clear_llm_cache",
+    
+    # LLM 호출 안정성 관련 함수들
+    "get_llm_call_stats",
+    "LLMTimeoutError",
+    "CircuitOpenError",
+    
+    # 추측 실행 관련 함수들
+    "get_speculation_stats",
+    
+    # 노드 실행 지표 관련 함수들
+    "get_metrics_summary",
+    "render_openmetrics",
+    "reset_metrics",
+    "add_sink",
+    "remove_sink",
+    "MetricsSink",
     
     # 데코레이터 유틸리티
     "node"
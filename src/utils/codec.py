@@ -0,0 +1,159 @@
+"""
+상태 직렬화 유틸리티 모듈
+
+상태 파일을 기록할 때 사용할 직렬화 형식과 압축 방식을 제공합니다.
+
+직렬화 형식:
+- "json" (기본값): 들여쓰기된 JSON (사람이 읽기 쉬움, 기존 state.json과 동일)
+- "compact_json": 공백 없는 JSON (orjson이 설치되어 있으면 orjson 사용)
+- "msgpack": MessagePack 바이너리 (ormsgpack 또는 msgpack 필요)
+
+압축 방식:
+- "none" (기본값): 압축하지 않음
+- "gzip": 직렬화 결과가 임계값 이상이면 gzip으로 압축
+- "zstd": 직렬화 결과가 임계값 이상이면 zstd로 압축 (zstandard 필요)
+
+로드할 때는 기록 설정과 무관하게 내용의 앞부분으로 압축 방식과 형식을 판별하므로,
+설정을 바꿔도 기존 파일을 그대로 읽을 수 있습니다.
+"""
+
+import gzip
+import json
+import logging
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+# 선택적 의존성 (설치되어 있지 않으면 해당 형식/압축을 사용할 수 없음)
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 설치 환경에 따라 다름
+    orjson = None
+
+try:
+    import ormsgpack
+except ImportError:  # pragma: no cover - 설치 환경에 따라 다름
+    ormsgpack = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - 설치 환경에 따라 다름
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - 설치 환경에 따라 다름
+    zstandard = None
+
+# 직렬화 형식
+FORMAT_JSON = "json"
+FORMAT_COMPACT_JSON = "compact_json"
+FORMAT_MSGPACK = "msgpack"
+
+# 압축 방식
+COMPRESSION_NONE = "none"
+COMPRESSION_GZIP = "gzip"
+COMPRESSION_ZSTD = "zstd"
+
+# 압축 형식 판별용 매직 바이트
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _msgpack_available() -> bool:
+    """MessagePack 라이브러리가 설치되어 있는지 확인합니다."""
+    return ormsgpack is not None or msgpack is not None
+
+
+class StateCodec:
+    """
+    상태 객체를 바이트로 직렬화하고 다시 복원하는 코덱
+    """
+
+    def __init__(self, format: str = FORMAT_JSON, compression: str = COMPRESSION_NONE,
+                 compress_threshold: int = 65536):
+        """
+        Args:
+            format: 직렬화 형식 ("json", "compact_json", "msgpack")
+            compression: 압축 방식 ("none", "gzip", "zstd")
+            compress_threshold: 이 크기(바이트) 이상인 경우에만 압축
+
+        Raises:
+            ValueError: 알 수 없는 형식/압축 방식이거나 필요한 라이브러리가 없는 경우
+        """
+        if format not in (FORMAT_JSON, FORMAT_COMPACT_JSON, FORMAT_MSGPACK):
+            raise ValueError(f"알 수 없는 상태 직렬화 형식입니다: {format}")
+        if format == FORMAT_MSGPACK and not _msgpack_available():
+            raise ValueError("msgpack 형식을 사용하려면 ormsgpack 또는 msgpack 패키지가 필요합니다")
+        if compression not in (COMPRESSION_NONE, COMPRESSION_GZIP, COMPRESSION_ZSTD):
+            raise ValueError(f"알 수 없는 상태 압축 방식입니다: {compression}")
+        if compression == COMPRESSION_ZSTD and zstandard is None:
+            raise ValueError("zstd 압축을 사용하려면 zstandard 패키지가 필요합니다")
+
+        self.format = format
+        self.compression = compression
+        self.compress_threshold = compress_threshold
+
+    def encode(self, state: Dict[str, Any]) -> bytes:
+        """
+        상태를 설정된 형식으로 직렬화하고, 임계값 이상이면 압축합니다.
+
+        Args:
+            state: 직렬화할 상태
+
+        Returns:
+            bytes: 기록할 바이트
+        """
+        state = dict(state)
+        if self.format == FORMAT_MSGPACK:
+            data = ormsgpack.packb(state) if ormsgpack is not None else msgpack.packb(state, use_bin_type=True)
+        elif self.format == FORMAT_COMPACT_JSON:
+            data = orjson.dumps(state) if orjson is not None else \
+                json.dumps(state, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        else:
+            data = json.dumps(state, ensure_ascii=False, indent=2).encode("utf-8")
+
+        if self.compression == COMPRESSION_NONE or len(data) < self.compress_threshold:
+            return data
+        if self.compression == COMPRESSION_GZIP:
+            # 압축 결과가 항상 같도록 타임스탬프 고정
+            return gzip.compress(data, compresslevel=6, mtime=0)
+        return zstandard.ZstdCompressor(level=3).compress(data)
+
+    @staticmethod
+    def decode(data: bytes) -> Dict[str, Any]:
+        """
+        바이트의 앞부분으로 압축 방식과 형식을 판별하여 상태를 복원합니다.
+
+        Args:
+            data: 읽어온 바이트
+
+        Returns:
+            Dict[str, Any]: 복원된 상태
+
+        Raises:
+            ValueError: 형식을 해석할 수 없거나 필요한 라이브러리가 없는 경우
+                (JSON 파싱 오류는 json.JSONDecodeError)
+        """
+        if data.startswith(_GZIP_MAGIC):
+            data = gzip.decompress(data)
+        elif data.startswith(_ZSTD_MAGIC):
+            if zstandard is None:
+                raise ValueError("zstd로 압축된 상태를 읽으려면 zstandard 패키지가 필요합니다")
+            data = zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+        # JSON 객체는 항상 '{'로 시작하며(앞 공백/BOM 제외), msgpack 맵은 0x80 이상의 바이트로 시작
+        stripped = data.lstrip(b" \t\r\n")
+        if stripped.startswith(b"\xef\xbb\xbf"):
+            stripped = stripped[3:]
+        if not stripped or stripped[:1] in (b"{", b"["):
+            # orjson.JSONDecodeError는 json.JSONDecodeError의 하위 클래스
+            if orjson is not None:
+                return orjson.loads(stripped)
+            return json.loads(stripped.decode("utf-8"))
+
+        if ormsgpack is not None:
+            return ormsgpack.unpackb(data)
+        if msgpack is not None:
+            return msgpack.unpackb(data, raw=False)
+        raise ValueError("msgpack 형식의 상태를 읽으려면 ormsgpack 또는 msgpack 패키지가 필요합니다")
@@ -1,7 +1,7 @@
 import json
 import textwrap
-from typing import Dict, List, Any, Union
-from src.utils.model import invoke
+from typing import Dict, List, Any, Mapping, Optional, Union
+from src.utils.model import invoke, ainvoke
 
 def dedent_prompt(text):
     """문자열의 들여쓰기를 제거하여 가독성을 높입니다."""
@@ -184,7 +184,22 @@ def create_string_conversion_prompt(name: str, description: str, example: str, u
     )
 
 
-def convert_data(name: str, description: str, example: Union[Dict, List, str], user_message: str):
+def create_conversion_prompt(name: str, description: str, example: Union[Dict, List, str], user_message: str):
+    """예시의 형태(dict, list, str)에 맞는 변환 프롬프트 생성"""
+    # 예시의 형태에 따라 다른 프롬프트 전략 사용
+    if isinstance(example, dict):
+        # 객체(딕셔너리) 형식일 경우
+        return create_dict_conversion_prompt(name, description, example, user_message)
+    elif isinstance(example, list):
+        # 배열 형식일 경우
+        return create_list_conversion_prompt(name, description, example, user_message)
+    else:
+        # 단순 문자열 형식일 경우
+        return create_string_conversion_prompt(name, description, example, user_message)
+
+
+def convert_data(name: str, description: str, example: Union[Dict, List, str], user_message: str,
+                 model: Optional[Mapping[str, Any]] = None, timeout: Optional[float] = None):
     """
     사용자의 일반 텍스트 응답을 example에 정의된 형식으로 변환합니다.
     
@@ -193,25 +208,38 @@ def convert_data(name: str, description: str, example: Union[Dict, List, str], u
         description: 항목 설명
         example: 예시 데이터 구조 (dict, list, str)
         user_message: 사용자의 응답 텍스트
+        model: 변환에 사용할 모델 설정
+        timeout: LLM 호출 시간 예산 (초, None이면 기본값)
     """
-    example_type = type(example)
-    
-    # 예시의 형태에 따라 다른 프롬프트 전략 사용
-    if isinstance(example, dict):
-        # 객체(딕셔너리) 형식일 경우
-        prompt = create_dict_conversion_prompt(name, description, example, user_message)
-    elif isinstance(example, list):
-        # 배열 형식일 경우
-        prompt = create_list_conversion_prompt(name, description, example, user_message)
-    else:
-        # 단순 문자열 형식일 경우
-        prompt = create_string_conversion_prompt(name, description, example, user_message)
+    prompt = create_conversion_prompt(name, description, example, user_message)
     
     # 중앙 invoke 함수 호출
-    result = invoke(prompt)
+    result = invoke(prompt, model=model, timeout=timeout)
+    
+    # 결과 추출 및 파싱
+    return parse_llm_response(result, type(example))
+
+
+async def aconvert_data(name: str, description: str, example: Union[Dict, List, str], user_message: str,
+                        model: Optional[Mapping[str, Any]] = None, timeout: Optional[float] = None):
+    """
+    convert_data()의 비동기 버전입니다.
+    
+    Args:
+        name: 항목 이름
+        description: 항목 설명
+        example: 예시 데이터 구조 (dict, list, str)
+        user_message: 사용자의 응답 텍스트
+        model: 변환에 사용할 모델 설정
+        timeout: LLM 호출 시간 예산 (초, None이면 기본값)
+    """
+    prompt = create_conversion_prompt(name, description, example, user_message)
+    
+    # 중앙 ainvoke 함수 호출
+    result = await ainvoke(prompt, model=model, timeout=timeout)
     
     # 결과 추출 및 파싱
-    return parse_llm_response(result, example_type)
+    return parse_llm_response(result, type(example))
 
 
 def parse_llm_response(llm_response, example_type):
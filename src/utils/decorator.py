@@ -2,17 +2,20 @@
 데코레이터 유틸리티 모듈
 
 이 모듈은 프로젝트에서 사용되는 함수 데코레이터를 제공합니다.
-주로 LangGraph 노드 함수를 위한 불변성과 로깅 기능을 지원합니다.
+주로 LangGraph 노드 함수를 위한 불변성, 로깅, 실행 지표 기능을 지원합니다.
 """
 
 from typing import Any, Callable
-from copy import deepcopy
 import functools
 import logging
 import json
 import inspect
 
+from langgraph.config import get_config
+
 from src.entities import State
+from src.utils import metrics
+from src.utils.readonly import readonly
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
@@ -21,68 +24,150 @@ logger = logging.getLogger(__name__)
 def node(func: Callable[[State], State]) -> Callable[[State], State]:
     """
     LangGraph 노드를 위한 통합 데코레이터
-    immutable과 node_logger 데코레이터를 결합하여 제공합니다.
-    이 데코레이터를 사용하면 노드 함수는 State 입력을 변경하지 않고,
-    함수 호출 전후에 상태 정보가 로깅됩니다.
+    immutable, node_metrics, node_logger 데코레이터를 결합하여 제공합니다.
+    이 데코레이터를 사용하면 노드 함수는 State 입력을 변경할 수 없고,
+    함수 호출 전후에 상태 정보가 로깅되며, 실행 지표가 스팬으로 기록됩니다.
     """
-    # 먼저 immutable 적용 후 node_logger 적용
-    # 순서가 중요: immutable이 먼저 적용되어 상태를 복사한 후, node_logger가 로깅 수행
-    return node_logger(node_immutable(func))
+    # 먼저 immutable 적용 후 node_metrics, node_logger 적용
+    # 순서가 중요: immutable이 먼저 적용되어 상태를 읽기 전용으로 감싼 후, 지표 기록과 로깅 수행
+    return node_logger(node_metrics(node_immutable(func)))
 
 
 def node_immutable(func: Callable[[State], State]) -> Callable[[State], State]:
     """
     함수가 입력 상태를 변경하지 않도록 보장하는 데코레이터
-    입력 상태의 깊은 복사본을 만들어 함수에 전달하고 결과를 반환합니다.
+    입력 상태를 읽기 전용 뷰로 감싸 함수에 전달합니다. (복사하지 않으므로 비용이 상태 크기와 무관)
+    노드는 바뀐 필드만 반환하며, LangGraph가 State의 리듀서로 기존 상태에 합칩니다.
+    코루틴 함수(async def)에 적용하면 코루틴 함수를 반환합니다.
     """
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(state: State, *args, **kwargs) -> State:
+            # 입력 상태를 읽기 전용 뷰로 감싸 함수 실행
+            return await func(readonly(state), *args, **kwargs)
+
+        return async_wrapper
+
     @functools.wraps(func)
     def wrapper(state: State, *args, **kwargs) -> State:
-        # 입력 상태의 깊은 복사본 만들기
-        state_copy = deepcopy(state)
-        
-        # 함수 실행 및 결과 반환
-        return func(state_copy, *args, **kwargs)
+        # 입력 상태를 읽기 전용 뷰로 감싸 함수 실행
+        return func(readonly(state), *args, **kwargs)
     
     return wrapper
 
 
+def _log_node_input(state: Any) -> None:
+    """노드 입력 State를 요약하여 로깅합니다."""
+    if hasattr(state, "get"):
+        messages_count = len(state.get("messages", []))
+        current_target = state.get("current_target")
+        current_target_id = current_target.get("id") if current_target else "None"
+        results_count = len(state.get("results", {}))
+        
+        logger.info(f"입력: messages={messages_count}개, current_target={current_target_id}, results={results_count}개")
+
+
+def _log_node_output(result: Any) -> None:
+    """노드가 반환한 상태 변경분을 요약하여 로깅합니다."""
+    if hasattr(result, "get"):
+        new_node_result = result.get("node_result")
+        new_messages_count = len(result.get("messages", []))
+        new_current_target = result.get("current_target")
+        new_current_target_id = new_current_target.get("id") if new_current_target else "None"
+        if "current_target" not in result:
+            new_current_target_id = "변경 없음"
+        new_results_count = len(result.get("results", {}))
+        
+        logger.info(f"출력: node_result={new_node_result}, 새 messages={new_messages_count}개, current_target={new_current_target_id}, 새 results={new_results_count}개")
+
+
+def _span_target(func: Callable, args: tuple, kwargs: dict) -> tuple:
+    """노드 실행 설정에서 스팬의 노드 이름(그래프에 등록된 이름)과 세션 ID를 찾습니다."""
+    config = kwargs.get("config", args[0] if args else None)
+    if config is None:
+        # config 인자를 받지 않는 노드는 실행 중인 그래프의 설정을 사용
+        try:
+            config = get_config()
+        except RuntimeError:
+            config = {}
+    node_name = (config.get("metadata") or {}).get("langgraph_node") or func.__name__
+    session_id = (config.get("configurable") or {}).get("session_id")
+    return node_name, session_id
+
+
+def node_metrics(func: Callable[[State], State]) -> Callable[[State], State]:
+    """
+    LangGraph 노드 실행 지표를 스팬으로 기록하는 데코레이터
+    실행 시간, 노드 안의 LLM 호출 시간/크기, 상태 크기, 캐시 적중을 src.utils.metrics의 싱크로 전달합니다.
+    지표 수집이 꺼져 있으면(COLLECTOR_METRICS=false) 함수를 그대로 실행합니다.
+    코루틴 함수(async def)에 적용하면 코루틴 함수를 반환합니다.
+    """
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(state: State, *args, **kwargs) -> State:
+            if not metrics.is_enabled():
+                return await func(state, *args, **kwargs)
+            node_name, session_id = _span_target(func, args, kwargs)
+            with metrics.node_span(node_name, session_id, state) as span:
+                result = await func(state, *args, **kwargs)
+                metrics.set_node_output(span, result)
+                return result
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(state: State, *args, **kwargs) -> State:
+        if not metrics.is_enabled():
+            return func(state, *args, **kwargs)
+        node_name, session_id = _span_target(func, args, kwargs)
+        with metrics.node_span(node_name, session_id, state) as span:
+            result = func(state, *args, **kwargs)
+            metrics.set_node_output(span, result)
+            return result
+
+    return wrapper
+
+
 def node_logger(func: Callable[[State], State]) -> Callable[[State], State]:
     """
     LangGraph 노드 함수 호출과 반환값을 로깅하는 데코레이터
     각 노드의 입력과 출력 State를 요약하여 로깅합니다.
+    코루틴 함수(async def)에 적용하면 코루틴 함수를 반환합니다.
     """
+    func_name = func.__name__
+    module_name = func.__module__
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(state: State, *args, **kwargs) -> State:
+            logger.info(f"===== 노드 시작: {module_name}.{func_name} =====")
+            _log_node_input(state)
+
+            # 함수 실행 (state는 원본 그대로 전달)
+            result = await func(state, *args, **kwargs)
+
+            _log_node_output(result)
+            logger.info(f"===== 노드 종료: {module_name}.{func_name} =====")
+            return result
+
+        return async_wrapper
+
     @functools.wraps(func)
     def wrapper(state: State, *args, **kwargs) -> State:
-        func_name = func.__name__
-        module_name = func.__module__
-
         # 노드 실행 시작 로깅
         logger.info(f"===== 노드 시작: {module_name}.{func_name} =====")
         
         # State 객체 요약
-        if hasattr(state, "get"):
-            messages_count = len(state.get("messages", []))
-            current_target = state.get("current_target")
-            current_target_id = current_target.get("id") if current_target else "None"
-            results_count = len(state.get("results", {}))
-            
-            logger.info(f"입력: messages={messages_count}개, current_target={current_target_id}, results={results_count}개")
+        _log_node_input(state)
         
         # 함수 실행 (state는 원본 그대로 전달)
         result = func(state, *args, **kwargs)
         
         # 함수 반환값 로깅
-        if hasattr(result, "get"):
-            new_node_result = result.get("node_result")
-            new_messages_count = len(result.get("messages", []))
-            new_current_target = result.get("current_target")
-            new_current_target_id = new_current_target.get("id") if new_current_target else "None"
-            new_results_count = len(result.get("results", {}))
-            
-            logger.info(f"출력: node_result={new_node_result}, messages={new_messages_count}개, current_target={new_current_target_id}, results={new_results_count}개")
+        _log_node_output(result)
         
         logger.info(f"===== 노드 종료: {module_name}.{func_name} =====")
         
         return result
     
-    return wrapper 
\ No newline at end of file
+    return wrapper
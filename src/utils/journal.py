@@ -0,0 +1,246 @@
+"""
+상태 저널(journal) 유틸리티 모듈
+
+상태를 "스냅샷 + 추가 전용 로그" 형태로 저장합니다.
+
+1. 새 메시지와 상태 변경분(delta)은 저널 파일 끝에 한 줄씩 추가됩니다.
+2. 저널 항목이 일정 개수를 넘으면 전체 상태를 스냅샷으로 기록하고 저널을 비웁니다(compaction).
+3. 로드 시에는 스냅샷을 읽은 뒤 저널의 나머지 항목을 순서대로 재생하여 상태를 복원합니다.
+
+따라서 한 턴의 쓰기 비용은 전체 대화 길이가 아니라 변경분의 크기에 비례합니다.
+"""
+
+import json
+import os
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.utils.codec import StateCodec
+from src.utils.paths import write_file_atomic
+
+logger = logging.getLogger(__name__)
+
+# 저널 항목 종류
+OP_APPEND_MESSAGES = "append_messages"  # 메시지 추가
+OP_SET_FIELDS = "set_fields"  # 최상위 필드 덮어쓰기
+
+
+def diff_state(old_state: Optional[Dict[str, Any]], new_state: Dict[str, Any],
+               fields: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """
+    이전 상태와 새 상태를 비교하여 저널 항목 목록을 만듭니다.
+
+    메시지는 추가 전용으로 다루므로, 기존 메시지 수와 마지막 메시지가 일치하면
+    새로 추가된 메시지만 기록합니다. 그 외 필드는 변경된 필드만 기록합니다.
+
+    Args:
+        old_state: 마지막으로 저장된 상태 (없으면 None)
+        new_state: 저장할 상태
+        fields: 변경된 것으로 알려진 최상위 필드 목록.
+            지정하면 해당 필드만 비교하고, None이면 모든 필드를 비교합니다.
+
+    Returns:
+        List[Dict[str, Any]]: 저널 항목 목록 (변경이 없으면 빈 목록)
+    """
+    if old_state is None:
+        return [{"op": OP_SET_FIELDS, "fields": dict(new_state)}]
+
+    keys = list(new_state.keys()) if fields is None else [key for key in fields if key in new_state]
+    entries: List[Dict[str, Any]] = []
+    changed_fields: Dict[str, Any] = {}
+
+    for key in keys:
+        value = new_state[key]
+        if key == "messages":
+            # 메시지 변경분 계산
+            old_messages = old_state.get("messages", [])
+            old_count = len(old_messages)
+            is_append_only = (
+                len(value) >= old_count
+                and (old_count == 0 or value[old_count - 1] == old_messages[-1])
+            )
+            if not is_append_only:
+                # 메시지 목록이 추가 이외의 방식으로 바뀐 경우 전체를 기록
+                changed_fields[key] = value
+            elif len(value) > old_count:
+                entries.append({"op": OP_APPEND_MESSAGES, "messages": list(value[old_count:])})
+        elif key not in old_state or old_state[key] != value:
+            # 나머지 필드는 변경된 경우 값 전체를 기록
+            changed_fields[key] = value
+
+    if changed_fields:
+        entries.append({"op": OP_SET_FIELDS, "fields": changed_fields})
+
+    return entries
+
+
+def apply_entry(state: Dict[str, Any], entry: Dict[str, Any]) -> None:
+    """
+    저널 항목 하나를 상태에 적용합니다.
+
+    Args:
+        state: 항목을 적용할 상태 (제자리에서 변경됨)
+        entry: 적용할 저널 항목
+    """
+    op = entry.get("op")
+    if op == OP_APPEND_MESSAGES:
+        state.setdefault("messages", []).extend(entry.get("messages", []))
+    elif op == OP_SET_FIELDS:
+        state.update(entry.get("fields", {}))
+    else:
+        logger.warning(f"알 수 없는 저널 항목을 건너뜁니다: {op}")
+
+
+class StateJournal:
+    """
+    스냅샷 파일과 저널 파일로 구성된 상태 저장소
+
+    스냅샷은 기존 state.json과 같은 형식이므로 저널 모드를 끈 뒤에도 그대로 읽을 수 있습니다.
+    """
+
+    def __init__(self, snapshot_file: Path, journal_file: Path, compact_threshold: int = 100,
+                 codec: Optional[StateCodec] = None):
+        """
+        Args:
+            snapshot_file: 전체 상태 스냅샷 파일 경로
+            journal_file: 변경분을 추가하는 저널 파일 경로
+            compact_threshold: 이 개수 이상의 저널 항목이 쌓이면 스냅샷을 새로 기록
+            codec: 스냅샷 직렬화 코덱 (None이면 들여쓰기된 JSON)
+        """
+        self.snapshot_file = snapshot_file
+        self.journal_file = journal_file
+        self.compact_threshold = compact_threshold
+        self.codec = codec or StateCodec()
+        # 마지막 스냅샷 이후 저널에 기록된 항목 수
+        self._entry_count = 0
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        스냅샷과 저널을 읽어 상태를 복원합니다.
+
+        저널 끝의 불완전한 줄(비정상 종료로 인한 부분 기록)은 잘라내어,
+        이후 추가되는 항목이 그 줄에 이어 붙지 않도록 합니다.
+        저널 중간의 항목이 손상되었으면 그 앞까지만 재생하고, 원본 저널은 옆으로 옮겨 보존한 뒤
+        재생한 항목만 남긴 저널로 교체합니다. (이후 기록이 스냅샷이나 보존한 원본을 덮어쓰지 않음)
+
+        Returns:
+            Optional[Dict[str, Any]]: 복원된 상태 (스냅샷과 저널이 모두 없으면 None)
+        """
+        if not self.snapshot_file.exists() and not self.journal_file.exists():
+            self._entry_count = 0
+            return None
+
+        state: Dict[str, Any] = {}
+        if self.snapshot_file.exists():
+            state = StateCodec.decode(self.snapshot_file.read_bytes())
+
+        entry_count = 0
+        if self.journal_file.exists():
+            data = self.journal_file.read_bytes()
+            offset = 0
+            for line_number, line in enumerate(data.splitlines(keepends=True), start=1):
+                try:
+                    entry = json.loads(line) if line.strip() else None
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    # 변경분은 순서대로 재생해야 하므로 손상된 항목 이후는 적용하지 않음
+                    if data[offset + len(line):].strip():
+                        self._set_aside(data[:offset], line_number)
+                    else:
+                        logger.warning(f"저널 끝의 불완전한 항목을 잘라냅니다: {self.journal_file}:{line_number}")
+                        with open(self.journal_file, "r+b") as f:
+                            f.truncate(offset)
+                    break
+                if entry is not None:
+                    apply_entry(state, entry)
+                    entry_count += 1
+                offset += len(line)
+
+        self._entry_count = entry_count
+        logger.info(f"스냅샷과 저널 {entry_count}개 항목으로 상태를 복원했습니다")
+        return state
+
+    def _set_aside(self, valid_data: bytes, line_number: int) -> None:
+        """
+        중간 항목이 손상된 저널을 옆으로 옮겨 보존하고, 손상된 항목 앞까지만 남긴 저널로 교체합니다.
+
+        Args:
+            valid_data: 손상된 항목 앞까지의 저널 내용
+            line_number: 손상된 항목의 줄 번호
+        """
+        corrupt_file = self.journal_file.with_name(f"{self.journal_file.name}.corrupt-{int(time.time())}")
+        os.replace(self.journal_file, corrupt_file)
+        write_file_atomic(self.journal_file, valid_data)
+        logger.error(
+            f"저널 중간의 항목이 손상되어 {line_number - 1}번째 줄까지만 재생합니다. "
+            f"원본 저널은 {corrupt_file}에 보존했습니다."
+        )
+
+    def append(self, entries: List[Dict[str, Any]], durable: bool = False) -> int:
+        """
+        저널 파일 끝에 항목들을 추가합니다.
+
+        Args:
+            entries: 추가할 저널 항목 목록
+            durable: True이면 반환 전에 디스크에 동기화(fsync)
+
+        Returns:
+            int: 추가한 바이트 수
+        """
+        if not entries:
+            return 0
+
+        self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+        data = "".join(
+            json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+            for entry in entries
+        ).encode("utf-8")
+        with open(self.journal_file, "ab") as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+
+        self._entry_count += len(entries)
+        return len(data)
+
+    def needs_compaction(self) -> bool:
+        """
+        스냅샷을 새로 기록해야 하는지 확인합니다.
+
+        Returns:
+            bool: 저널 항목 수가 임계값 이상이면 True
+        """
+        return self._entry_count >= self.compact_threshold
+
+    def compact(self, state: Dict[str, Any], durable: bool = False) -> int:
+        """
+        전체 상태를 스냅샷으로 기록하고 저널을 비웁니다.
+
+        스냅샷은 임시 파일에 쓴 뒤 교체하므로 기록 도중 중단되어도 이전 스냅샷이 유지됩니다.
+
+        Args:
+            state: 스냅샷으로 기록할 전체 상태
+            durable: True이면 교체 전에 스냅샷을 디스크에 동기화(fsync)
+
+        Returns:
+            int: 기록한 스냅샷 바이트 수
+        """
+        data = self.codec.encode(state)
+        write_file_atomic(self.snapshot_file, data, durable=durable)
+
+        # 스냅샷에 모든 변경분이 반영되었으므로 저널 삭제
+        if self.journal_file.exists():
+            self.journal_file.unlink()
+        self._entry_count = 0
+
+        logger.info(f"상태 스냅샷을 기록하고 저널을 정리했습니다: {self.snapshot_file}")
+        return len(data)
+
+    def reset(self) -> None:
+        """스냅샷과 저널 파일을 모두 삭제합니다."""
+        for path in (self.snapshot_file, self.journal_file):
+            if path.exists():
+                path.unlink()
+        self._entry_count = 0
@@ -0,0 +1,247 @@
+"""
+LLM 응답 캐시 모듈
+
+(모델, 온도, 프롬프트)의 해시를 키로 LLM 응답을 저장합니다.
+
+1. 메모리 내 LRU 캐시: 최근 사용한 응답을 디스크 조회 없이 반환
+2. SQLite 디스크 캐시: 프로세스를 다시 시작해도 유지되며 여러 프로세스가 공유
+
+디스크 캐시의 항목은 TTL이 지나면 만료되고, 최대 항목 수를 넘으면 가장 오래 사용되지 않은 항목부터 삭제됩니다.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access);
+CREATE INDEX IF NOT EXISTS idx_responses_created_at ON responses (created_at);
+"""
+
+
+def make_cache_key(model_type: str, model_name: str, temperature: Optional[float], prompt: str) -> str:
+    """
+    캐시 키를 만듭니다. (API 키는 응답에 영향을 주지 않으므로 제외)
+
+    Args:
+        model_type: 모델 타입
+        model_name: 모델 이름
+        temperature: 생성 온도
+        prompt: 프롬프트
+
+    Returns:
+        str: SHA-256 해시 문자열
+    """
+    payload = json.dumps([model_type, model_name, temperature, prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """메모리 LRU + SQLite 디스크로 구성된 LLM 응답 캐시"""
+
+    def __init__(self, db_file: Path, memory_size: int = 256, ttl: float = 7 * 24 * 3600,
+                 max_entries: int = 10000):
+        """
+        Args:
+            db_file: 디스크 캐시 SQLite 파일 경로
+            memory_size: 메모리에 유지할 최대 응답 수
+            ttl: 응답 유효 시간 (초, 0 이하이면 만료되지 않음)
+            max_entries: 디스크에 유지할 최대 응답 수
+        """
+        self.db_file = db_file
+        self.memory_size = memory_size
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        # 키 → (응답, 생성 시각)
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._memory_lock = threading.Lock()
+        # sqlite3 연결은 스레드 간에 공유하지 않으므로 스레드마다 별도 연결 사용
+        # (종료된 스레드의 연결은 새 연결을 만들 때 닫아 연결과 파일 디스크립터가 쌓이지 않도록 함)
+        self._connections: Dict[threading.Thread, sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
+
+        # 정리는 저장할 때마다가 아니라 최대치의 10%만큼 저장할 때마다 수행 (첫 저장 시에는 바로 정리)
+        self._evict_interval = max(max_entries // 10, 1)
+        self._puts_until_evict = 1
+        self._evict_lock = threading.Lock()
+
+        self._stats: Dict[str, int] = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self._stats_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """현재 스레드의 데이터베이스 연결을 반환합니다. (없으면 생성하고 스키마 초기화)"""
+        thread = threading.current_thread()
+        connection = self._connections.get(thread)
+        if connection is not None:
+            return connection
+
+        self._close_finished_threads()
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.db_file), timeout=30, isolation_level=None,
+                                     check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(_SCHEMA)
+
+        with self._connections_lock:
+            self._connections[thread] = connection
+        return connection
+
+    def _close_finished_threads(self) -> None:
+        """종료된 스레드가 사용하던 연결을 닫습니다."""
+        with self._connections_lock:
+            finished = [thread for thread in self._connections if not thread.is_alive()]
+            connections = [self._connections.pop(thread) for thread in finished]
+        for connection in connections:
+            connection.close()
+
+    def _count(self, key: str, value: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[key] += value
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl > 0 and now - created_at > self.ttl
+
+    def _remember(self, key: str, response: str, created_at: float) -> None:
+        """메모리 캐시에 응답을 넣고 크기를 넘은 항목을 제거합니다."""
+        with self._memory_lock:
+            self._memory[key] = (response, created_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        캐시된 응답을 반환합니다.
+
+        Args:
+            key: make_cache_key()로 만든 키
+
+        Returns:
+            Optional[str]: 캐시된 응답 (없거나 만료되었으면 None)
+        """
+        now = time.time()
+
+        with self._memory_lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                if not self._is_expired(cached[1], now):
+                    self._memory.move_to_end(key)
+                    self._count("memory_hits")
+                    return cached[0]
+                del self._memory[key]
+
+        try:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self._is_expired(row[1], now):
+                connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._count("evictions")
+                row = None
+            if row is not None:
+                connection.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            logger.warning(f"LLM 응답 캐시 조회 중 오류 발생: {str(e)}")
+            row = None
+
+        if row is None:
+            self._count("misses")
+            return None
+
+        self._remember(key, row[0], row[1])
+        self._count("disk_hits")
+        return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        """
+        응답을 캐시에 저장하고, 주기적으로 만료된 항목과 최대치를 넘은 오래된 항목을 삭제합니다.
+
+        Args:
+            key: make_cache_key()로 만든 키
+            response: 저장할 응답
+        """
+        now = time.time()
+        self._remember(key, response, now)
+
+        try:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, response, now, now)
+            )
+            if self._should_evict():
+                self._evict(connection, now)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM 응답 캐시 저장 중 오류 발생: {str(e)}")
+
+    def _should_evict(self) -> bool:
+        """이번 저장에서 정리할 차례인지 확인합니다. (디스크 항목 수는 최대치의 10% 이상 넘지 않음)"""
+        with self._evict_lock:
+            self._puts_until_evict -= 1
+            if self._puts_until_evict > 0:
+                return False
+            self._puts_until_evict = self._evict_interval
+            return True
+
+    def _evict(self, connection: sqlite3.Connection, now: float) -> None:
+        """만료된 항목과 최대 항목 수를 넘은 항목을 삭제합니다."""
+        evicted = 0
+        if self.ttl > 0:
+            evicted += connection.execute(
+                "DELETE FROM responses WHERE created_at < ?", (now - self.ttl,)
+            ).rowcount
+
+        (count,) = connection.execute("SELECT COUNT(*) FROM responses").fetchone()
+        if count > self.max_entries:
+            # 매번 삭제하지 않도록 최대치의 10%만큼 여유를 두고 삭제
+            excess = count - self.max_entries + self.max_entries // 10
+            evicted += connection.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_access LIMIT ?)",
+                (excess,)
+            ).rowcount
+
+        if evicted:
+            self._count("evictions", evicted)
+            logger.info(f"LLM 응답 캐시에서 {evicted}개 항목을 삭제했습니다")
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        캐시 통계를 반환합니다.
+
+        Returns:
+            Dict[str, int]: 메모리 적중(memory_hits), 디스크 적중(disk_hits), 실패(misses), 삭제(evictions) 횟수
+        """
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def clear(self) -> None:
+        """메모리와 디스크의 모든 응답을 삭제합니다."""
+        with self._memory_lock:
+            self._memory.clear()
+        self._connect().execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        """데이터베이스 연결을 닫습니다."""
+        with self._connections_lock:
+            for connection in self._connections.values():
+                connection.close()
+            self._connections.clear()
@@ -0,0 +1,591 @@
+"""
+노드 실행 지표 모듈
+
+@node 데코레이터는 노드 실행마다 스팬(span)을 열고, 실행이 끝나면 스팬 기록을 등록된 싱크로 전달합니다.
+스팬은 contextvars로 현재 실행 흐름에 연결되므로, 노드 안에서 호출된 invoke()/ainvoke()/stream()은
+스팬을 인자로 받지 않아도 LLM 호출 시간, 프롬프트/응답 크기, 캐시 적중을 현재 스팬에 기록합니다.
+(추측 실행과 워밍업처럼 노드와 별개로 실행되는 백그라운드 호출은 어느 스팬에도 기록되지 않습니다.)
+
+스팬 기록 항목:
+- node, session_id, timestamp, node_result
+- wall_ms: 노드 전체 실행 시간 / llm_ms: LLM 호출 시간 합계 / llm_calls: LLM 호출 수
+- prompt_chars, response_chars, prompt_tokens, response_tokens: 프롬프트와 응답 크기
+  (모델이 사용량을 알려주지 않으면 토큰 수는 단어와 문장 부호 수로 추정)
+- state_in_size, state_out_size: 입력 상태와 반환한 상태 변경분의 JSON 직렬화 크기 추정치 (문자 수)
+  (입력 상태는 대화 길이에 비례하지 않도록 메시지 중 마지막 메시지만 포함)
+- cache_hits: 캐시 적중 수 / cache: 종류별 적중 수 (llm, question, speculation)
+
+싱크 (COLLECTOR_METRICS_SINKS, 쉼표로 구분):
+1. histogram: 노드별 지표 분포를 메모리에 유지 (get_metrics_summary()로 p50/p95/p99 확인)
+2. jsonl: 스팬 기록을 한 줄씩 JSON Lines 파일에 추가
+3. openmetrics: 메모리 분포를 OpenMetrics 텍스트 형식 파일로 주기적으로 기록 (render_openmetrics()로도 확인)
+"""
+
+import atexit
+import contextvars
+import json
+import logging
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from src.utils.paths import get_project_paths, write_file_atomic
+from src.utils.settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+# === 지표 설정 ===
+# 지표 수집 여부
+_ENABLED: bool = get_setting("metrics", False)
+# 사용할 싱크 목록
+_SINK_NAMES: str = get_setting("metrics_sinks", "histogram")
+# 백분위 계산에 사용할 노드/지표별 최근 관측값 수
+_WINDOW: int = get_setting("metrics_window", 1024)
+# OpenMetrics 파일을 다시 기록하는 최소 간격 (초)
+_OPENMETRICS_INTERVAL: float = get_setting("metrics_openmetrics_interval", 5.0)
+
+# 싱크 이름
+SINK_HISTOGRAM = "histogram"
+SINK_JSONL = "jsonl"
+SINK_OPENMETRICS = "openmetrics"
+
+# 캐시 적중 종류
+CACHE_LLM = "llm"  # LLM 응답 캐시
+CACHE_QUESTION = "question"  # 워밍업한 질문 캐시
+CACHE_SPECULATION = "speculation"  # 추측 실행한 질문
+
+# 분포를 유지하는 스팬 지표
+SPAN_METRICS = (
+    "wall_ms", "llm_ms", "llm_calls", "prompt_chars", "response_chars", "prompt_tokens", "response_tokens",
+    "state_in_size", "state_out_size", "cache_hits"
+)
+
+# OpenMetrics 히스토그램 구간 (초)
+_DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# 토큰 수 추정: 단어와 문장 부호 하나를 토큰 하나로 계산
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    모델이 사용량을 알려주지 않을 때 사용할 토큰 수 추정치를 계산합니다.
+
+    Args:
+        text: 프롬프트 또는 응답 텍스트
+
+    Returns:
+        int: 단어와 문장 부호 수
+    """
+    return len(_TOKEN_PATTERN.findall(text))
+
+
+def estimate_size(value: Any) -> int:
+    """
+    값을 JSON으로 직렬화했을 때의 크기(문자 수)를 직렬화하지 않고 추정합니다.
+
+    읽기 전용 뷰(Mapping/Sequence)도 그대로 처리하며, 문자열의 이스케이프는 계산하지 않습니다.
+
+    Args:
+        value: 상태 또는 상태 변경분
+
+    Returns:
+        int: 추정 크기
+    """
+    if isinstance(value, str):
+        return len(value) + 2
+    if isinstance(value, Mapping):
+        return 2 + sum(estimate_size(str(key)) + 1 + estimate_size(item) for key, item in value.items()) \
+            + max(len(value) - 1, 0)
+    if isinstance(value, (list, tuple)) or (hasattr(value, "__iter__") and hasattr(value, "__len__")):
+        return 2 + sum(estimate_size(item) for item in value) + max(len(value) - 1, 0)
+    if value is None:
+        return 4
+    return len(str(value))
+
+
+def estimate_state_size(state: Any) -> int:
+    """
+    노드 입력 상태의 크기를 추정합니다.
+
+    메시지 기록 전체를 순회하면 턴마다 대화 길이에 비례하는 비용이 생기므로,
+    메시지는 노드가 응답하는 마지막 메시지만 포함하고 나머지 필드는 그대로 추정합니다.
+
+    Args:
+        state: 노드 입력 상태 (읽기 전용 뷰도 가능)
+
+    Returns:
+        int: 추정 크기
+    """
+    if not isinstance(state, Mapping):
+        return estimate_size(state)
+    size = 2 + max(len(state) - 1, 0)
+    for key, value in state.items():
+        if key == "messages" and value:
+            value = [value[-1]]
+        size += estimate_size(str(key)) + 1 + estimate_size(value)
+    return size
+
+
+class Span:
+    """노드 한 번의 실행 지표 (LLM 호출이 작업 스레드에서 기록될 수 있으므로 잠금으로 보호)"""
+
+    def __init__(self, node: str, session_id: Optional[str]):
+        self.node = node
+        self.session_id = session_id
+        self.timestamp = time.time()
+        self.values: Dict[str, float] = {name: 0 for name in SPAN_METRICS}
+        self.cache: Dict[str, int] = {}
+        self.node_result: Optional[str] = None
+        self.closed = False
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, **values: float) -> None:
+        """지표 값을 더합니다. (스팬이 끝난 뒤의 기록은 무시)"""
+        with self._lock:
+            if self.closed:
+                return
+            for name, value in values.items():
+                self.values[name] += value
+
+    def add_cache_hit(self, kind: str) -> None:
+        """캐시 적중을 기록합니다."""
+        with self._lock:
+            if self.closed:
+                return
+            self.cache[kind] = self.cache.get(kind, 0) + 1
+            self.values["cache_hits"] += 1
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        스팬을 닫고 기록을 반환합니다.
+
+        Returns:
+            Dict[str, Any]: 스팬 기록
+        """
+        with self._lock:
+            self.closed = True
+            self.values["wall_ms"] = (time.perf_counter() - self._started) * 1000
+            return {
+                "node": self.node,
+                "session_id": self.session_id,
+                "timestamp": self.timestamp,
+                "node_result": self.node_result,
+                **{name: round(value, 3) if isinstance(value, float) else value for name, value in self.values.items()},
+                "cache": dict(self.cache)
+            }
+
+
+class MetricsSink:
+    """스팬 기록을 받는 싱크의 기본 클래스"""
+
+    def emit(self, record: Dict[str, Any]) -> None:
+        """
+        스팬 기록을 처리합니다.
+
+        Args:
+            record: Span.finish()가 반환한 스팬 기록
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """싱크가 사용하는 자원을 정리합니다."""
+
+
+class HistogramRegistry(MetricsSink):
+    """노드/지표별 분포를 메모리에 유지하는 싱크 (최근 관측값으로 백분위, 누적 구간 수로 OpenMetrics 히스토그램)"""
+
+    def __init__(self, window: int = 1024):
+        """
+        Args:
+            window: 백분위 계산에 사용할 노드/지표별 최근 관측값 수
+        """
+        self.window = window
+        # (노드, 지표) → 최근 관측값
+        self._samples: Dict[Tuple[str, str], Deque[float]] = {}
+        # (노드, 지표) → [관측 수, 합계]
+        self._totals: Dict[Tuple[str, str], List[float]] = {}
+        # (노드, 시간 지표) → 구간별 누적 관측 수
+        self._buckets: Dict[Tuple[str, str], List[int]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, node: str, metric: str, value: float) -> None:
+        """
+        관측값 하나를 추가합니다.
+
+        Args:
+            node: 노드 이름
+            metric: 지표 이름
+            value: 관측값
+        """
+        key = (node, metric)
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+                self._totals[key] = [0, 0.0]
+            samples.append(value)
+            self._totals[key][0] += 1
+            self._totals[key][1] += value
+            if metric.endswith("_ms"):
+                buckets = self._buckets.setdefault(key, [0] * len(_DURATION_BUCKETS))
+                for index, bound in enumerate(_DURATION_BUCKETS):
+                    if value / 1000 <= bound:
+                        buckets[index] += 1
+
+    def emit(self, record: Dict[str, Any]) -> None:
+        for metric in SPAN_METRICS:
+            self.observe(record["node"], metric, record.get(metric, 0))
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        노드/지표별 분포 요약을 반환합니다.
+
+        Returns:
+            Dict[str, Dict[str, Dict[str, float]]]: 노드 → 지표 → 전체 관측 수(count), 평균(mean),
+                최근 관측값의 p50/p95/p99와 최댓값(max)
+        """
+        result: Dict[str, Dict[str, Dict[str, float]]] = {}
+        with self._lock:
+            for (node, metric), samples in self._samples.items():
+                count, total = self._totals[(node, metric)]
+                ordered = sorted(samples)
+                result.setdefault(node, {})[metric] = {
+                    "count": count,
+                    "mean": total / count if count else 0.0,
+                    "p50": _percentile(ordered, 50),
+                    "p95": _percentile(ordered, 95),
+                    "p99": _percentile(ordered, 99),
+                    "max": ordered[-1] if ordered else 0.0
+                }
+        return result
+
+    def to_openmetrics(self) -> str:
+        """
+        분포를 OpenMetrics 텍스트 형식으로 변환합니다.
+
+        시간 지표(*_ms)는 초 단위 히스토그램으로, 나머지 지표는 누적 카운터로 내보냅니다.
+
+        Returns:
+            str: OpenMetrics 텍스트 (# EOF로 끝남)
+        """
+        lines: List[str] = []
+        with self._lock:
+            nodes = sorted({node for node, _ in self._totals})
+            for metric in SPAN_METRICS:
+                keys = [(node, metric) for node in nodes if (node, metric) in self._totals]
+                if not keys:
+                    continue
+                if metric.endswith("_ms"):
+                    name = f"collector_node_{metric[:-3]}_seconds"
+                    lines.append(f"# TYPE {name} histogram")
+                    lines.append(f"# UNIT {name} seconds")
+                    for key in keys:
+                        label = f'node="{key[0]}"'
+                        count, total = self._totals[key]
+                        for bound, bucket_count in zip(_DURATION_BUCKETS, self._buckets[key]):
+                            lines.append(f'{name}_bucket{{{label},le="{bound}"}} {bucket_count}')
+                        lines.append(f'{name}_bucket{{{label},le="+Inf"}} {count}')
+                        lines.append(f"{name}_count{{{label}}} {count}")
+                        lines.append(f"{name}_sum{{{label}}} {total / 1000}")
+                else:
+                    name = f"collector_node_{metric}"
+                    lines.append(f"# TYPE {name} counter")
+                    for key in keys:
+                        lines.append(f'{name}_total{{node="{key[0]}"}} {self._totals[key][1]:g}')
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """모든 관측값을 삭제합니다."""
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+            self._buckets.clear()
+
+
+class JsonlTraceSink(MetricsSink):
+    """스팬 기록을 JSON Lines 파일에 한 줄씩 추가하는 싱크"""
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: 기록할 파일 경로
+        """
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def emit(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class OpenMetricsFileSink(MetricsSink):
+    """분포를 OpenMetrics 텍스트 파일로 기록하는 싱크 (node_exporter textfile 수집기 등에서 읽음)"""
+
+    def __init__(self, registry: HistogramRegistry, path: Path, interval: float = 5.0):
+        """
+        Args:
+            registry: 내보낼 분포 (스팬 기록은 이 싱크보다 먼저 registry에 반영되어야 함)
+            path: 기록할 파일 경로 (원자적으로 교체)
+            interval: 파일을 다시 기록하는 최소 간격 (초, 0이면 스팬마다 기록)
+        """
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._written = 0.0
+        self._lock = threading.Lock()
+
+    def emit(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self._written and now - self._written < self.interval:
+                return
+            self._written = now
+        self.write()
+
+    def write(self) -> None:
+        """현재 분포를 파일에 기록합니다."""
+        write_file_atomic(self.path, self.registry.to_openmetrics().encode("utf-8"))
+
+    def close(self) -> None:
+        # 마지막 간격 안의 스팬도 파일에 반영
+        if self._written:
+            self.write()
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    """정렬된 값에서 최근접 순위(nearest-rank) 방식으로 백분위 값을 계산합니다."""
+    if not ordered:
+        return 0.0
+    rank = max(int(-(-percent * len(ordered) // 100)), 1)
+    return ordered[rank - 1]
+
+
+# === 싱크 등록 ===
+_REGISTRY = HistogramRegistry(window=_WINDOW)
+_SINKS: Optional[List[MetricsSink]] = None
+_SINKS_LOCK = threading.Lock()
+
+# 현재 실행 흐름의 스팬
+_CURRENT_SPAN: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("collector_span", default=None)
+
+
+def _create_sinks() -> List[MetricsSink]:
+    """COLLECTOR_METRICS_SINKS 설정으로 싱크 목록을 만듭니다."""
+    sinks: List[MetricsSink] = []
+    names = [name.strip().lower() for name in _SINK_NAMES.split(",") if name.strip()]
+    for name in names:
+        if name == SINK_HISTOGRAM:
+            sinks.append(_REGISTRY)
+        elif name == SINK_JSONL:
+            sinks.append(JsonlTraceSink(get_project_paths()["metrics_trace_file"]))
+        elif name == SINK_OPENMETRICS:
+            if _REGISTRY not in sinks:
+                # OpenMetrics 파일은 메모리 분포를 내보내므로 분포가 먼저 갱신되어야 함
+                sinks.insert(0, _REGISTRY)
+            sinks.append(OpenMetricsFileSink(_REGISTRY, get_project_paths()["metrics_file"],
+                                             interval=_OPENMETRICS_INTERVAL))
+        else:
+            logger.warning(f"알 수 없는 지표 싱크입니다: {name}")
+    return sinks
+
+
+def _get_sinks() -> List[MetricsSink]:
+    global _SINKS
+
+    with _SINKS_LOCK:
+        if _SINKS is None:
+            _SINKS = _create_sinks()
+        return _SINKS
+
+
+def add_sink(sink: MetricsSink) -> None:
+    """
+    스팬 기록을 받을 싱크를 추가합니다. (설정으로 만든 싱크 뒤에 추가)
+
+    Args:
+        sink: 추가할 싱크
+    """
+    sinks = _get_sinks()
+    with _SINKS_LOCK:
+        sinks.append(sink)
+
+
+def remove_sink(sink: MetricsSink) -> None:
+    """
+    add_sink()로 추가한 싱크를 제거하고 닫습니다.
+
+    Args:
+        sink: 제거할 싱크
+    """
+    sinks = _get_sinks()
+    with _SINKS_LOCK:
+        if sink in sinks:
+            sinks.remove(sink)
+    sink.close()
+
+
+def close_sinks() -> None:
+    """모든 싱크를 닫습니다. (프로세스 종료 시 자동 호출)"""
+    with _SINKS_LOCK:
+        for sink in _SINKS or []:
+            try:
+                sink.close()
+            except Exception as e:
+                logger.warning(f"지표 싱크를 닫는 중 오류 발생: {str(e)}")
+
+
+atexit.register(close_sinks)
+
+
+def is_enabled() -> bool:
+    """지표 수집 여부를 반환합니다."""
+    return _ENABLED
+
+
+@contextmanager
+def node_span(node: str, session_id: Optional[str], state: Any = None) -> Iterator[Optional[Span]]:
+    """
+    노드 실행 스팬을 열고, 블록이 끝나면 스팬 기록을 싱크로 전달합니다.
+
+    Args:
+        node: 노드 이름
+        session_id: 대화 세션 ID
+        state: 노드 입력 상태 (크기 추정용, 메시지는 마지막 메시지만 포함)
+
+    Yields:
+        Optional[Span]: 현재 스팬 (지표 수집이 꺼져 있으면 None)
+    """
+    if not _ENABLED:
+        yield None
+        return
+
+    span = Span(node, session_id)
+    if state is not None:
+        span.add(state_in_size=estimate_state_size(state))
+    token = _CURRENT_SPAN.set(span)
+    try:
+        yield span
+    finally:
+        _CURRENT_SPAN.reset(token)
+        record = span.finish()
+        for sink in list(_get_sinks()):
+            try:
+                sink.emit(record)
+            except Exception as e:
+                # 지표 기록 실패가 노드 실행 결과에 영향을 주지 않도록 함
+                logger.warning(f"지표 기록 중 오류 발생: {str(e)}")
+
+
+def set_node_output(span: Optional[Span], result: Any) -> None:
+    """
+    노드가 반환한 상태 변경분을 스팬에 기록합니다.
+
+    Args:
+        span: node_span()이 반환한 스팬 (None이면 무시)
+        result: 노드 반환값
+    """
+    if span is None:
+        return
+    span.add(state_out_size=estimate_size(result))
+    if isinstance(result, Mapping):
+        span.node_result = result.get("node_result")
+
+
+def record_llm_call(prompt: str, response: Any, elapsed: float, cached: bool = False,
+                    usage: Optional[Mapping[str, Any]] = None) -> None:
+    """
+    현재 스팬에 LLM 호출 하나를 기록합니다. (스팬이 없으면 무시)
+
+    Args:
+        prompt: 프롬프트
+        response: 응답 텍스트
+        elapsed: 호출 시간 (초)
+        cached: 응답 캐시에서 반환했는지 여부
+        usage: 모델이 알려준 토큰 사용량 (input_tokens, output_tokens)
+    """
+    span = _CURRENT_SPAN.get()
+    if span is None:
+        return
+    response = response if isinstance(response, str) else ""
+    usage = usage or {}
+    span.add(
+        llm_ms=elapsed * 1000,
+        llm_calls=0 if cached else 1,
+        prompt_chars=len(prompt),
+        response_chars=len(response),
+        prompt_tokens=usage.get("input_tokens") or estimate_tokens(prompt),
+        response_tokens=usage.get("output_tokens") or estimate_tokens(response)
+    )
+    if cached:
+        span.add_cache_hit(CACHE_LLM)
+
+
+def record_cache_hit(kind: str) -> None:
+    """
+    현재 스팬에 캐시 적중을 기록합니다. (스팬이 없으면 무시)
+
+    Args:
+        kind: 캐시 종류 (CACHE_QUESTION, CACHE_SPECULATION 등)
+    """
+    span = _CURRENT_SPAN.get()
+    if span is not None:
+        span.add_cache_hit(kind)
+
+
+def detached_context() -> contextvars.Context:
+    """
+    현재 스팬에서 분리된 실행 컨텍스트를 반환합니다.
+
+    노드와 별개로 계속 실행되는 백그라운드 작업(추측 실행 등)의 LLM 호출이
+    작업을 시작한 노드의 스팬에 기록되지 않도록 할 때 사용합니다.
+
+    Returns:
+        contextvars.Context: 현재 컨텍스트의 복사본 (스팬 없음)
+    """
+    context = contextvars.copy_context()
+    context.run(_CURRENT_SPAN.set, None)
+    return context
+
+
+def get_metrics_summary() -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    노드별 지표 분포 요약을 반환합니다. (histogram 싱크에 기록된 스팬 기준)
+
+    Returns:
+        Dict[str, Dict[str, Dict[str, float]]]: 노드 → 지표 → count/mean/p50/p95/p99/max
+    """
+    return _REGISTRY.summary()
+
+
+def render_openmetrics() -> str:
+    """
+    노드별 지표 분포를 OpenMetrics 텍스트 형식으로 반환합니다.
+
+    Returns:
+        str: OpenMetrics 텍스트
+    """
+    return _REGISTRY.to_openmetrics()
+
+
+def reset_metrics() -> None:
+    """메모리에 유지한 지표 분포를 모두 삭제합니다."""
+    _REGISTRY.clear()
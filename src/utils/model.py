@@ -2,35 +2,307 @@ from langchain_community.llms import Ollama
 from langchain_openai import ChatOpenAI
 import os
 import json
+import asyncio
+import time
+import atexit
+import hashlib
+import math
+import threading
 import httpx
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterator, Mapping, Optional, Set, Tuple
 import logging
 
-def _read_state():
-    """state.json 파일에서 상태 정보를 읽어옵니다."""
-    state_path = Path("resources/data/state.json")
-    if not state_path.exists():
-        raise ValueError("state.json 파일이 존재하지 않습니다. 애플리케이션을 먼저 실행해주세요.")
-    
-    with open(state_path, "r", encoding="utf-8") as f:
-        state = json.load(f)
-    
-    return state
+from src.utils import metrics
+from src.utils.llm_cache import ResponseCache, make_cache_key
+from src.utils.paths import get_project_paths
+from src.utils.resilience import (
+    call_with_resilience, acall_with_resilience, stream_with_resilience, resolve_timeout
+)
+from src.utils.settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+# === LLM 클라이언트 풀 설정 ===
+# 풀에 유지할 최대 클라이언트 수 (초과 시 가장 오래 사용되지 않은 클라이언트부터 닫음)
+_POOL_SIZE: int = get_setting("llm_pool_size", 16)
+# 이 시간(초) 동안 사용되지 않은 클라이언트는 닫음
+_CLIENT_IDLE_TIMEOUT: float = get_setting("llm_client_idle_timeout", 300.0)
+# OpenAI HTTP 연결 제한
+_MAX_CONNECTIONS: int = get_setting("llm_max_connections", 10)
+_MAX_KEEPALIVE_CONNECTIONS: int = get_setting("llm_max_keepalive_connections", 5)
+_KEEPALIVE_EXPIRY: float = get_setting("llm_keepalive_expiry", 30.0)
+
+# === LLM 응답 캐시 설정 ===
+# 응답 캐시 사용 여부 (기본값: 사용하지 않음)
+_CACHE_ENABLED: bool = get_setting("llm_cache", False)
+# 메모리에 유지할 최대 응답 수
+_CACHE_MEMORY_SIZE: int = get_setting("llm_cache_memory_size", 256)
+# 응답 유효 시간(초, 0이면 만료되지 않음)과 디스크에 유지할 최대 응답 수
+_CACHE_TTL: float = get_setting("llm_cache_ttl", 7 * 24 * 3600.0)
+_CACHE_MAX_ENTRIES: int = get_setting("llm_cache_max_entries", 10000)
+
+# 풀 키: (모델 타입, 모델 이름, 온도, API 키 해시)
+PoolKey = Tuple[str, str, Optional[float], Optional[str]]
+
+
+class _PooledClient:
+    """풀에 보관된 LLM 객체와 그 객체가 사용하는 HTTP 클라이언트 (동기/비동기)"""
+
+    def __init__(self, llm: Any, http_client: Optional[httpx.Client] = None,
+                 http_async_client: Optional[httpx.AsyncClient] = None):
+        self.llm = llm
+        self.http_client = http_client
+        self.http_async_client = http_async_client
+        self.last_used = time.monotonic()
+
+    def close(self) -> None:
+        """HTTP 연결을 닫습니다."""
+        if self.http_client is not None:
+            self.http_client.close()
+        if self.http_async_client is not None and not self.http_async_client.is_closed:
+            try:
+                # 실행 중인 이벤트 루프가 있으면 그 루프에서, 없으면 새 루프에서 닫음
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            try:
+                if loop is not None:
+                    # 완료 전에 태스크가 정리되지 않도록 참조를 보관하고, 오류는 완료 시 기록
+                    task = loop.create_task(self.http_async_client.aclose())
+                    _CLOSING_TASKS.add(task)
+                    task.add_done_callback(_on_close_done)
+                else:
+                    asyncio.run(self.http_async_client.aclose())
+            except Exception as e:
+                logger.debug(f"비동기 HTTP 클라이언트를 닫는 중 오류 발생: {str(e)}")
+
+
+def _on_close_done(task: "asyncio.Task") -> None:
+    """비동기 HTTP 클라이언트를 닫는 태스크가 끝나면 참조를 정리하고 오류를 기록합니다."""
+    _CLOSING_TASKS.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug(f"비동기 HTTP 클라이언트를 닫는 중 오류 발생: {str(task.exception())}")
+
+
+# === 클라이언트 풀 변수 ===
+# 풀 키 → 클라이언트 (가장 최근에 사용된 클라이언트가 끝에 위치)
+_POOL: "OrderedDict[PoolKey, _PooledClient]" = OrderedDict()
+_POOL_LOCK = threading.Lock()
+# 비동기 HTTP 클라이언트를 닫는 중인 태스크 (완료될 때까지 참조 유지)
+_CLOSING_TASKS: Set["asyncio.Task"] = set()
+# 풀 통계 (hits: 재사용, misses: 새로 생성, closed: 닫은 클라이언트 수)
+_POOL_STATS: Dict[str, int] = {"hits": 0, "misses": 0, "closed": 0}
+
+# (풀 객체 id, 요청 시간 제한) → (풀 객체, 시간 제한을 바꾼 Ollama 사본)
+_TIMEOUT_VARIANTS: "OrderedDict[Tuple[int, int], Tuple[Any, Any]]" = OrderedDict()
+_TIMEOUT_VARIANTS_MAX = 64
+_TIMEOUT_VARIANTS_LOCK = threading.Lock()
+
+# === 응답 캐시 변수 ===
+# 응답 캐시 (처음 사용할 때 생성)
+_RESPONSE_CACHE: Optional[ResponseCache] = None
+_RESPONSE_CACHE_LOCK = threading.Lock()
+# 캐시를 거치지 않은 호출 수 (온도가 0보다 크거나 cache=False인 경우)
+_CACHE_BYPASSED: int = 0
+
+def get_model_config(config: Optional[Mapping[str, Any]],
+                     state: Optional[Mapping[str, Any]] = None) -> Optional[Mapping[str, Any]]:
+    """
+    그래프 실행 설정에서 모델 설정을 가져옵니다.
+
+    Agent는 graph.invoke(state, config={"configurable": {"model": ...}})로 모델 설정을 전달합니다.
+    실행 설정에 없으면 진행 중인 상태의 model 필드를 사용합니다. (노드를 직접 호출하는 경우)
+
+    Args:
+        config: LangGraph 실행 설정 (RunnableConfig)
+        state: 진행 중인 워크플로우 상태
+
+    Returns:
+        Optional[Mapping[str, Any]]: 모델 설정 (name, temperature, type, api_key) 또는 None
+    """
+    model = ((config or {}).get("configurable") or {}).get("model")
+    if model is None and state is not None:
+        model = state.get("model")
+    return model
+
+def _pool_key(model_name: str, temperature: float, model_type: str, api_key: Optional[str]) -> PoolKey:
+    """
+    모델 설정으로 풀 키를 만듭니다. API 키는 원문 대신 해시를 사용합니다.
+
+    Returns:
+        PoolKey: 풀 키
+    """
+    api_key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest() if api_key else None
+    return (model_type or "ollama", model_name, temperature, api_key_hash)
+
+
+def _close_idle_clients(now: float) -> None:
+    """
+    유휴 시간이 지났거나 풀 크기를 넘은 클라이언트를 닫습니다. (_POOL_LOCK을 잡은 상태에서 호출)
+
+    Args:
+        now: 현재 시각 (time.monotonic())
+    """
+    for key in list(_POOL.keys()):
+        client = _POOL[key]
+        if len(_POOL) <= _POOL_SIZE and now - client.last_used < _CLIENT_IDLE_TIMEOUT:
+            # 앞쪽일수록 오래 사용되지 않았으므로 이후 항목은 모두 유지
+            break
+        del _POOL[key]
+        client.close()
+        _POOL_STATS["closed"] += 1
+        logger.info(f"LLM 클라이언트를 닫았습니다: {key[0]}/{key[1]}")
 
-def _get_llm_instance(model_name: str, temperature: float, 
+
+def _get_llm_instance(model_name: str, temperature: float,
                      model_type: str, api_key: Optional[str]):
     """
-    모델 타입에 따라 적절한 LLM 객체를 초기화하고 반환합니다.
-    
+    모델 설정에 해당하는 LLM 객체를 풀에서 가져옵니다. (없으면 생성)
+
+    같은 설정의 호출은 같은 객체와 HTTP 연결(keep-alive)을 재사용하며,
+    오래 사용되지 않은 클라이언트는 다음 호출 때 닫힙니다.
+
     Args:
         model_name: 모델 이름 (llama3, gpt-3.5-turbo, gpt-4 등)
         temperature: 생성 온도 파라미터
         model_type: 모델 타입 ("ollama" 또는 "openai")
         api_key: OpenAI API 키 (model_type이 "openai"일 때만 사용)
     """
-    logger = logging.getLogger(__name__)
+    key = _pool_key(model_name, temperature, model_type, api_key)
+    now = time.monotonic()
+
+    with _POOL_LOCK:
+        _close_idle_clients(now)
+
+        client = _POOL.get(key)
+        if client is not None:
+            _POOL.move_to_end(key)
+            client.last_used = now
+            _POOL_STATS["hits"] += 1
+            return client.llm
+
+        client = _create_llm_client(model_name, temperature, model_type, api_key)
+        _POOL[key] = client
+        _POOL_STATS["misses"] += 1
+        _close_idle_clients(now)
+        return client.llm
+
+
+def get_llm_pool_stats() -> Dict[str, int]:
+    """
+    LLM 클라이언트 풀 통계를 반환합니다.
+
+    Returns:
+        Dict[str, int]: 재사용 횟수(hits), 생성 횟수(misses), 닫은 클라이언트 수(closed), 현재 크기(size)
+    """
+    with _POOL_LOCK:
+        return {**_POOL_STATS, "size": len(_POOL)}
+
+
+def close_llm_clients() -> None:
+    """풀의 모든 LLM 클라이언트를 닫습니다. (프로세스 종료 시 자동 호출)"""
+    with _POOL_LOCK:
+        for client in _POOL.values():
+            client.close()
+            _POOL_STATS["closed"] += 1
+        _POOL.clear()
+
+
+atexit.register(close_llm_clients)
+
+
+def _get_response_cache() -> ResponseCache:
+    """
+    응답 캐시를 반환합니다. (없으면 생성)
+
+    Returns:
+        ResponseCache: 응답 캐시
+    """
+    global _RESPONSE_CACHE
+
+    with _RESPONSE_CACHE_LOCK:
+        if _RESPONSE_CACHE is None:
+            _RESPONSE_CACHE = ResponseCache(
+                get_project_paths()["llm_cache_db"],
+                memory_size=_CACHE_MEMORY_SIZE,
+                ttl=_CACHE_TTL,
+                max_entries=_CACHE_MAX_ENTRIES
+            )
+        return _RESPONSE_CACHE
+
+
+def _should_use_cache(temperature: Optional[float], cache: Optional[bool]) -> bool:
+    """
+    호출에 응답 캐시를 사용할지 결정합니다.
+
+    온도가 0보다 크면 같은 프롬프트라도 응답이 달라야 하므로, cache=True로 강제하지 않는 한 캐시를 사용하지 않습니다.
+
+    Args:
+        temperature: 생성 온도
+        cache: 호출자가 지정한 캐시 사용 여부 (None이면 설정과 온도로 결정)
+
+    Returns:
+        bool: 캐시 사용 여부
+    """
+    if cache is not None:
+        return cache
+    return _CACHE_ENABLED and temperature is not None and temperature <= 0
+
+
+def _record_cache_bypass() -> None:
+    """캐시를 거치지 않은 호출 수를 늘립니다."""
+    global _CACHE_BYPASSED
+
+    with _RESPONSE_CACHE_LOCK:
+        _CACHE_BYPASSED += 1
+
+
+def get_llm_cache_stats() -> Dict[str, int]:
+    """
+    LLM 응답 캐시 통계를 반환합니다.
+
+    Returns:
+        Dict[str, int]: 메모리 적중(memory_hits), 디스크 적중(disk_hits), 실패(misses),
+            삭제(evictions), 캐시를 거치지 않은 호출(bypassed) 횟수
+    """
+    stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+    with _RESPONSE_CACHE_LOCK:
+        if _RESPONSE_CACHE is not None:
+            stats = _RESPONSE_CACHE.get_stats()
+    return {**stats, "bypassed": _CACHE_BYPASSED}
+
+
+def clear_llm_cache() -> None:
+    """메모리와 디스크에 저장된 모든 LLM 응답을 삭제합니다."""
+    _get_response_cache().clear()
+
+
+def _close_response_cache() -> None:
+    """응답 캐시의 데이터베이스 연결을 닫습니다. (프로세스 종료 시 자동 호출)"""
+    with _RESPONSE_CACHE_LOCK:
+        if _RESPONSE_CACHE is not None:
+            _RESPONSE_CACHE.close()
+
+
+atexit.register(_close_response_cache)
+
+
+def _create_llm_client(model_name: str, temperature: float,
+                       model_type: str, api_key: Optional[str]) -> _PooledClient:
+    """
+    모델 타입에 따라 적절한 LLM 객체를 초기화합니다.
     
+    Args:
+        model_name: 모델 이름 (llama3, gpt-3.5-turbo, gpt-4 등)
+        temperature: 생성 온도 파라미터
+        model_type: 모델 타입 ("ollama" 또는 "openai")
+        api_key: OpenAI API 키 (model_type이 "openai"일 때만 사용)
+
+    Returns:
+        _PooledClient: LLM 객체와 HTTP 클라이언트
+    """
     if model_type == "openai":
         if not api_key:
             logger.error("API 키가 없습니다. OpenAI 모델을 초기화할 수 없습니다.")
@@ -43,51 +315,280 @@ def _get_llm_instance(model_name: str, temperature: float,
         os.environ["REQUESTS_CA_BUNDLE"] = ""
         os.environ["SSL_CERT_FILE"] = ""
         
-        # SSL 검증을 비활성화한 httpx 클라이언트 생성
-        http_client = httpx.Client(verify=False)
+        # SSL 검증을 비활성화한 httpx 클라이언트 생성 (연결 수 제한 및 keep-alive 재사용)
+        limits = httpx.Limits(
+            max_connections=_MAX_CONNECTIONS,
+            max_keepalive_connections=_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=_KEEPALIVE_EXPIRY
+        )
+        http_client = httpx.Client(verify=False, limits=limits)
+        # ainvoke()용 비동기 클라이언트도 같은 설정 사용
+        http_async_client = httpx.AsyncClient(verify=False, limits=limits)
         
-        return ChatOpenAI(
+        # 재시도는 invoke()에서 처리하므로 클라이언트 자체 재시도는 끔
+        llm = ChatOpenAI(
             model=model_name, 
             temperature=temperature, 
             openai_api_key=api_key,
-            http_client=http_client
+            http_client=http_client,
+            http_async_client=http_async_client,
+            timeout=resolve_timeout(None),
+            max_retries=0
         )
+        return _PooledClient(llm, http_client, http_async_client)
     else:
         logger.info(f"Ollama 모델 초기화: {model_name}")
-        return Ollama(model=model_name, temperature=temperature)
+        # 요청 시간 제한: 시간 초과로 포기한 호출의 작업 스레드가 무한히 대기하지 않도록 함
+        timeout = resolve_timeout(None)
+        return _PooledClient(Ollama(model=model_name, temperature=temperature,
+                                    timeout=max(int(timeout), 1) if timeout else None))
 
-def invoke(prompt: str):
+def _prepare_invoke(prompt: str, model: Optional[Mapping[str, Any]],
+                    cache: Optional[bool]) -> Tuple[Any, Tuple[str, str], Optional[str], Optional[str]]:
     """
-    state.json 파일을 참조하여 적절한 LLM 객체를 생성하고 프롬프트를 처리합니다.
-    
+    invoke()/ainvoke()/stream() 공통 준비 단계: 모델 설정을 확인하고 응답 캐시를 조회합니다.
+
     Args:
         prompt: 모델에 전달할 프롬프트 문자열
-        
+        model: 모델 설정 (name, temperature, type, api_key)
+        cache: 응답 캐시 사용 여부
+
     Returns:
-        처리된 응답 (문자열)
+        Tuple[Any, Tuple[str, str], Optional[str], Optional[str]]:
+            (LLM 객체, 엔드포인트(모델 타입, 모델 이름), 캐시 키, 캐시된 응답).
+            캐시된 응답이 있으면 LLM 객체는 None입니다.
+
+    Raises:
+        ValueError: 모델 설정이 없는 경우
     """
-    # state.json에서 모델 설정 읽기
-    state = _read_state()
-    model_config = state.get("model")
-    
     # 모델이 선택되지 않은 경우 에러 발생
-    if model_config is None:
+    if model is None:
         logger.error("모델이 선택되지 않았습니다.")
         raise ValueError("모델을 먼저 선택해주세요.")
 
-    model_name = model_config.get("name")
-    temperature = model_config.get("temperature")
-    model_type = model_config.get("type")
-    api_key = model_config.get("api_key")
-    
+    model_name = model.get("name")
+    temperature = model.get("temperature")
+    model_type = model.get("type")
+    api_key = model.get("api_key")
+    endpoint = (model_type or "ollama", model_name)
+
+    cache_key = None
+    if _should_use_cache(temperature, cache):
+        cache_key = make_cache_key(model_type or "ollama", model_name, temperature, prompt)
+        cached = _get_response_cache().get(cache_key)
+        if cached is not None:
+            return None, endpoint, cache_key, cached
+    else:
+        _record_cache_bypass()
+
     # LLM 객체 생성
-    llm = _get_llm_instance(model_name, temperature, model_type, api_key)
-    
-    # 프롬프트 처리
-    result = llm.invoke(prompt)
-    
+    return _get_llm_instance(model_name, temperature, model_type, api_key), endpoint, cache_key, None
+
+
+def _json_mode_options(model_type: str) -> Dict[str, Any]:
+    """
+    JSON 출력 모드를 켜는 모델 호출 옵션을 반환합니다.
+
+    Args:
+        model_type: 모델 타입 ("openai" 또는 "ollama")
+
+    Returns:
+        Dict[str, Any]: LLM 객체의 invoke()/ainvoke()에 전달할 키워드 인자
+    """
+    if model_type == "openai":
+        return {"response_format": {"type": "json_object"}}
+    return {"format": "json"}
+
+
+def _finish_invoke(result: Any, cache_key: Optional[str], prompt: str, started: float) -> Any:
+    """
+    invoke()/ainvoke() 공통 마무리 단계: 응답 내용을 꺼내 캐시에 저장하고, 호출 지표를 기록합니다.
+
+    Args:
+        result: LLM 응답
+        cache_key: 응답 캐시 키 (캐시를 사용하지 않으면 None)
+        prompt: 모델에 전달한 프롬프트 (지표 기록용)
+        started: 호출 시작 시각 (time.perf_counter())
+
+    Returns:
+        처리된 응답 (문자열)
+    """
+    # 채팅 모델은 토큰 사용량을 알려주고, Ollama(LLM)는 문자열만 반환
+    usage = getattr(result, "usage_metadata", None)
+
     # AIMessage 객체일 경우 content 속성 추출
     if hasattr(result, 'content'):
         result = result.content
+
+    metrics.record_llm_call(prompt, result, time.perf_counter() - started, usage=usage)
+
+    if cache_key is not None and isinstance(result, str):
+        _get_response_cache().put(cache_key, result)
+
+    return result
+
+
+def _with_request_timeout(llm: Any, timeout: Optional[float]) -> Tuple[Any, Dict[str, Any]]:
+    """
+    LLM 클라이언트의 요청 시간 제한을 호출의 시간 예산에 맞춥니다.
+
+    시간 초과로 포기한 호출도 이 시간이 지나면 클라이언트에서 종료되므로,
+    멈춘 서버에 대한 호출이 작업 스레드를 계속 점유하지 않습니다.
+
+    Args:
+        llm: 풀에서 가져온 LLM 객체
+        timeout: 호출의 시간 예산 (초, None이면 COLLECTOR_LLM_TIMEOUT)
+
+    Returns:
+        Tuple[Any, Dict[str, Any]]: 호출에 사용할 LLM 객체와 invoke()/stream()에 전달할 키워드 인자
+    """
+    timeout = resolve_timeout(timeout)
+    if timeout is None:
+        return llm, {}
+    if isinstance(llm, ChatOpenAI):
+        # OpenAI 클라이언트는 요청마다 시간 제한 지정 가능
+        return llm, {"timeout": timeout}
+    if isinstance(llm, Ollama):
+        return _ollama_with_timeout(llm, max(math.ceil(timeout), 1)), {}
+    return llm, {}
+
+
+def _ollama_with_timeout(llm: Ollama, seconds: int) -> Ollama:
+    """
+    요청 시간 제한이 seconds인 Ollama 객체를 반환합니다.
+
+    Ollama는 객체의 설정을 사용하므로, 풀의 객체(기본 시간 예산)보다 짧은 제한이 필요할 때만
+    시간 제한을 바꾼 사본을 만들고, 같은 제한의 사본은 재사용합니다.
+    """
+    if llm.timeout is not None and seconds >= llm.timeout:
+        return llm
+    key = (id(llm), seconds)
+    with _TIMEOUT_VARIANTS_LOCK:
+        variant = _TIMEOUT_VARIANTS.get(key)
+        if variant is not None and variant[0] is llm:
+            _TIMEOUT_VARIANTS.move_to_end(key)
+            return variant[1]
+        copy = llm.model_copy(update={"timeout": seconds})
+        # 원본 객체도 함께 보관하여 id가 다른 객체에 재사용되지 않도록 함
+        _TIMEOUT_VARIANTS[key] = (llm, copy)
+        while len(_TIMEOUT_VARIANTS) > _TIMEOUT_VARIANTS_MAX:
+            _TIMEOUT_VARIANTS.popitem(last=False)
+        return copy
+
+
+def invoke(prompt: str, model: Optional[Mapping[str, Any]] = None, cache: Optional[bool] = None,
+           timeout: Optional[float] = None, hedge: bool = False, json_mode: bool = False):
+    """
+    모델 설정에 맞는 LLM 객체로 프롬프트를 처리합니다.
+
+    응답 캐시가 활성화되어 있고(COLLECTOR_LLM_CACHE=true) 온도가 0이면,
+    같은 모델/온도/프롬프트의 응답은 LLM을 호출하지 않고 캐시에서 반환합니다.
     
-    return result 
\ No newline at end of file
+    Args:
+        prompt: 모델에 전달할 프롬프트 문자열
+        model: 모델 설정 (name, temperature, type, api_key). 노드에서는 get_model_config()로 가져옵니다.
+        cache: 응답 캐시 사용 여부 (None이면 설정과 온도로 결정, True면 온도와 무관하게 사용, False면 사용하지 않음)
+        timeout: 재시도를 포함한 시간 예산 (초, None이면 COLLECTOR_LLM_TIMEOUT)
+        hedge: 응답이 늦으면 같은 요청을 한 번 더 보내 먼저 끝난 응답 사용 (COLLECTOR_LLM_HEDGE_DELAY > 0인 경우)
+        json_mode: 모델이 JSON 객체만 출력하도록 요청 (Ollama format="json", OpenAI response_format)
+        
+    Returns:
+        처리된 응답 (문자열)
+
+    Raises:
+        ValueError: 모델 설정이 없는 경우
+        CircuitOpenError: 모델 엔드포인트의 회로가 열려 있는 경우
+        LLMTimeoutError: 시간 예산 안에 끝나지 않은 경우
+    """
+    started = time.perf_counter()
+    llm, endpoint, cache_key, cached = _prepare_invoke(prompt, model, cache)
+    if llm is None:
+        metrics.record_llm_call(prompt, cached, time.perf_counter() - started, cached=True)
+        return cached
+
+    # 프롬프트 처리 (시간 제한, 일시적 오류 재시도, 회로 차단)
+    llm, options = _with_request_timeout(llm, timeout)
+    if json_mode:
+        options.update(_json_mode_options(endpoint[0]))
+    result = call_with_resilience(lambda: llm.invoke(prompt, **options), endpoint, timeout=timeout, hedge=hedge)
+    return _finish_invoke(result, cache_key, prompt, started)
+
+
+def stream(prompt: str, model: Optional[Mapping[str, Any]] = None, cache: Optional[bool] = None,
+           timeout: Optional[float] = None) -> Iterator[str]:
+    """
+    invoke()의 스트리밍 버전입니다. 모델이 생성하는 텍스트 조각을 도착하는 대로 반환합니다.
+
+    응답이 캐시되어 있으면 전체 응답을 한 조각으로 반환하고,
+    스트리밍이 끝나면 전체 응답을 invoke()와 같은 방식으로 캐시에 저장합니다.
+
+    Args:
+        prompt: 모델에 전달할 프롬프트 문자열
+        model: 모델 설정 (name, temperature, type, api_key). 노드에서는 get_model_config()로 가져옵니다.
+        cache: 응답 캐시 사용 여부 (None이면 설정과 온도로 결정, True면 온도와 무관하게 사용, False면 사용하지 않음)
+        timeout: 첫 조각까지의 시간 예산 (초, None이면 COLLECTOR_LLM_TIMEOUT)
+
+    Yields:
+        str: 응답 텍스트 조각
+
+    Raises:
+        ValueError: 모델 설정이 없는 경우
+        CircuitOpenError: 모델 엔드포인트의 회로가 열려 있는 경우
+        LLMTimeoutError: 시간 예산 안에 첫 조각이 도착하지 않은 경우
+    """
+    started = time.perf_counter()
+    llm, endpoint, cache_key, cached = _prepare_invoke(prompt, model, cache)
+    if llm is None:
+        metrics.record_llm_call(prompt, cached, time.perf_counter() - started, cached=True)
+        yield cached
+        return
+
+    chunks = []
+    llm, options = _with_request_timeout(llm, timeout)
+    for chunk in stream_with_resilience(lambda: llm.stream(prompt, **options), endpoint, timeout=timeout):
+        # 채팅 모델은 AIMessageChunk, Ollama(LLM)는 문자열을 반환
+        text = chunk.content if hasattr(chunk, "content") else chunk
+        if text:
+            chunks.append(text)
+            yield text
+
+    _finish_invoke("".join(chunks), cache_key, prompt, started)
+
+
+async def ainvoke(prompt: str, model: Optional[Mapping[str, Any]] = None, cache: Optional[bool] = None,
+                  timeout: Optional[float] = None, hedge: bool = False, json_mode: bool = False):
+    """
+    invoke()의 비동기 버전입니다.
+
+    LLM 응답을 기다리는 동안 이벤트 루프를 점유하지 않으므로,
+    하나의 이벤트 루프에서 여러 세션의 LLM 호출을 동시에 처리할 수 있습니다.
+
+    Args:
+        prompt: 모델에 전달할 프롬프트 문자열
+        model: 모델 설정 (name, temperature, type, api_key). 노드에서는 get_model_config()로 가져옵니다.
+        cache: 응답 캐시 사용 여부 (None이면 설정과 온도로 결정, True면 온도와 무관하게 사용, False면 사용하지 않음)
+        timeout: 재시도를 포함한 시간 예산 (초, None이면 COLLECTOR_LLM_TIMEOUT)
+        hedge: 응답이 늦으면 같은 요청을 한 번 더 보내 먼저 끝난 응답 사용 (COLLECTOR_LLM_HEDGE_DELAY > 0인 경우)
+        json_mode: 모델이 JSON 객체만 출력하도록 요청 (Ollama format="json", OpenAI response_format)
+
+    Returns:
+        처리된 응답 (문자열)
+
+    Raises:
+        ValueError: 모델 설정이 없는 경우
+        CircuitOpenError: 모델 엔드포인트의 회로가 열려 있는 경우
+        LLMTimeoutError: 시간 예산 안에 끝나지 않은 경우
+    """
+    started = time.perf_counter()
+    llm, endpoint, cache_key, cached = _prepare_invoke(prompt, model, cache)
+    if llm is None:
+        metrics.record_llm_call(prompt, cached, time.perf_counter() - started, cached=True)
+        return cached
+
+    # 프롬프트 처리 (시간 제한, 일시적 오류 재시도, 회로 차단)
+    llm, options = _with_request_timeout(llm, timeout)
+    if json_mode:
+        options.update(_json_mode_options(endpoint[0]))
+    result = await acall_with_resilience(lambda: llm.ainvoke(prompt, **options), endpoint, timeout=timeout,
+                                         hedge=hedge)
+    return _finish_invoke(result, cache_key, prompt, started)
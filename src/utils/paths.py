@@ -3,8 +3,9 @@
 """
 import os
 import logging
+import tempfile
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -37,5 +38,59 @@ def get_project_paths() -> Dict[str, Path]:
         "resources_dir": resources_dir,
         "data_dir": data_dir,
         "target_file": data_dir / "target.json",
-        "state_file": data_dir / "state.json"
-    } 
\ No newline at end of file
+        "state_file": data_dir / "state.json",
+        "sessions_dir": data_dir / "sessions",
+        "state_db": data_dir / "state.sqlite3",
+        "diagnostics_file": data_dir / "diagnostics.log",
+        "llm_cache_db": data_dir / "llm_cache.sqlite3",
+        "metrics_trace_file": data_dir / "metrics.jsonl",
+        "metrics_file": data_dir / "metrics.prom"
+    } 
+
+def write_file_atomic(path: Path, data: bytes, durable: bool = False) -> None:
+    """
+    파일을 원자적으로 기록합니다.
+
+    같은 디렉토리의 임시 파일에 쓴 뒤 os.replace()로 교체하므로,
+    다른 프로세스는 항상 이전 내용 또는 새 내용 전체만 읽게 됩니다.
+    임시 파일 이름은 호출마다 달라지므로 여러 프로세스가 동시에 기록해도 서로 덮어쓰지 않습니다.
+
+    Args:
+        path: 기록할 파일 경로
+        data: 기록할 내용
+        durable: True이면 교체 전에 임시 파일을 디스크에 동기화(fsync)
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_name, path)
+    except BaseException:
+        # 교체 전에 실패하면 임시 파일 정리
+        if os.path.exists(temp_name):
+            os.unlink(temp_name)
+        raise
+
+
+def file_signature(path: Path) -> Optional[Tuple[int, int, int]]:
+    """
+    파일 변경 여부를 판단하기 위한 서명을 반환합니다.
+
+    원자적 기록(임시 파일 교체)은 inode를, 추가 기록은 크기와 수정 시각을 바꾸므로
+    세 값 중 하나라도 다르면 파일이 변경된 것으로 봅니다.
+
+    Args:
+        path: 파일 경로
+
+    Returns:
+        Optional[Tuple[int, int, int]]: (수정 시각(ns), 크기, inode) 또는 파일이 없으면 None
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
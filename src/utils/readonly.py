@@ -0,0 +1,134 @@
+"""
+읽기 전용 뷰 유틸리티 모듈
+
+상태 데이터를 복사하지 않고 읽기 전용으로 노출하기 위한 뷰 타입을 제공합니다.
+뷰는 원본 컨테이너를 감싸기만 하므로 생성 비용이 데이터 크기와 무관하며,
+중첩된 dict/list는 접근하는 시점에 다시 읽기 전용 뷰로 감싸집니다.
+
+뷰를 수정 가능한 데이터로 바꾸려면 thaw()를 사용합니다. (copy.deepcopy도 같은 결과를 반환)
+"""
+
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterator, List
+
+
+class ReadOnlyDict(Mapping):
+    """dict를 감싸는 읽기 전용 뷰"""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+
+    def __getitem__(self, key: str) -> Any:
+        return readonly(self._data[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __eq__(self, other: object) -> bool:
+        return self._data == unwrap(other)
+
+    def __repr__(self) -> str:
+        return repr(self._data)
+
+    def __copy__(self) -> Dict[str, Any]:
+        return thaw(self._data)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[str, Any]:
+        return thaw(self._data)
+
+    def copy(self) -> Dict[str, Any]:
+        """수정 가능한 깊은 복사본을 반환합니다."""
+        return thaw(self._data)
+
+
+class ReadOnlyList(Sequence):
+    """list를 감싸는 읽기 전용 뷰"""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: List[Any]):
+        self._data = data
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return ReadOnlyList(self._data[index])
+        return readonly(self._data[index])
+
+    def __iter__(self) -> Iterator[Any]:
+        for item in self._data:
+            yield readonly(item)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __eq__(self, other: object) -> bool:
+        return self._data == unwrap(other)
+
+    def __repr__(self) -> str:
+        return repr(self._data)
+
+    def __copy__(self) -> List[Any]:
+        return thaw(self._data)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> List[Any]:
+        return thaw(self._data)
+
+    def copy(self) -> List[Any]:
+        """수정 가능한 깊은 복사본을 반환합니다."""
+        return thaw(self._data)
+
+
+def unwrap(value: Any) -> Any:
+    """
+    뷰이면 감싸고 있는 원본을, 아니면 값을 그대로 반환합니다. (최상위만 벗기며 복사하지 않음)
+
+    반환된 원본은 다른 곳과 공유되므로 수정하면 안 됩니다.
+    """
+    if isinstance(value, (ReadOnlyDict, ReadOnlyList)):
+        return value._data
+    return value
+
+
+def readonly(value: Any) -> Any:
+    """
+    값을 읽기 전용 뷰로 감쌉니다.
+
+    dict와 list만 감싸며, 그 외 값(문자열, 숫자, None 등)은 그대로 반환합니다.
+
+    Args:
+        value: 감쌀 값
+
+    Returns:
+        Any: 읽기 전용 뷰 또는 원래 값
+    """
+    if isinstance(value, dict):
+        return ReadOnlyDict(value)
+    if isinstance(value, list):
+        return ReadOnlyList(value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """
+    뷰 또는 JSON 형태의 데이터를 수정 가능한 깊은 복사본으로 변환합니다.
+
+    Args:
+        value: 변환할 값
+
+    Returns:
+        Any: 원본과 공유하지 않는 dict/list로 구성된 복사본
+    """
+    value = unwrap(value)
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
@@ -0,0 +1,558 @@
+"""
+LLM 호출 안정성 유틸리티 모듈
+
+invoke()/ainvoke()/stream()이 모델 호출을 감싸는 데 사용합니다.
+
+1. 시간 제한: 호출마다 전체 시간 예산(재시도 포함)을 두고, 넘으면 LLMTimeoutError 발생
+2. 재시도: 연결 오류, 시간 초과, 429/5xx 응답 등 일시적인 오류만 지수 백오프(전체 지터)로 재시도
+3. 회로 차단기: 모델 엔드포인트(모델 타입, 모델 이름)마다 연속 실패 수를 세어,
+   임계값을 넘으면 일정 시간 동안 호출하지 않고 바로 CircuitOpenError 발생
+4. 헤지 요청: 첫 요청이 지정 시간 안에 끝나지 않으면 같은 요청을 한 번 더 보내 먼저 끝난 응답 사용
+5. 작업 스레드 보호: 시간 초과로 포기한 호출이 작업 스레드를 일정 수 이상 점유하면, 끝날 때까지 회로를 열어 둠
+"""
+
+import asyncio
+import logging
+import random
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import httpx
+import requests
+
+from src.utils.settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+# 선택적 의존성 (OpenAI 모델을 사용하지 않으면 없어도 됨)
+try:
+    import openai
+except ImportError:  # pragma: no cover - 설치 환경에 따라 다름
+    openai = None
+
+# === LLM 호출 안정성 설정 ===
+# 호출당 기본 시간 예산 (초, 재시도 포함, 0이면 제한 없음)
+_DEFAULT_TIMEOUT: float = get_setting("llm_timeout", 120.0)
+# 일시적인 오류의 최대 재시도 횟수
+_MAX_RETRIES: int = get_setting("llm_max_retries", 2)
+# 재시도 대기 시간의 기준값과 최대값 (초)
+_RETRY_BACKOFF: float = get_setting("llm_retry_backoff", 0.5)
+_RETRY_BACKOFF_MAX: float = get_setting("llm_retry_backoff_max", 8.0)
+# 회로를 여는 연속 실패 수와 다시 시도하기까지의 시간 (초)
+_BREAKER_THRESHOLD: int = get_setting("llm_breaker_threshold", 5)
+_BREAKER_RESET_TIMEOUT: float = get_setting("llm_breaker_reset_timeout", 30.0)
+# 헤지 요청을 보내기 전 기다릴 시간 (초, 0이면 헤지 요청을 보내지 않음)
+_HEDGE_DELAY: float = get_setting("llm_hedge_delay", 0.0)
+# 시간 제한/헤지 요청에 사용하는 작업 스레드 수
+_CALL_WORKERS: int = get_setting("llm_call_workers", 16)
+# 엔드포인트별로 시간 초과로 포기했지만 아직 실행 중인 호출의 최대 수
+# (넘으면 그 호출들이 끝날 때까지 회로를 열어, 멈춘 엔드포인트가 작업 스레드를 모두 점유하지 않도록 함)
+_MAX_ABANDONED_CALLS: int = get_setting("llm_max_abandoned_calls", max(_CALL_WORKERS // 2, 1))
+
+# 재시도할 HTTP 상태 코드
+_RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+# Ollama(langchain_community)는 오류 응답을 상태 코드가 포함된 ValueError로 전달
+_STATUS_CODE_PATTERN = re.compile(r"status code (\d{3})")
+
+# 엔드포인트 키: (모델 타입, 모델 이름)
+Endpoint = Tuple[str, str]
+
+
+class LLMTimeoutError(TimeoutError):
+    """LLM 호출이 시간 예산 안에 끝나지 않은 경우"""
+
+
+class CircuitOpenError(RuntimeError):
+    """엔드포인트의 회로가 열려 있어 호출하지 않은 경우"""
+
+
+class CircuitBreaker:
+    """
+    엔드포인트별 회로 차단기
+
+    - closed: 정상 호출. 연속 실패가 임계값에 도달하면 open
+    - open: reset_timeout 동안 모든 호출을 바로 거부
+    - half-open: reset_timeout이 지나면 시험 호출 하나만 허용하고, 성공하면 closed, 실패하면 다시 open
+
+    시간 초과로 포기한 호출이 max_abandoned개 이상 작업 스레드에서 실행 중이면, 상태와 관계없이 호출을 거부합니다.
+    """
+
+    def __init__(self, threshold: int = 5, reset_timeout: float = 30.0, max_abandoned: int = 0):
+        """
+        Args:
+            threshold: 회로를 여는 연속 실패 수
+            reset_timeout: 회로를 연 뒤 시험 호출을 허용하기까지의 시간 (초)
+            max_abandoned: 포기한 호출이 실행 중일 때 호출을 거부하기 시작하는 수 (0이면 거부하지 않음)
+        """
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.max_abandoned = max_abandoned
+        self.failures = 0
+        self.abandoned = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def _saturated(self) -> bool:
+        return 0 < self.max_abandoned <= self.abandoned
+
+    @property
+    def state(self) -> str:
+        """현재 상태 ("closed", "open", "half-open")"""
+        with self._lock:
+            if self._saturated():
+                return "open"
+            if self.opened_at is None:
+                return "closed"
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return "open"
+            return "half-open"
+
+    def allow(self) -> bool:
+        """
+        호출을 허용할지 결정합니다.
+
+        Returns:
+            bool: 허용 여부 (half-open 상태에서는 시험 호출 하나만 허용)
+        """
+        with self._lock:
+            if self._saturated():
+                return False
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_timeout or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        """호출 성공을 기록하고 회로를 닫습니다."""
+        with self._lock:
+            if self.opened_at is not None:
+                logger.info("LLM 엔드포인트가 복구되어 회로를 닫습니다")
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def release(self) -> None:
+        """결과 없이 중단된 시험 호출(취소 등)의 허용을 반납합니다."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def track_abandoned(self, future: Future) -> None:
+        """
+        시간 초과로 포기했지만 작업 스레드에서 계속 실행 중인 호출을 끝날 때까지 집계합니다.
+
+        Args:
+            future: 포기한 호출의 Future
+        """
+        with self._lock:
+            self.abandoned += 1
+            if self.abandoned == self.max_abandoned:
+                logger.warning(f"포기한 LLM 호출 {self.abandoned}개가 아직 실행 중이므로 끝날 때까지 회로를 엽니다")
+        future.add_done_callback(self._release_abandoned)
+
+    def _release_abandoned(self, future: Future) -> None:
+        with self._lock:
+            self.abandoned -= 1
+
+    def record_failure(self) -> None:
+        """호출 실패를 기록하고, 임계값에 도달했거나 시험 호출이 실패하면 회로를 엽니다."""
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.threshold:
+                if self.opened_at is None or self._trial_in_flight:
+                    logger.warning(f"LLM 엔드포인트 호출이 연속 {self.failures}회 실패하여 회로를 엽니다")
+                self.opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+
+# === 호출 상태 변수 ===
+# 엔드포인트 → 회로 차단기
+_BREAKERS: Dict[Endpoint, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+# 호출 통계 (retries: 재시도, timeouts: 시간 초과, short_circuits: 회로가 열려 거부,
+#           hedges: 헤지 요청, hedge_wins: 헤지 요청이 먼저 끝난 횟수)
+_CALL_STATS: Dict[str, int] = {"retries": 0, "timeouts": 0, "short_circuits": 0, "hedges": 0, "hedge_wins": 0}
+_CALL_STATS_LOCK = threading.Lock()
+# 시간 제한/헤지 요청용 작업 스레드 풀 (처음 사용할 때 생성)
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _record_call_stats(**increments: int) -> None:
+    with _CALL_STATS_LOCK:
+        for key, value in increments.items():
+            _CALL_STATS[key] += value
+
+
+def get_llm_call_stats() -> Dict[str, Any]:
+    """
+    LLM 호출 안정성 통계를 반환합니다.
+
+    Returns:
+        Dict[str, Any]: 재시도/시간 초과/거부/헤지 횟수와 엔드포인트별 회로 상태(breakers)
+    """
+    with _CALL_STATS_LOCK:
+        stats: Dict[str, Any] = dict(_CALL_STATS)
+    with _BREAKERS_LOCK:
+        stats["breakers"] = {f"{key[0]}/{key[1]}": breaker.state for key, breaker in _BREAKERS.items()}
+    return stats
+
+
+def get_breaker(endpoint: Endpoint) -> CircuitBreaker:
+    """
+    엔드포인트의 회로 차단기를 반환합니다. (없으면 생성)
+
+    Args:
+        endpoint: (모델 타입, 모델 이름)
+
+    Returns:
+        CircuitBreaker: 회로 차단기
+    """
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(endpoint)
+        if breaker is None:
+            breaker = CircuitBreaker(_BREAKER_THRESHOLD, _BREAKER_RESET_TIMEOUT, _MAX_ABANDONED_CALLS)
+            _BREAKERS[endpoint] = breaker
+        return breaker
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=_CALL_WORKERS, thread_name_prefix="llm-call")
+        return _EXECUTOR
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    재시도하면 성공할 수 있는 일시적인 오류인지 판단합니다.
+
+    Args:
+        error: 발생한 예외
+
+    Returns:
+        bool: 재시도 가능 여부
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, (TimeoutError, ConnectionError, asyncio.TimeoutError,
+                          httpx.TransportError, requests.exceptions.ConnectionError,
+                          requests.exceptions.Timeout)):
+        return True
+    if openai is not None and isinstance(error, openai.APIConnectionError):
+        return True
+
+    status_code = getattr(error, "status_code", None)
+    if status_code is None and isinstance(error, ValueError):
+        match = _STATUS_CODE_PATTERN.search(str(error))
+        status_code = int(match.group(1)) if match else None
+    return status_code in _RETRYABLE_STATUS_CODES
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    재시도 전 대기 시간을 계산합니다. (지수 백오프 + 전체 지터)
+
+    Args:
+        attempt: 재시도 순번 (1부터 시작)
+
+    Returns:
+        float: 대기 시간 (초)
+    """
+    return random.uniform(0, min(_RETRY_BACKOFF_MAX, _RETRY_BACKOFF * (2 ** (attempt - 1))))
+
+
+def resolve_timeout(timeout: Optional[float]) -> Optional[float]:
+    """
+    호출의 시간 예산을 결정합니다.
+
+    Args:
+        timeout: 호출자가 지정한 시간 예산 (None이면 기본값, 0 이하이면 제한 없음)
+
+    Returns:
+        Optional[float]: 시간 예산 (초) 또는 None (제한 없음)
+    """
+    if timeout is None:
+        timeout = _DEFAULT_TIMEOUT
+    return timeout if timeout and timeout > 0 else None
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def _check_breaker(breaker: CircuitBreaker, endpoint: Endpoint) -> None:
+    if not breaker.allow():
+        _record_call_stats(short_circuits=1)
+        raise CircuitOpenError(f"LLM 엔드포인트 {endpoint[0]}/{endpoint[1]}의 회로가 열려 있습니다")
+
+
+def _next_retry_delay(error: BaseException, attempt: int, breaker: CircuitBreaker,
+                      deadline: Optional[float]) -> Optional[float]:
+    """
+    실패한 시도를 기록하고 재시도 전 대기 시간을 반환합니다.
+
+    Returns:
+        Optional[float]: 대기 시간 (재시도하지 않으면 None)
+    """
+    if not isinstance(error, Exception):
+        # 취소/인터럽트는 엔드포인트 상태와 무관하므로 실패로 기록하지 않음
+        breaker.release()
+        return None
+    if not is_retryable(error):
+        # 엔드포인트가 응답한 오류(인증 실패 등)는 장애로 보지 않지만, 복구의 근거도 아니므로 시험 호출 허용만 반납
+        breaker.release()
+        return None
+
+    breaker.record_failure()
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError)):
+        _record_call_stats(timeouts=1)
+    if attempt > _MAX_RETRIES:
+        return None
+
+    delay = backoff_delay(attempt)
+    remaining = _remaining(deadline)
+    if remaining is not None and remaining <= delay:
+        return None
+    _record_call_stats(retries=1)
+    logger.warning(f"LLM 호출 실패, {delay:.2f}초 후 재시도합니다 ({attempt}/{_MAX_RETRIES}): {str(error)}")
+    return delay
+
+
+def _run_attempt(func: Callable[[], Any], timeout: Optional[float], hedge: bool,
+                 breaker: CircuitBreaker) -> Any:
+    """
+    한 번의 시도를 실행합니다. 시간 제한이나 헤지 요청이 필요하면 작업 스레드에서 실행합니다.
+
+    시간 초과로 포기한 요청은 스레드에서 계속 실행되지만 결과는 버려지며,
+    클라이언트의 요청 시간 제한(호출의 시간 예산)으로 종료될 때까지 회로 차단기에 집계됩니다.
+    """
+    hedge_delay = _HEDGE_DELAY if hedge else 0
+    if timeout is None and not hedge_delay:
+        return func()
+
+    executor = _get_executor()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    futures: List[Future] = [executor.submit(func)]
+    first_error: Optional[BaseException] = None
+
+    if hedge_delay:
+        done, _ = wait(futures, timeout=hedge_delay if timeout is None else min(hedge_delay, timeout))
+        if not done and (deadline is None or time.monotonic() < deadline):
+            futures.append(executor.submit(func))
+            _record_call_stats(hedges=1)
+
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, timeout=_remaining(deadline), return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for future in done:
+            error = future.exception()
+            if error is None:
+                _abandon(pending, breaker)
+                if future is not futures[0]:
+                    _record_call_stats(hedge_wins=1)
+                return future.result()
+            first_error = first_error or error
+
+    if first_error is not None and not pending:
+        raise first_error
+    _abandon(pending, breaker)
+    raise LLMTimeoutError(f"LLM 호출이 {timeout:.1f}초 안에 끝나지 않았습니다")
+
+
+def _abandon(futures: Iterable[Future], breaker: CircuitBreaker) -> None:
+    """결과가 필요 없는 요청을 취소하고, 이미 실행 중이라 취소할 수 없는 요청은 회로 차단기에 집계"""
+    for future in futures:
+        if not future.cancel():
+            breaker.track_abandoned(future)
+
+
+def call_with_resilience(func: Callable[[], Any], endpoint: Endpoint,
+                         timeout: Optional[float] = None, hedge: bool = False) -> Any:
+    """
+    LLM 호출을 시간 예산, 재시도, 회로 차단기, 헤지 요청으로 감싸 실행합니다.
+
+    Args:
+        func: 실행할 호출 (인자 없음)
+        endpoint: 회로 차단기를 구분할 (모델 타입, 모델 이름)
+        timeout: 재시도를 포함한 전체 시간 예산 (None이면 기본값, 0 이하이면 제한 없음)
+        hedge: 헤지 요청 사용 여부 (COLLECTOR_LLM_HEDGE_DELAY가 0보다 큰 경우에만 동작)
+
+    Returns:
+        호출 결과
+
+    Raises:
+        CircuitOpenError: 엔드포인트의 회로가 열려 있는 경우
+        LLMTimeoutError: 시간 예산 안에 끝나지 않은 경우
+        Exception: 재시도할 수 없거나 재시도 횟수를 넘은 호출 오류
+    """
+    timeout = resolve_timeout(timeout)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    breaker = get_breaker(endpoint)
+    attempt = 0
+
+    while True:
+        _check_breaker(breaker, endpoint)
+        attempt += 1
+        remaining = _remaining(deadline)
+        try:
+            if remaining is not None and remaining <= 0:
+                raise LLMTimeoutError(f"LLM 호출이 {timeout:.1f}초 안에 끝나지 않았습니다")
+            result = _run_attempt(func, remaining, hedge, breaker)
+        except BaseException as e:
+            delay = _next_retry_delay(e, attempt, breaker, deadline)
+            if delay is None:
+                raise
+            time.sleep(delay)
+            continue
+
+        breaker.record_success()
+        return result
+
+
+def stream_with_resilience(func: Callable[[], Iterator[Any]], endpoint: Endpoint,
+                           timeout: Optional[float] = None) -> Iterator[Any]:
+    """
+    스트리밍 호출을 시간 예산, 재시도, 회로 차단기로 감싸 실행합니다.
+
+    이미 전달한 조각이 중복되지 않도록 첫 조각을 받기 전의 오류만 재시도하며,
+    시간 예산은 첫 조각까지 적용됩니다. (이후 조각 사이의 대기는 클라이언트의 요청 시간 제한 적용)
+
+    Args:
+        func: 스트림(이터레이터)을 만드는 함수 (인자 없음, 시도마다 호출)
+        endpoint: 회로 차단기를 구분할 (모델 타입, 모델 이름)
+        timeout: 첫 조각까지의 시간 예산 (None이면 기본값, 0 이하이면 제한 없음)
+
+    Yields:
+        스트림 조각
+
+    Raises:
+        CircuitOpenError: 엔드포인트의 회로가 열려 있는 경우
+        LLMTimeoutError: 시간 예산 안에 첫 조각이 도착하지 않은 경우
+        Exception: 재시도할 수 없거나 재시도 횟수를 넘은 호출 오류
+    """
+    timeout = resolve_timeout(timeout)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    breaker = get_breaker(endpoint)
+    attempt = 0
+    end = object()
+
+    while True:
+        _check_breaker(breaker, endpoint)
+        attempt += 1
+        remaining = _remaining(deadline)
+        try:
+            if remaining is not None and remaining <= 0:
+                raise LLMTimeoutError(f"LLM 호출이 {timeout:.1f}초 안에 끝나지 않았습니다")
+            iterator = iter(func())
+            first = _run_attempt(lambda: next(iterator, end), remaining, False, breaker)
+        except BaseException as e:
+            delay = _next_retry_delay(e, attempt, breaker, deadline)
+            if delay is None:
+                raise
+            time.sleep(delay)
+            continue
+        break
+
+    # 첫 조각이 도착했으면 엔드포인트는 응답하고 있음
+    breaker.record_success()
+    if first is end:
+        return
+
+    yield first
+    try:
+        yield from iterator
+    except Exception as e:
+        if is_retryable(e):
+            breaker.record_failure()
+        raise
+
+
+async def _arun_attempt(func: Callable[[], Awaitable[Any]], timeout: Optional[float], hedge: bool) -> Any:
+    """_run_attempt()의 비동기 버전 (작업 스레드 대신 태스크 사용)"""
+    hedge_delay = _HEDGE_DELAY if hedge else 0
+    deadline = None if timeout is None else time.monotonic() + timeout
+    tasks = [asyncio.ensure_future(func())]
+    first_error: Optional[BaseException] = None
+
+    try:
+        if hedge_delay:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay if timeout is None else min(hedge_delay, timeout))
+            if not done and (deadline is None or time.monotonic() < deadline):
+                tasks.append(asyncio.ensure_future(func()))
+                _record_call_stats(hedges=1)
+
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, timeout=_remaining(deadline),
+                                               return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                error = task.exception()
+                if error is None:
+                    if task is not tasks[0]:
+                        _record_call_stats(hedge_wins=1)
+                    return task.result()
+                first_error = first_error or error
+
+        if first_error is not None and not pending:
+            raise first_error
+        raise LLMTimeoutError(f"LLM 호출이 {timeout:.1f}초 안에 끝나지 않았습니다")
+    finally:
+        # 끝나지 않은 요청(느린 쪽 헤지 요청, 시간 초과된 요청)은 취소
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+async def acall_with_resilience(func: Callable[[], Awaitable[Any]], endpoint: Endpoint,
+                                timeout: Optional[float] = None, hedge: bool = False) -> Any:
+    """
+    call_with_resilience()의 비동기 버전입니다.
+
+    Args:
+        func: 실행할 코루틴을 만드는 함수 (인자 없음, 시도마다 호출)
+        endpoint: 회로 차단기를 구분할 (모델 타입, 모델 이름)
+        timeout: 재시도를 포함한 전체 시간 예산 (None이면 기본값, 0 이하이면 제한 없음)
+        hedge: 헤지 요청 사용 여부 (COLLECTOR_LLM_HEDGE_DELAY가 0보다 큰 경우에만 동작)
+
+    Returns:
+        호출 결과
+
+    Raises:
+        CircuitOpenError: 엔드포인트의 회로가 열려 있는 경우
+        LLMTimeoutError: 시간 예산 안에 끝나지 않은 경우
+        Exception: 재시도할 수 없거나 재시도 횟수를 넘은 호출 오류
+    """
+    timeout = resolve_timeout(timeout)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    breaker = get_breaker(endpoint)
+    attempt = 0
+
+    while True:
+        _check_breaker(breaker, endpoint)
+        attempt += 1
+        remaining = _remaining(deadline)
+        try:
+            if remaining is not None and remaining <= 0:
+                raise LLMTimeoutError(f"LLM 호출이 {timeout:.1f}초 안에 끝나지 않았습니다")
+            result = await _arun_attempt(func, remaining, hedge)
+        except BaseException as e:
+            delay = _next_retry_delay(e, attempt, breaker, deadline)
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+            continue
+
+        breaker.record_success()
+        return result
@@ -0,0 +1,51 @@
+"""
+실행 설정 유틸리티 모듈
+
+COLLECTOR_ 접두사가 붙은 환경 변수에서 실행 설정을 읽어옵니다.
+예: get_setting("state_storage", "json") → COLLECTOR_STATE_STORAGE
+"""
+import os
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 접두사
+_ENV_PREFIX = "COLLECTOR_"
+
+# 참(True)으로 해석되는 문자열 값
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+
+
+def get_setting(name: str, default: Any) -> Any:
+    """
+    환경 변수에서 설정값을 읽어 기본값과 같은 타입으로 변환합니다.
+
+    Args:
+        name: 설정 이름 (대소문자 무관, COLLECTOR_ 접두사 제외)
+        default: 환경 변수가 없거나 변환할 수 없을 때 사용할 기본값
+
+    Returns:
+        Any: 변환된 설정값 또는 기본값
+    """
+    env_name = f"{_ENV_PREFIX}{name.upper()}"
+    raw_value = os.environ.get(env_name)
+
+    # 환경 변수가 없으면 기본값 반환
+    if raw_value is None or raw_value.strip() == "":
+        return default
+
+    raw_value = raw_value.strip()
+
+    try:
+        # bool은 int의 하위 타입이므로 먼저 확인
+        if isinstance(default, bool):
+            return raw_value.lower() in _TRUE_VALUES
+        if isinstance(default, int):
+            return int(raw_value)
+        if isinstance(default, float):
+            return float(raw_value)
+        return raw_value
+    except ValueError:
+        logger.warning(f"설정값을 변환할 수 없습니다: {env_name}={raw_value!r}. 기본값 {default!r}을 사용합니다.")
+        return default
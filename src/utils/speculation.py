@@ -0,0 +1,201 @@
+"""
+추측 실행 유틸리티 모듈
+
+충분한 답변 뒤에는 process_answer → find_missing → generate_question이 차례로 실행되는데,
+다음 타겟은 평가가 끝나기 전에 이미 알 수 있습니다. process_answer는 평가를 시작하기 전에
+다음 타겟의 질문 생성을 이 모듈로 미리 시작하고, generate_question은 같은 프롬프트의
+추측 결과가 있으면 LLM을 다시 호출하지 않고 사용합니다. 답변이 불충분하면 추측 결과는 버립니다.
+
+세션마다 진행 중인 추측은 하나만 유지하며, 같은 세션에서 새 추측을 시작하면 이전 추측은 버려집니다.
+버려진 추측의 LLM 호출은 이미 시작되었다면 끝까지 실행되지만 결과는 사용되지 않습니다.
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple, Union
+
+from src.utils import metrics
+from src.utils.llm_cache import make_cache_key
+from src.utils.settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+# 추측 실행에 사용할 최대 작업 스레드 수
+_WORKERS: int = get_setting("speculation_workers", 4)
+
+# 세션 ID → (추측 키, 실행 중인 작업)
+_PENDING: Dict[str, Tuple[str, Union[Future, "asyncio.Future"]]] = {}
+_LOCK = threading.Lock()
+_STATS: Dict[str, int] = {"started": 0, "hits": 0, "misses": 0, "discarded": 0}
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+
+def speculation_key(model: Optional[Mapping[str, Any]], prompt: str) -> str:
+    """
+    추측 결과를 찾는 키를 만듭니다. (모델과 프롬프트가 같아야 같은 결과로 취급)
+
+    Args:
+        model: 모델 설정 (name, temperature, type, api_key)
+        prompt: 모델에 전달할 프롬프트 문자열
+
+    Returns:
+        str: 추측 키
+    """
+    model = model or {}
+    return make_cache_key(model.get("type") or "ollama", model.get("name"), model.get("temperature"), prompt)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+
+    with _LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=_WORKERS, thread_name_prefix="speculation")
+        return _EXECUTOR
+
+
+def _cancel(task: Union[Future, "asyncio.Future"]) -> None:
+    """추측 작업을 취소합니다. (asyncio 태스크는 다른 스레드에서 꺼낼 수 있으므로 태스크의 이벤트 루프에서 취소)"""
+    if isinstance(task, Future):
+        task.cancel()
+        return
+    try:
+        task.get_loop().call_soon_threadsafe(task.cancel)
+    except RuntimeError:
+        # 이벤트 루프가 이미 닫혔으면 태스크도 더 이상 실행되지 않음
+        pass
+
+
+def _register(session_id: str, key: str, task: Union[Future, "asyncio.Future"]) -> None:
+    with _LOCK:
+        previous = _PENDING.pop(session_id, None)
+        _PENDING[session_id] = (key, task)
+        _STATS["started"] += 1
+        if previous is not None:
+            _STATS["discarded"] += 1
+    if previous is not None:
+        _cancel(previous[1])
+
+
+def start(session_id: str, key: str, func: Callable[[], Any]) -> None:
+    """
+    작업 스레드에서 추측 실행을 시작합니다.
+
+    Args:
+        session_id: 대화 세션 ID
+        key: speculation_key()로 만든 추측 키
+        func: 실행할 함수 (예: 다음 질문 생성 LLM 호출)
+    """
+    _register(session_id, key, _get_executor().submit(func))
+
+
+def astart(session_id: str, key: str, coroutine: Awaitable[Any]) -> None:
+    """
+    현재 이벤트 루프에서 추측 실행을 시작합니다. (start()의 비동기 버전)
+
+    Args:
+        session_id: 대화 세션 ID
+        key: speculation_key()로 만든 추측 키
+        coroutine: 실행할 코루틴 (예: 다음 질문 생성 LLM 호출)
+    """
+    # 추측 실행은 시작한 노드가 끝난 뒤에도 계속되므로 노드의 지표 스팬과 분리하여 실행
+    task = asyncio.get_running_loop().create_task(coroutine, context=metrics.detached_context())
+    # 버려진 추측의 예외가 "never retrieved" 경고로 남지 않도록 함
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    _register(session_id, key, task)
+
+
+def _take(session_id: str, key: str) -> Optional[Union[Future, "asyncio.Future"]]:
+    """세션의 추측을 꺼냅니다. 키가 다르면 추측을 버리고 None을 반환합니다."""
+    with _LOCK:
+        pending = _PENDING.pop(session_id, None)
+        if pending is None:
+            return None
+        if pending[0] != key:
+            _STATS["misses"] += 1
+            _STATS["discarded"] += 1
+        else:
+            _STATS["hits"] += 1
+    if pending[0] != key:
+        _cancel(pending[1])
+        return None
+    return pending[1]
+
+
+def take(session_id: str, key: str, timeout: Optional[float] = None) -> Optional[Any]:
+    """
+    같은 키의 추측 결과를 기다려 반환합니다.
+
+    Args:
+        session_id: 대화 세션 ID
+        key: speculation_key()로 만든 추측 키
+        timeout: 결과를 기다릴 최대 시간 (초, None이면 제한 없음)
+
+    Returns:
+        Optional[Any]: 추측 결과 (추측이 없거나, 키가 다르거나, 실패했으면 None - 호출자가 직접 실행)
+    """
+    task = _take(session_id, key)
+    if task is None:
+        return None
+    if not isinstance(task, Future):
+        # 비동기 그래프에서 시작한 추측은 동기 호출에서 기다릴 수 없으므로 취소
+        _cancel(task)
+        return None
+    try:
+        return task.result(timeout=timeout)
+    except Exception as e:
+        logger.warning(f"추측 실행 결과를 사용할 수 없습니다: {str(e)}")
+        return None
+
+
+async def atake(session_id: str, key: str, timeout: Optional[float] = None) -> Optional[Any]:
+    """
+    take()의 비동기 버전입니다.
+
+    Args:
+        session_id: 대화 세션 ID
+        key: speculation_key()로 만든 추측 키
+        timeout: 결과를 기다릴 최대 시간 (초, None이면 제한 없음)
+
+    Returns:
+        Optional[Any]: 추측 결과 (추측이 없거나, 키가 다르거나, 실패했으면 None - 호출자가 직접 실행)
+    """
+    task = _take(session_id, key)
+    if task is None:
+        return None
+    try:
+        if isinstance(task, Future):
+            task = asyncio.wrap_future(task)
+        return await asyncio.wait_for(task, timeout=timeout)
+    except Exception as e:
+        logger.warning(f"추측 실행 결과를 사용할 수 없습니다: {str(e)}")
+        return None
+
+
+def discard(session_id: str) -> None:
+    """
+    세션의 추측을 버립니다. (답변이 불충분하거나 처리 중 오류가 발생한 경우, 세션이 끝나거나 캐시에서 제거된 경우)
+
+    Args:
+        session_id: 대화 세션 ID
+    """
+    with _LOCK:
+        pending = _PENDING.pop(session_id, None)
+        if pending is not None:
+            _STATS["discarded"] += 1
+    if pending is not None:
+        _cancel(pending[1])
+
+
+def get_speculation_stats() -> Dict[str, int]:
+    """
+    추측 실행 통계를 반환합니다.
+
+    Returns:
+        Dict[str, int]: 시작(started), 사용(hits), 키 불일치(misses), 버림(discarded) 횟수
+    """
+    with _LOCK:
+        return dict(_STATS)
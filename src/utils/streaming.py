@@ -0,0 +1,112 @@
+"""
+응답 스트리밍 유틸리티 모듈
+
+Agent의 스트리밍 진입점(stream_user_message, stream_initialize_chat)은 그래프를
+stream_mode="custom"으로 실행하고 실행 설정에 configurable.stream_tokens=True를 넣습니다.
+노드는 이 모듈의 함수로 사용자에게 보여줄 AI 메시지를 토큰 단위로 내보냅니다.
+
+스트림 이벤트 (LangGraph 스트림 작성기로 전달):
+- {"type": "token", "content": str}: 진행 중인 AI 메시지의 텍스트 조각
+- {"type": "message_end"}: 진행 중인 AI 메시지의 끝
+
+Ollama는 채팅 모델이 아닌 LLM 래퍼라서 stream_mode="messages"로는 토큰이 전달되지 않으므로,
+모델 종류와 무관하게 동작하도록 노드가 직접 스트림 작성기에 기록합니다.
+"""
+
+from typing import Any, Iterable, Mapping, Optional, Tuple
+
+from langgraph.config import get_stream_writer
+
+from src.utils.model import stream
+
+# 스트림 이벤트 종류
+STREAM_TOKEN = "token"
+STREAM_MESSAGE_END = "message_end"
+
+
+def is_streaming(config: Optional[Mapping[str, Any]]) -> bool:
+    """
+    그래프가 토큰 스트리밍 모드로 실행 중인지 확인합니다.
+
+    Args:
+        config: LangGraph 실행 설정 (RunnableConfig)
+
+    Returns:
+        bool: 스트리밍 여부
+    """
+    return bool(((config or {}).get("configurable") or {}).get("stream_tokens"))
+
+
+def end_message() -> None:
+    """진행 중인 AI 메시지의 끝을 알립니다."""
+    get_stream_writer()({"type": STREAM_MESSAGE_END})
+
+
+def emit_messages(messages: Iterable[Mapping[str, Any]]) -> None:
+    """
+    완성된 AI 메시지들을 한 번에 내보냅니다. (LLM이 생성하지 않은 확인 메시지 등)
+
+    Args:
+        messages: 내보낼 메시지 목록 (AI 메시지만 전달됨)
+    """
+    writer = get_stream_writer()
+    for message in messages:
+        if message.get("role") == "ai":
+            writer({"type": STREAM_TOKEN, "content": message["content"]})
+            writer({"type": STREAM_MESSAGE_END})
+
+
+def _visible_result(text: str, tag_name: str) -> str:
+    """
+    스트리밍 중인 XML 평가에서 <tag_name> 블록의 <result> 내용 중 지금까지 확정된 부분을 반환합니다.
+
+    닫는 태그가 조각 사이에 나뉘어 도착할 수 있으므로, 닫는 태그가 보이기 전에는
+    닫는 태그 길이만큼의 끝부분을 보류합니다.
+    """
+    block_start = text.find(f"<{tag_name}>")
+    if block_start == -1:
+        return ""
+    result_start = text.find("<result>", block_start)
+    if result_start == -1:
+        return ""
+    content = text[result_start + len("<result>"):]
+    result_end = content.find("</result>")
+    if result_end != -1:
+        return content[:result_end]
+    return content[:max(len(content) - len("</result>") + 1, 0)]
+
+
+def stream_invoke(prompt: str, model: Optional[Mapping[str, Any]] = None,
+                  result_tag: Optional[str] = None, timeout: Optional[float] = None) -> Tuple[str, bool]:
+    """
+    LLM 응답을 스트리밍하면서 사용자에게 보여줄 부분을 토큰 이벤트로 내보냅니다.
+
+    Args:
+        prompt: 모델에 전달할 프롬프트 문자열
+        model: 모델 설정 (name, temperature, type, api_key)
+        result_tag: 지정하면 응답 전체 대신 <result_tag> 블록의 <result> 내용만 내보냄
+            (예: "insufficient" - 평가 결과가 불충분일 때의 후속 질문)
+        timeout: 첫 조각까지의 시간 예산 (초, None이면 기본값)
+
+    Returns:
+        Tuple[str, bool]: (전체 응답, 토큰을 하나 이상 내보냈는지 여부)
+    """
+    writer = get_stream_writer()
+    text = ""
+    emitted = 0
+
+    for chunk in stream(prompt, model=model, timeout=timeout):
+        text += chunk
+        if result_tag is None:
+            visible = text
+        elif "<code>SUFFICIENT</code>" in text:
+            # 충분한 답변으로 판정된 평가는 사용자에게 보여주지 않음
+            visible = ""
+        else:
+            visible = _visible_result(text, result_tag).lstrip()
+
+        if len(visible) > emitted:
+            writer({"type": STREAM_TOKEN, "content": visible[emitted:]})
+            emitted = len(visible)
+
+    return text, emitted > 0
@@ -0,0 +1,178 @@
+"""
+미리 계산한 결과 캐시 모듈
+
+사용자 입력과 무관하게 결정되는 결과(예: 타겟별 질문)를 백그라운드 작업 스레드에서 미리 계산하고 키별로 보관합니다.
+계산이 진행 중인 키를 조회하면 새로 계산하지 않고 진행 중인 결과를 기다립니다.
+결과에 태그(예: 결과를 만든 입력의 내용 해시)를 붙여 두면 입력이 바뀌었을 때 해당 결과만 버릴 수 있습니다.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupCache:
+    """백그라운드에서 미리 계산한 결과를 키별로 보관하는 LRU 캐시 (진행 중인 계산도 공유)"""
+
+    def __init__(self, max_entries: int = 256, workers: int = 4, name: str = "warmup"):
+        """
+        Args:
+            max_entries: 보관할 최대 결과 수 (초과 시 가장 오래 사용되지 않은 결과부터 제거)
+            workers: 백그라운드 계산에 사용할 작업 스레드 수
+            name: 작업 스레드 이름 접두사
+        """
+        self.max_entries = max_entries
+        self.workers = workers
+        self.name = name
+
+        # 키 → 계산 결과(완료되었거나 진행 중인 Future)
+        self._entries: "OrderedDict[str, Future]" = OrderedDict()
+        # 키 → 태그 (태그를 지정한 결과만)
+        self._tags: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats: Dict[str, int] = {"submitted": 0, "hits": 0, "misses": 0, "failures": 0}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.name)
+        return self._executor
+
+    def _store(self, key: str, future: Future, tag: Optional[str]) -> None:
+        """결과를 넣고 최대 개수를 넘은 항목을 제거합니다. (잠금을 잡은 상태에서 호출)"""
+        self._entries[key] = future
+        self._entries.move_to_end(key)
+        if tag is not None:
+            self._tags[key] = tag
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._tags.pop(evicted, None)
+
+    def submit(self, key: str, func: Callable[[], Any], tag: Optional[str] = None) -> bool:
+        """
+        키의 결과가 없으면 백그라운드에서 계산을 시작합니다.
+
+        Args:
+            key: 결과 키
+            func: 결과를 계산하는 함수
+            tag: 결과에 붙일 태그 (discard_tags()로 같은 태그의 결과를 한 번에 버릴 때 사용)
+
+        Returns:
+            bool: 새로 계산을 시작했으면 True (이미 있거나 계산 중이면 False)
+        """
+        with self._lock:
+            if key in self._entries:
+                return False
+            self._store(key, self._get_executor().submit(func), tag)
+            self._stats["submitted"] += 1
+            return True
+
+    def contains(self, key: str) -> bool:
+        """키의 결과가 있거나 계산 중인지 확인합니다."""
+        with self._lock:
+            return key in self._entries
+
+    def put(self, key: str, value: Any, tag: Optional[str] = None) -> None:
+        """
+        직접 계산한 결과를 저장합니다.
+
+        Args:
+            key: 결과 키
+            value: 저장할 결과
+            tag: 결과에 붙일 태그
+        """
+        future: Future = Future()
+        future.set_result(value)
+        with self._lock:
+            self._store(key, future, tag)
+
+    def _lookup(self, key: str) -> Optional[Future]:
+        with self._lock:
+            future = self._entries.get(key)
+            if future is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return future
+
+    def _forget(self, key: str, future: Future, error: BaseException) -> None:
+        """실패한 계산을 제거하여 다음 조회에서 다시 계산하도록 합니다."""
+        logger.warning(f"미리 계산한 결과를 사용할 수 없습니다: {str(error)}")
+        with self._lock:
+            if self._entries.get(key) is future:
+                del self._entries[key]
+                self._tags.pop(key, None)
+            self._stats["failures"] += 1
+
+    def get(self, key: str, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        키의 결과를 반환합니다. 계산 중이면 끝날 때까지 기다립니다.
+
+        Args:
+            key: 결과 키
+            timeout: 계산 중인 결과를 기다릴 최대 시간 (초, None이면 제한 없음)
+
+        Returns:
+            Optional[Any]: 결과 (없거나 계산에 실패했으면 None - 호출자가 직접 계산)
+        """
+        future = self._lookup(key)
+        if future is None:
+            return None
+        try:
+            return future.result(timeout=timeout)
+        except Exception as e:
+            self._forget(key, future, e)
+            return None
+
+    async def aget(self, key: str, timeout: Optional[float] = None) -> Optional[Any]:
+        """get()의 비동기 버전입니다. (기다리는 동안 이벤트 루프를 점유하지 않음)"""
+        future = self._lookup(key)
+        if future is None:
+            return None
+        try:
+            if future.done():
+                return future.result()
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout=timeout)
+        except Exception as e:
+            self._forget(key, future, e)
+            return None
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        캐시 통계를 반환합니다.
+
+        Returns:
+            Dict[str, int]: 계산 시작(submitted), 적중(hits), 적중 실패(misses), 계산 오류(failures) 횟수와 항목 수(entries)
+        """
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries))
+
+    def discard_tags(self, tags: Iterable[str]) -> int:
+        """
+        태그가 일치하는 결과를 제거합니다. (진행 중인 계산은 끝까지 실행되지만 결과는 보관되지 않음)
+
+        Args:
+            tags: 제거할 결과의 태그
+
+        Returns:
+            int: 제거한 결과 수
+        """
+        tags = set(tags)
+        with self._lock:
+            keys = [key for key, tag in self._tags.items() if tag in tags]
+            for key in keys:
+                del self._tags[key]
+                self._entries.pop(key, None)
+            return len(keys)
+
+    def clear(self) -> None:
+        """모든 결과를 제거합니다. (진행 중인 계산은 끝까지 실행되지만 결과는 보관되지 않음)"""
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
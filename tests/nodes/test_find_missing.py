@@ -81,4 +81,27 @@ def test_find_missing_skip_non_required(mock_get_targets):
     
     # Verify
     assert result["node_result"] == RESULT_ALL_TARGETS_COMPLETE
-    assert result["current_target"] is None 
\ No newline at end of file
+    assert result["current_target"] is None 
+
+@patch('src.nodes.find_missing._GROUPING', True)
+@patch('src.nodes.find_missing.get_targets')
+def test_find_missing_groups_small_and_declared_targets(mock_get_targets):
+    """묶음 질문 설정에서 같은 종류의 짧은 항목과 같은 group의 항목을 묶는지 테스트합니다."""
+    mock_get_targets.return_value = {
+        "name": {"required": True, "name": "Name", "description": "Project name", "example": "Collector"},
+        "owner": {"required": True, "name": "Owner", "description": "Owner team", "example": "Platform"},
+        "features": {"required": True, "name": "Features", "description": "Features", "example": [{"name": "A"}]},
+        "budget": {"required": True, "name": "Budget", "description": "Budget", "example": "1M", "group": "plan"},
+        "deadline": {"required": True, "name": "Deadline", "description": "Date", "example": "Q3", "group": "plan"}
+    }
+
+    state = State({"results": {}, "current_target": None, "node_result": None})
+    first = find_missing(state)["current_target"]
+    assert first["id"] == "name+owner"
+    assert first["example"] == {"name": "Collector", "owner": "Platform"}
+
+    state = State({"results": {"name": "x", "owner": "y"}, "current_target": None, "node_result": None})
+    assert find_missing(state)["current_target"]["id"] == "features"
+
+    state = State({"results": {"name": "x", "owner": "y", "features": []}, "current_target": None, "node_result": None})
+    assert set(find_missing(state)["current_target"]["members"]) == {"budget", "deadline"}
@@ -0,0 +1,81 @@
+import time
+from unittest.mock import patch
+from collections import OrderedDict
+
+from src.nodes.generate_question import generate_question, warmup_questions, RESULT_QUESTION_GENERATED
+from src.state import State
+
+
+@patch('src.nodes.generate_question.invoke')
+def test_generate_question_uses_model_from_config(mock_invoke):
+    """실행 설정으로 전달된 모델 설정을 invoke에 넘기는지 테스트합니다."""
+    mock_invoke.return_value = "What is the purpose of this project?"
+    model = {"name": "gpt-4", "temperature": 0.0, "type": "openai", "api_key": "key"}
+
+    state = State({
+        "messages": [],
+        "current_target": {"id": "target1", "name": "Target 1", "description": "Test 1", "example": "Example 1"},
+        "node_result": None,
+        "model": None
+    })
+
+    # Execute
+    result = generate_question(state, {"configurable": {"model": model}})
+
+    # Verify
+    assert mock_invoke.call_args.kwargs["model"] == model
+    assert result["messages"][-1]["content"] == "What is the purpose of this project?"
+    assert result["node_result"] == RESULT_QUESTION_GENERATED
+
+
+@patch('src.nodes.generate_question._WARMUP', True)
+@patch('src.nodes.generate_question.invoke')
+def test_warmed_up_question_is_used_without_llm_call(mock_invoke):
+    """미리 생성한 질문이 있으면 LLM을 다시 호출하지 않는지 테스트합니다."""
+    mock_invoke.return_value = "What is the goal?"
+    model = {"name": "llama3", "temperature": 0.0, "type": "ollama", "api_key": None}
+    target = {"id": "goal", "name": "Goal", "description": "Purpose", "example": "Example", "required": True}
+
+    assert warmup_questions(model, {"goal": target}) == 1
+    assert warmup_questions(model, {"goal": target}) == 0
+
+    state = State({"messages": [], "current_target": target, "node_result": None, "model": None})
+    result = generate_question(state, {"configurable": {"model": model}})
+
+    assert mock_invoke.call_count == 1
+    assert result["messages"][-1]["content"] == "What is the goal?"
+
+
+@patch('src.nodes.generate_question._WARMUP', True)
+@patch('src.nodes.generate_question.get_target_version', return_value="v1")
+@patch('src.nodes.generate_question.get_targets')
+@patch('src.nodes.generate_question.invoke', return_value="What is the owner?")
+def test_warmup_skips_model_already_warm_for_catalog_version(mock_invoke, mock_targets, mock_version):
+    """같은 카탈로그 버전으로 이미 미리 생성한 모델은 건너뛰고, API 키는 해시로만 기록하는지 테스트합니다."""
+    mock_targets.return_value = {
+        "owner": {"id": "owner", "name": "Owner", "description": "Owner", "example": "Team", "required": True}
+    }
+    model = {"name": "gpt-4", "temperature": 0.0, "type": "openai", "api_key": "sk-secret"}
+    warmed = OrderedDict()
+
+    with patch('src.nodes.generate_question._WARMED_MODELS', warmed):
+        assert warmup_questions(model) == 1
+        assert warmup_questions(model) == 0
+    mock_targets.assert_called_once_with("v1")
+    assert list(warmed.values()) == ["v1"]
+    assert "sk-secret" not in repr(warmed)
+
+
+@patch('src.nodes.generate_question._TIMEOUT', 1.0)
+@patch('src.nodes.generate_question.speculation.take', side_effect=lambda *args, **kwargs: time.sleep(0.2))
+@patch('src.nodes.generate_question.invoke', return_value="What is the goal?")
+def test_question_stages_share_one_time_budget(mock_invoke, mock_take):
+    """추측 결과를 기다린 시간만큼 질문 생성 호출의 시간 예산이 줄어드는지 테스트합니다."""
+    target = {"id": "goal", "name": "Goal", "description": "Purpose", "example": "Example", "required": True}
+    state = State({"messages": [], "current_target": target, "node_result": None, "model": None})
+    model = {"name": "llama3", "temperature": 0.0, "type": "ollama", "api_key": None}
+
+    generate_question(state, {"configurable": {"model": model}})
+
+    assert mock_take.call_args.kwargs["timeout"] <= 1.0
+    assert mock_invoke.call_args.kwargs["timeout"] <= 0.8
@@ -0,0 +1,174 @@
+from unittest.mock import patch
+from src.nodes.process_answer import process_answer, MODE_SINGLE_CALL
+from src.nodes.generate_question import generate_question
+from src.utils.speculation import get_speculation_stats
+from src.entities import RESULT_ANSWER_SUFFICIENT, RESULT_ANSWER_INSUFFICIENT
+from src.state import State
+from src.target import make_group_target
+
+MODEL = {"name": "llama3", "temperature": 0.0, "type": "ollama", "api_key": None}
+
+
+def make_state() -> State:
+    return State({
+        "messages": [{"role": "ai", "content": "Who is on the team?"}, {"role": "human", "content": "Alice and Bob"}],
+        "current_target": {"id": "team", "name": "Team", "description": "Members", "example": {"members": ["A"]}},
+        "results": {},
+        "node_result": None,
+        "model": None
+    })
+
+
+@patch('src.nodes.process_answer._MODE', MODE_SINGLE_CALL)
+@patch('src.nodes.process_answer.invoke')
+def test_single_call_saves_data_with_one_llm_call(mock_invoke):
+    """single_call 방식은 평가와 데이터 추출을 LLM 호출 한 번으로 처리하는지 테스트합니다."""
+    mock_invoke.return_value = '{"sufficient": true, "reason": "named", "follow_up": "", "data": {"members": ["Alice", "Bob"]}}'
+
+    result = process_answer(make_state(), {"configurable": {"model": MODEL}})
+
+    assert mock_invoke.call_count == 1
+    assert mock_invoke.call_args.kwargs["json_mode"] is True
+    assert result["node_result"] == RESULT_ANSWER_SUFFICIENT
+    assert result["results"]["team"]["data"] == {"members": ["Alice", "Bob"]}
+
+
+@patch('src.nodes.process_answer.convert_data', return_value={"members": ["Alice", "Bob"]})
+@patch('src.nodes.process_answer.invoke')
+def test_returns_delta_without_changing_state(mock_invoke, mock_convert):
+    """노드가 입력 상태를 수정하지 않고 새 메시지와 결과만 반환하는지 테스트합니다."""
+    mock_invoke.return_value = "<sufficient><code>SUFFICIENT</code><reason>ok</reason><result>Alice, Bob</result></sufficient>"
+    state = make_state()
+
+    result = process_answer(state, {"configurable": {"model": MODEL}})
+
+    assert state == make_state()
+    assert [message["role"] for message in result["messages"]] == ["ai"]
+    assert list(result["results"]) == ["team"]
+
+
+@patch('src.nodes.process_answer._MODE', MODE_SINGLE_CALL)
+@patch('src.nodes.process_answer.invoke')
+def test_single_call_asks_follow_up(mock_invoke):
+    """single_call 방식의 불충분 판정은 후속 질문을 메시지로 추가하는지 테스트합니다."""
+    mock_invoke.return_value = '{"sufficient": false, "reason": "vague", "follow_up": "What are their roles?", "data": null}'
+
+    result = process_answer(make_state(), {"configurable": {"model": MODEL}})
+
+    assert result["node_result"] == RESULT_ANSWER_INSUFFICIENT
+    assert result["messages"][-1]["content"] == "What are their roles?"
+
+
+@patch('src.nodes.process_answer._MODE', MODE_SINGLE_CALL)
+@patch('src.nodes.process_answer.convert_data')
+@patch('src.nodes.process_answer.invoke')
+def test_single_call_falls_back_to_two_step(mock_invoke, mock_convert):
+    """single_call 응답의 데이터 형식이 예시와 다르면 2단계 처리로 대체하는지 테스트합니다."""
+    mock_invoke.side_effect = [
+        '{"sufficient": true, "reason": "named", "data": "Alice and Bob"}',
+        "<sufficient><code>SUFFICIENT</code><reason>named</reason><result>Alice, Bob</result></sufficient>"
+    ]
+    mock_convert.return_value = {"members": ["Alice", "Bob"]}
+
+    result = process_answer(make_state(), {"configurable": {"model": MODEL}})
+
+    assert mock_invoke.call_count == 2
+    assert mock_convert.call_args.args[3] == "Alice, Bob"
+    assert result["results"]["team"]["data"] == {"members": ["Alice", "Bob"]}
+
+
+TARGETS = {
+    "team": {"name": "Team", "description": "Members", "example": {"members": ["A"]}, "required": True},
+    "goal": {"name": "Goal", "description": "Purpose", "example": "Example", "required": True}
+}
+
+
+@patch('src.nodes.process_answer._SPECULATE', True)
+@patch('src.nodes.find_missing.get_targets', return_value=TARGETS)
+@patch('src.nodes.generate_question.invoke', return_value="What is the goal?")
+@patch('src.nodes.process_answer.convert_data', return_value={"members": ["Alice", "Bob"]})
+@patch('src.nodes.process_answer.invoke')
+def test_speculative_question_is_used_after_sufficient_answer(mock_invoke, mock_convert, mock_question, mock_targets):
+    """평가 중 미리 생성한 다음 질문을 충분한 답변 뒤의 generate_question이 사용하는지 테스트합니다."""
+    mock_invoke.return_value = "<sufficient><code>SUFFICIENT</code><reason>ok</reason><result>Alice, Bob</result></sufficient>"
+    config = {"configurable": {"model": MODEL, "session_id": "speculation-hit"}}
+
+    state = make_state()
+    process_answer(state, config)
+    state["current_target"] = dict(TARGETS["goal"], id="goal")
+    result = generate_question(state, config)
+
+    assert mock_question.call_count == 1
+    assert result["messages"][-1]["content"] == "What is the goal?"
+
+
+@patch('src.nodes.process_answer._SPECULATE', True)
+@patch('src.nodes.find_missing.get_targets', return_value=TARGETS)
+@patch('src.nodes.generate_question.invoke', return_value="What is the goal?")
+@patch('src.nodes.process_answer.invoke')
+def test_speculative_question_is_discarded_after_insufficient_answer(mock_invoke, mock_question, mock_targets):
+    """불충분한 답변이면 미리 생성한 다음 질문을 버리는지 테스트합니다."""
+    mock_invoke.return_value = "<insufficient><code>INSUFFICIENT</code><reason>vague</reason><result>Who?</result></insufficient>"
+    discarded = get_speculation_stats()["discarded"]
+
+    result = process_answer(make_state(), {"configurable": {"model": MODEL, "session_id": "speculation-miss"}})
+
+    assert result["node_result"] == RESULT_ANSWER_INSUFFICIENT
+    assert get_speculation_stats()["discarded"] == discarded + 1
+
+
+@patch('src.nodes.process_answer._MULTI_TARGET', True)
+@patch('src.nodes.process_answer.get_targets', return_value=TARGETS)
+@patch('src.nodes.process_answer.invoke')
+def test_answer_fills_other_missing_targets(mock_invoke, mock_targets):
+    """답변에 포함된 다른 타겟의 정보도 함께 저장하는지 테스트합니다."""
+    def respond(prompt, **kwargs):
+        if "<targets>" in prompt:
+            return '{"goal": "Build a CRM", "unknown": "x"}'
+        return "<insufficient><code>INSUFFICIENT</code><reason>vague</reason><result>Who exactly?</result></insufficient>"
+    mock_invoke.side_effect = respond
+
+    result = process_answer(make_state(), {"configurable": {"model": MODEL}})
+
+    assert result["node_result"] == RESULT_ANSWER_INSUFFICIENT
+    assert result["results"] == {"goal": {"name": "Goal", "description": "Purpose", "data": "Build a CRM"}}
+    assert result["messages"][-2]["content"] == "'Goal' is also saved from your answer."
+    assert result["messages"][-1]["content"] == "Who exactly?"
+
+
+@patch('src.nodes.process_answer._MULTI_TARGET', True)
+@patch('src.nodes.process_answer.get_targets', return_value=TARGETS)
+@patch('src.nodes.process_answer.emit_messages')
+@patch('src.nodes.process_answer.stream_invoke')
+@patch('src.nodes.process_answer.invoke')
+def test_streamed_notice_is_shown_before_follow_up(mock_invoke, mock_stream, mock_emit, mock_targets):
+    """다른 타겟 추출 중에는 후속 질문을 스트리밍하지 않고, 저장한 순서대로 화면에 전달하는지 테스트합니다."""
+    def respond(prompt, **kwargs):
+        if "<targets>" in prompt:
+            return '{"goal": "Build a CRM"}'
+        return "<insufficient><code>INSUFFICIENT</code><reason>vague</reason><result>Who exactly?</result></insufficient>"
+    mock_invoke.side_effect = respond
+
+    result = process_answer(make_state(), {"configurable": {"model": MODEL, "stream_tokens": True}})
+
+    mock_stream.assert_not_called()
+    emitted = [message["content"] for message in mock_emit.call_args.args[0]]
+    assert emitted == [message["content"] for message in result["messages"]]
+    assert emitted == ["'Goal' is also saved from your answer.", "Who exactly?"]
+
+
+@patch('src.nodes.process_answer.convert_data', return_value={"name": "Collector", "owner": "not a list"})
+@patch('src.nodes.process_answer.invoke')
+def test_grouped_answer_is_saved_per_member(mock_invoke, mock_convert):
+    """묶음 질문의 답변은 구성 항목별로 나누어 저장하고, 형식이 맞지 않는 항목은 남겨두는지 테스트합니다."""
+    mock_invoke.return_value = "<sufficient><code>SUFFICIENT</code><reason>ok</reason><result>Collector</result></sufficient>"
+    state = make_state()
+    state["current_target"] = make_group_target({
+        "name": {"name": "Name", "description": "Project name", "example": "Example", "required": True},
+        "owner": {"name": "Owner", "description": "Owners", "example": ["Team"], "required": True}
+    })
+
+    result = process_answer(state, {"configurable": {"model": MODEL}})
+
+    assert result["results"] == {"name": {"name": "Name", "description": "Project name", "data": "Collector"}}
+    assert result["messages"][-1]["content"].startswith("'Name' is successfully saved.")
@@ -0,0 +1 @@
+"""Tests for the state storage backends."""
@@ -0,0 +1,59 @@
+import threading
+
+import pytest
+from src.storage.sqlite import SqliteBackend
+
+
+@pytest.fixture
+def backend(tmp_path):
+    """임시 디렉토리에 SQLite 백엔드를 생성합니다."""
+    backend = SqliteBackend(tmp_path / "state.sqlite3")
+    yield backend
+    backend.close()
+
+
+def test_write_and_load_round_trip(backend):
+    """처음 기록한 상태와 이후 변경분이 그대로 복원되는지 테스트합니다."""
+    state = {
+        "messages": [{"role": "ai", "content": "Q1"}],
+        "node_result": "question_generated",
+        "results": {},
+        "current_target": {"id": "target1", "name": "Target 1"},
+        "model": {"name": "llama3", "temperature": 0.2, "type": "ollama", "api_key": None},
+        "error": "extra field"
+    }
+    backend.write("s1", state, None, [])
+
+    new_state = {
+        **state,
+        "messages": state["messages"] + [{"role": "human", "content": "A1"}],
+        "results": {"target1": {"name": "Target 1", "data": "A1"}},
+        "model": None
+    }
+    backend.write("s1", new_state, state, ["messages", "results", "model"])
+
+    assert backend.load("s1") == new_state
+    assert backend.load("unknown") is None
+
+
+def test_sessions_missing_target(backend):
+    """특정 타겟이 수집되지 않은 세션만 조회되는지 테스트합니다."""
+    backend.write("s1", {"messages": [], "results": {"target1": {"data": 1}}}, None, [])
+    backend.write("s2", {"messages": [], "results": {}}, None, [])
+
+    assert backend.sessions_missing_target("target1") == ["s2"]
+
+    backend.delete("s2")
+    assert backend.list_sessions() == ["s1"]
+    assert backend.sessions_missing_target("target1") == []
+
+
+def test_connections_of_finished_threads_are_closed(backend):
+    """종료된 스레드의 연결은 닫히고 살아 있는 스레드의 연결만 남는지 테스트합니다."""
+    for index in range(20):
+        thread = threading.Thread(target=backend.write, args=(f"s{index}", {"messages": []}, None, []))
+        thread.start()
+        thread.join()
+
+    assert backend.list_sessions() == sorted(f"s{index}" for index in range(20))
+    assert list(backend._connections) == [threading.current_thread()]
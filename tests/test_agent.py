@@ -0,0 +1,105 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+
+import src.state as state_module
+from src.agent import Agent
+from src.state import StateManager
+
+
+@pytest.fixture(autouse=True)
+def state_dir(tmp_path):
+    """상태 파일 경로를 임시 디렉토리로 바꾸고 세션 캐시를 비웁니다."""
+    paths = {
+        "state_file": tmp_path / "state.json",
+        "sessions_dir": tmp_path / "sessions",
+        "state_db": tmp_path / "state.sqlite3"
+    }
+    state_module._SESSIONS.clear()
+    state_module._DIRTY_SESSIONS.clear()
+    with patch("src.state.get_project_paths", return_value=paths), \
+            patch.object(state_module, "_BACKEND", None):
+        yield tmp_path
+        if state_module._BACKEND is not None:
+            state_module._BACKEND.close()
+    state_module._SESSIONS.clear()
+
+
+class SlowLLM:
+    """응답마다 잠시 기다리며, 동시에 처리 중인 호출 수를 기록하는 테스트용 LLM"""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+
+    async def ainvoke(self, prompt):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.05)
+        self.active -= 1
+        return "What is it?"
+
+
+def test_async_sessions_share_one_event_loop():
+    """여러 세션의 ainitialize_chat()이 한 이벤트 루프에서 LLM 호출을 동시에 기다리는지 테스트합니다."""
+    llm = SlowLLM()
+
+    async def run():
+        return await asyncio.gather(*(
+            Agent.ainitialize_chat("llama3", 0.0, "ollama", None, session_id=f"s{index}")
+            for index in range(3)
+        ))
+
+    with patch("src.utils.model._get_llm_instance", return_value=llm):
+        results = asyncio.run(run())
+
+    assert [new for _, new in results] == [[{"role": "ai", "content": "What is it?"}]] * 3
+    assert llm.max_active == 3
+    assert StateManager.get_messages("s2")[-1]["content"] == "What is it?"
+
+
+class ChunkedLLM:
+    """응답을 몇 글자씩 나누어 스트리밍하는 테스트용 LLM"""
+
+    def stream(self, prompt):
+        if "Evaluate if" in prompt:
+            response = ("<insufficient><code>INSUFFICIENT</code><reason>vague</reason>"
+                        "<result>Could you be more specific?</result></insufficient>")
+        else:
+            response = "What is it?"
+        for start in range(0, len(response), 4):
+            yield response[start:start + 4]
+
+    def invoke(self, prompt):
+        return "".join(self.stream(prompt))
+
+
+def test_stream_user_message_streams_only_user_facing_text():
+    """질문과 불충분 판정의 후속 질문만 토큰으로 전달하고, 완성된 메시지를 저장하는지 테스트합니다."""
+    with patch("src.utils.model._get_llm_instance", return_value=ChunkedLLM()):
+        init_events = list(Agent.stream_initialize_chat("llama3", 0.0, "ollama", None, session_id="s1"))
+        events = list(Agent.stream_user_message("dunno", session_id="s1"))
+
+    assert "".join(event["content"] for event in init_events if event["type"] == "token") == "What is it?"
+
+    tokens = [event for event in events if event["type"] == "token"]
+    assert len(tokens) > 1
+    assert {event["index"] for event in tokens} == {0}
+    assert "".join(event["content"] for event in tokens) == "Could you be more specific?"
+
+    assert events[-1]["type"] == "done"
+    assert events[-1]["new_messages"] == [{"role": "ai", "content": "Could you be more specific?"}]
+    assert StateManager.get_messages("s1")[-1]["content"] == "Could you be more specific?"
+
+
+def test_collector_graph_is_compiled_once():
+    """워크플로우 그래프를 한 번만 컴파일하고, 진입점을 메시지 기록으로 결정하는지 테스트합니다."""
+    with patch.object(Agent, "_create_collector_graph", wraps=Agent._create_collector_graph) as create, \
+            patch("src.agent._COLLECTOR_GRAPH", None), \
+            patch("src.utils.model._get_llm_instance", return_value=ChunkedLLM()):
+        Agent.initialize_chat("llama3", 0.0, "ollama", None, session_id="s1")
+        Agent.initialize_chat("llama3", 0.0, "ollama", None, session_id="s1")
+        Agent.add_user_message("dunno", session_id="s1")
+
+    assert create.call_count == 1
+    assert [message["role"] for message in StateManager.get_messages("s1")] == ["ai", "human", "ai"]
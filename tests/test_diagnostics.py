@@ -0,0 +1,42 @@
+from unittest.mock import patch
+
+import src.diagnostics as diagnostics_module
+from src.diagnostics import Diagnostics, KIND_EVALUATION
+from src.nodes.process_answer import process_answer
+
+
+def setup_function():
+    Diagnostics.clear()
+
+
+def test_ring_buffer_keeps_recent_records_per_session():
+    """세션마다 최근 기록만 유지하는지 테스트합니다."""
+    with patch.object(diagnostics_module, "_BUFFER_SIZE", 2):
+        for i in range(3):
+            Diagnostics.record(KIND_EVALUATION, f"평가 {i}", session_id="alice")
+        Diagnostics.record(KIND_EVALUATION, "다른 세션", session_id="bob")
+
+    assert [record["content"] for record in Diagnostics.get_records("alice")] == ["평가 1", "평가 2"]
+    assert len(Diagnostics.get_records("bob", KIND_EVALUATION)) == 1
+
+
+def test_process_answer_records_evaluation_out_of_band():
+    """평가 원본을 메시지가 아닌 진단 정보로 기록하는지 테스트합니다."""
+    state = {
+        "messages": [{"role": "ai", "content": "이름은?"}, {"role": "human", "content": "홍길동"}],
+        "message_offset": 0,
+        "node_result": "",
+        "results": {},
+        "current_target": {"id": "name", "name": "이름", "description": "이름", "example": "홍길동"},
+        "model": None
+    }
+    evaluation = "<insufficient><code>INSUFFICIENT</code><result>성도 알려주세요</result></insufficient>"
+
+    with patch("src.nodes.process_answer.invoke", return_value=evaluation):
+        result = process_answer(state, {"configurable": {"session_id": "alice"}})
+
+    # 노드는 새 메시지만 반환하며 평가 원본은 메시지에 포함되지 않음
+    assert [message["role"] for message in result["messages"]] == ["ai"]
+    records = Diagnostics.get_records("alice", KIND_EVALUATION)
+    assert records[0]["content"] == evaluation
+    assert records[0]["position"] == 2
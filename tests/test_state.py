@@ -0,0 +1,201 @@
+import pytest
+from unittest.mock import patch
+
+import src.state as state_module
+from src.state import StateManager
+from src.storage import create_backend
+from src.utils import speculation
+
+
+@pytest.fixture(autouse=True)
+def state_dir(tmp_path):
+    """상태 파일 경로를 임시 디렉토리로 바꾸고 세션 캐시를 비웁니다."""
+    paths = {
+        "state_file": tmp_path / "state.json",
+        "sessions_dir": tmp_path / "sessions",
+        "state_db": tmp_path / "state.sqlite3"
+    }
+    state_module._SESSIONS.clear()
+    state_module._DIRTY_SESSIONS.clear()
+    with patch("src.state.get_project_paths", return_value=paths), \
+            patch.object(state_module, "_BACKEND", None), \
+            patch.dict(state_module._WRITE_STATS, {key: 0 for key in state_module._WRITE_STATS}):
+        yield tmp_path
+        if state_module._BACKEND is not None:
+            state_module._BACKEND.close()
+    state_module._SESSIONS.clear()
+
+
+def test_sessions_are_isolated(state_dir):
+    """세션마다 독립된 메시지와 모델 설정을 가지는지 테스트합니다."""
+    StateManager.append_message({"role": "human", "content": "A"}, session_id="alice")
+    StateManager.set_model_settings("llama3", 0.2, "ollama", session_id="bob")
+
+    assert StateManager.get_messages("alice") == [{"role": "human", "content": "A"}]
+    assert StateManager.get_messages("bob") == []
+    assert StateManager.is_model_selected("bob")
+    assert not StateManager.is_model_selected("alice")
+    assert (state_dir / "sessions" / "alice.json").exists()
+    assert StateManager.list_sessions() == ["alice", "bob"]
+
+
+def test_evicted_session_is_reloaded_from_disk():
+    """LRU 캐시에서 밀려난 세션이 다음 접근 시 파일에서 복원되는지 테스트합니다."""
+    with patch.object(state_module, "_SESSION_CACHE_SIZE", 2):
+        for session_id in ("s1", "s2", "s3"):
+            StateManager.append_message({"role": "human", "content": session_id}, session_id=session_id)
+
+        assert list(state_module._SESSIONS.keys()) == ["s2", "s3"]
+        assert StateManager.get_messages("s1") == [{"role": "human", "content": "s1"}]
+
+
+def test_eviction_flushes_outside_global_lock():
+    """밀려난 세션의 기록은 전역 세션 잠금을 놓은 뒤 수행되는지 테스트합니다."""
+    flush = state_module._flush_session
+    held = []
+
+    def recording_flush(entry, *args, **kwargs):
+        held.append(state_module._SESSIONS_LOCK.locked())
+        return flush(entry, *args, **kwargs)
+
+    with patch.object(state_module, "_SESSION_CACHE_SIZE", 1), \
+            patch.object(state_module, "_WRITE_MODE", "behind"), \
+            patch.object(state_module, "_FLUSH_INTERVAL", 60.0), \
+            patch.object(state_module, "_flush_session", side_effect=recording_flush):
+        StateManager.append_message({"role": "human", "content": "s1"}, session_id="s1")
+        StateManager.append_message({"role": "human", "content": "s2"}, session_id="s2")
+
+    assert held and not any(held)
+    assert list(state_module._SESSIONS.keys()) == ["s2"]
+    assert StateManager.get_messages("s1") == [{"role": "human", "content": "s1"}]
+
+
+def test_finished_or_reset_session_discards_speculation():
+    """세션이 완료되거나 초기화되면 남은 다음 질문 추측을 버리는지 테스트합니다."""
+    speculation.start("done", "key", lambda: "question")
+    StateManager.update_state({"node_result": "all_targets_complete"}, session_id="done")
+    assert "done" not in speculation._PENDING
+
+    speculation.start("reset", "key", lambda: "question")
+    StateManager.reset("reset")
+    assert "reset" not in speculation._PENDING
+
+
+def test_invalid_session_id_is_rejected():
+    """경로 구분자가 포함된 세션 ID를 거부하는지 테스트합니다."""
+    with pytest.raises(ValueError):
+        StateManager.get_messages("../etc/passwd")
+
+
+def test_getters_return_read_only_views():
+    """조회 메서드가 복사 없이 읽기 전용 뷰를 반환하는지 테스트합니다."""
+    StateManager.append_message({"role": "human", "content": "A"}, session_id="alice")
+    messages = StateManager.get_messages("alice")
+
+    with pytest.raises(TypeError):
+        messages[0]["content"] = "B"
+    assert not hasattr(messages, "append")
+
+    # 새 메시지를 추가해도 이미 받은 뷰는 변하지 않고, 기존 메시지 객체는 공유됨
+    StateManager.append_message({"role": "ai", "content": "Q"}, session_id="alice")
+    new_messages = StateManager.get_messages("alice")
+    assert len(messages) == 1
+    assert len(new_messages) == 2
+    assert new_messages._data[0] is messages._data[0]
+
+
+def test_only_changed_fields_are_versioned():
+    """실제로 값이 바뀐 필드만 버전이 올라가고, 변경이 없으면 파일을 쓰지 않는지 테스트합니다."""
+    StateManager.set_model_settings("llama3", 0.2, "ollama", session_id="alice")
+    StateManager.append_message({"role": "human", "content": "A"}, session_id="alice")
+    entry = state_module._SESSIONS["alice"]
+    assert entry.versions == {"model": 1, "messages": 1}
+    assert entry.dirty_fields() == []
+
+    # 같은 값으로 다시 설정하거나 같은 상태를 저장하면 기록하지 않음
+    with patch("src.state._flush_session") as mock_flush:
+        StateManager.set_model_settings("llama3", 0.2, "ollama", session_id="alice")
+        StateManager.save(StateManager.load("alice"), session_id="alice")
+    mock_flush.assert_not_called()
+    assert entry.versions == {"model": 1, "messages": 1}
+
+
+def test_write_behind_coalesces_mutations(state_dir):
+    """behind 기록 방식에서 여러 변경이 한 번의 기록으로 합쳐지는지 테스트합니다."""
+    state_file = state_dir / "sessions" / "alice.json"
+    with patch.object(state_module, "_WRITE_MODE", "behind"), \
+            patch.object(state_module, "_FLUSH_INTERVAL", 60.0):
+        for content in ("A", "B", "C"):
+            StateManager.append_message({"role": "human", "content": content}, session_id="alice")
+        assert not state_file.exists()
+
+        assert StateManager.flush("alice")
+        assert state_file.exists()
+
+        StateManager.append_message({"role": "human", "content": "D"}, session_id="alice", durable=True)
+
+    stats = StateManager.get_write_stats()
+    assert stats["mutations"] == 4
+    assert stats["flushes"] == 2
+    assert stats["coalesced_writes"] == 2
+    assert stats["bytes_saved"] > 0
+
+    StateManager.invalidate_cache("alice")
+    assert len(StateManager.get_messages("alice")) == 4
+
+
+@pytest.mark.parametrize("storage", ["json", "journal", "sqlite"])
+def test_cache_reloads_after_external_write(state_dir, storage):
+    """다른 프로세스가 기록한 상태를 무효화 없이 다시 로드하는지 테스트합니다."""
+    with patch.object(state_module, "_STORAGE_MODE", storage):
+        StateManager.append_message({"role": "human", "content": "A"}, session_id="alice")
+        assert len(StateManager.get_messages("alice")) == 1
+
+        # 같은 저장소를 사용하는 다른 프로세스의 백엔드
+        other = create_backend(storage, state_module.get_project_paths())
+        stored = other.load("alice")
+        other.write("alice", {**stored, "messages": stored["messages"] + [{"role": "ai", "content": "B"}]},
+                    stored, ["messages"])
+        other.close()
+
+        assert StateManager.get_messages("alice")[-1] == {"role": "ai", "content": "B"}
+
+
+def test_corrupt_journal_entry_does_not_overwrite_snapshot(state_dir):
+    """저널 중간의 항목이 손상되어도 다음 기록이 스냅샷을 빈 상태로 덮어쓰지 않는지 테스트합니다."""
+    with patch.object(state_module, "_STORAGE_MODE", "journal"):
+        StateManager.append_message({"role": "human", "content": "A"}, session_id="alice", durable=True)
+        StateManager.append_message({"role": "ai", "content": "B"}, session_id="alice", durable=True)
+        StateManager.append_message({"role": "human", "content": "C"}, session_id="alice", durable=True)
+        journal = state_module._get_backend().get_journal("alice")
+        lines = journal.journal_file.read_bytes().splitlines(keepends=True)
+        journal.journal_file.write_bytes(b"".join([lines[0], b'{"op": "append_mes\n', *lines[1:]]))
+
+        StateManager.invalidate_cache("alice")
+        assert [m["content"] for m in StateManager.get_messages("alice")] == ["A", "B"]
+        StateManager.append_message({"role": "ai", "content": "D"}, session_id="alice", durable=True)
+
+        assert journal.snapshot_file.exists()
+        assert list(journal.journal_file.parent.glob("alice.journal.corrupt-*"))
+        StateManager.invalidate_cache("alice")
+        assert [m["content"] for m in StateManager.get_messages("alice")] == ["A", "B", "D"]
+
+
+@pytest.mark.parametrize("storage", ["json", "journal", "sqlite"])
+def test_old_messages_are_archived_in_segments(storage):
+    """메모리 창을 넘은 메시지가 구간으로 보관되고 필요할 때만 다시 로드되는지 테스트합니다."""
+    with patch.object(state_module, "_STORAGE_MODE", storage), \
+            patch.object(state_module, "_HISTORY_WINDOW", 4), \
+            patch.object(state_module, "_HISTORY_SEGMENT_SIZE", 3):
+        for i in range(12):
+            StateManager.append_message({"role": "human", "content": str(i)}, session_id="alice")
+
+        window = StateManager.get_messages("alice")
+        assert len(window) <= 4 + 3
+        assert window[-1]["content"] == "11"
+        assert StateManager.get_message_count("alice") == 12
+
+        StateManager.invalidate_cache("alice")
+        assert [m["content"] for m in StateManager.get_message_history("alice")] == [str(i) for i in range(12)]
+        assert [m["content"] for m in StateManager.get_message_history("alice", 2, 5)] == ["2", "3", "4"]
+        assert len(list(StateManager.iter_message_history("alice"))) == 12
@@ -0,0 +1,61 @@
+import json
+import os
+from collections import OrderedDict
+
+import pytest
+from unittest.mock import patch
+
+import src.target as target_module
+from src.target import get_targets, get_target_version, reload_targets, resolve_target_version
+
+
+@pytest.fixture
+def target_file(tmp_path):
+    """target.json 경로를 임시 파일로 바꾸고 카탈로그를 비웁니다."""
+    path = tmp_path / "target.json"
+    write_targets(path, {"name": "Name"})
+    with patch("src.target.get_project_paths", return_value={"target_file": path}), \
+            patch.object(target_module, "_CATALOG", None), \
+            patch.object(target_module, "_VERSIONS", OrderedDict()), \
+            patch.object(target_module, "_REJECTED_VERSION", None), \
+            patch.object(target_module, "_LISTENERS", []), \
+            patch.object(target_module, "_RELOAD_INTERVAL", 0):
+        yield path
+
+
+def write_targets(path, names):
+    path.write_text(json.dumps({
+        target_id: {"name": name, "description": name, "example": "Example"} for target_id, name in names.items()
+    }), encoding="utf-8")
+    # 같은 시각 안에 다시 기록해도 변경이 감지되도록 수정 시각을 바꿈
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_catalog_reloads_changed_file_and_keeps_pinned_version(target_file):
+    """파일이 바뀌면 새 버전으로 교체하고, 이전 버전에 고정된 세션은 이전 타겟을 계속 사용하는지 테스트합니다."""
+    changes = []
+    target_module.add_catalog_listener(lambda old, new, changed: changes.append(changed))
+    pinned = get_target_version()
+
+    write_targets(target_file, {"name": "Project name", "owner": "Owner"})
+
+    assert list(get_targets()) == ["name", "owner"]
+    assert get_target_version() != pinned
+    assert get_targets(pinned)["name"]["name"] == "Name"
+    assert resolve_target_version(pinned) == pinned
+    assert resolve_target_version("unknown") == get_target_version()
+    assert changes == [{"name", "owner"}]
+
+
+def test_invalid_or_unchanged_file_keeps_catalog(target_file):
+    """검증에 실패하거나 내용이 같으면 기존 카탈로그를 그대로 사용하는지 테스트합니다."""
+    version = get_target_version()
+
+    target_file.write_text(json.dumps({"name": {"name": "Name"}}), encoding="utf-8")
+    assert reload_targets(force=True) is False
+    assert get_targets()["name"]["description"] == "Name"
+
+    write_targets(target_file, {"name": "Name"})
+    assert reload_targets(force=True) is False
+    assert get_target_version() == version
@@ -0,0 +1,38 @@
+import json
+
+import pytest
+from src.utils.codec import StateCodec, FORMAT_JSON, FORMAT_COMPACT_JSON, FORMAT_MSGPACK
+
+
+STATE = {
+    "messages": [{"role": "human", "content": f"답변 {i}"} for i in range(50)],
+    "results": {"target1": {"name": "홍길동"}},
+    "node_result": "",
+    "current_target": None,
+    "model": None
+}
+
+
+@pytest.mark.parametrize("format", [FORMAT_JSON, FORMAT_COMPACT_JSON, FORMAT_MSGPACK])
+@pytest.mark.parametrize("compression", ["none", "gzip", "zstd"])
+def test_codec_round_trip(format, compression):
+    """모든 형식과 압축 방식에서 설정 없이 내용만으로 상태를 복원하는지 테스트합니다."""
+    codec = StateCodec(format, compression, compress_threshold=0)
+    data = codec.encode(STATE)
+
+    assert StateCodec.decode(data) == STATE
+
+
+def test_existing_pretty_json_is_readable():
+    """기존 state.json (들여쓰기된 JSON) 파일을 그대로 읽을 수 있는지 테스트합니다."""
+    data = json.dumps(STATE, ensure_ascii=False, indent=2).encode("utf-8")
+
+    assert StateCodec.decode(data) == STATE
+    assert StateCodec().encode(STATE) == data
+
+
+def test_small_state_is_not_compressed():
+    """임계값보다 작은 상태는 압축하지 않는지 테스트합니다."""
+    codec = StateCodec(FORMAT_COMPACT_JSON, "gzip", compress_threshold=1 << 20)
+
+    assert codec.encode(STATE).startswith(b"{")
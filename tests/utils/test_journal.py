@@ -0,0 +1,82 @@
+import pytest
+from src.utils.journal import StateJournal, diff_state, OP_APPEND_MESSAGES, OP_SET_FIELDS
+
+
+@pytest.fixture
+def journal(tmp_path):
+    """임시 디렉토리에 저널을 생성합니다."""
+    return StateJournal(
+        snapshot_file=tmp_path / "state.json",
+        journal_file=tmp_path / "state.journal",
+        compact_threshold=3
+    )
+
+
+def test_diff_state_appends_only_new_messages():
+    """추가된 메시지와 변경된 필드만 저널 항목으로 만드는지 테스트합니다."""
+    old_state = {"messages": [{"role": "ai", "content": "Q1"}], "results": {}, "node_result": ""}
+    new_state = {
+        "messages": [{"role": "ai", "content": "Q1"}, {"role": "human", "content": "A1"}],
+        "results": {"target1": {"data": "A1"}},
+        "node_result": ""
+    }
+
+    entries = diff_state(old_state, new_state)
+
+    assert entries == [
+        {"op": OP_APPEND_MESSAGES, "messages": [{"role": "human", "content": "A1"}]},
+        {"op": OP_SET_FIELDS, "fields": {"results": {"target1": {"data": "A1"}}}}
+    ]
+    assert diff_state(new_state, new_state) == []
+
+
+def test_journal_replays_tail_over_snapshot(journal):
+    """스냅샷 이후의 저널 항목이 재생되어 상태가 복원되는지 테스트합니다."""
+    journal.compact({"messages": [], "results": {}, "model": None})
+    journal.append([
+        {"op": OP_APPEND_MESSAGES, "messages": [{"role": "ai", "content": "Q1"}]},
+        {"op": OP_SET_FIELDS, "fields": {"model": {"name": "llama3"}}}
+    ])
+
+    state = journal.load()
+
+    assert state["messages"] == [{"role": "ai", "content": "Q1"}]
+    assert state["model"] == {"name": "llama3"}
+
+
+def test_journal_compaction_and_corrupt_tail(journal):
+    """임계값 도달 시 압축이 필요하고, 손상된 마지막 줄은 잘라낸 뒤 이어서 기록되는지 테스트합니다."""
+    journal.compact({"messages": []})
+    for index in range(3):
+        journal.append([{"op": OP_APPEND_MESSAGES, "messages": [{"role": "ai", "content": str(index)}]}])
+    assert journal.needs_compaction()
+
+    # 비정상 종료로 인한 불완전한 줄 추가
+    with open(journal.journal_file, "a", encoding="utf-8") as f:
+        f.write('{"op": "append_mes')
+
+    state = journal.load()
+    assert [message["content"] for message in state["messages"]] == ["0", "1", "2"]
+    journal.append([{"op": OP_APPEND_MESSAGES, "messages": [{"role": "ai", "content": "3"}]}])
+    state = journal.load()
+    assert [message["content"] for message in state["messages"]] == ["0", "1", "2", "3"]
+
+    journal.compact(state)
+    assert not journal.journal_file.exists()
+    assert journal.load() == state
+
+
+def test_journal_sets_aside_corrupt_entry_in_the_middle(journal):
+    """저널 중간의 손상된 항목 앞까지만 재생하고, 원본 저널은 옆으로 옮겨 보존하는지 테스트합니다."""
+    journal.compact({"messages": []})
+    journal.append([{"op": OP_APPEND_MESSAGES, "messages": [{"role": "ai", "content": "0"}]}])
+    with open(journal.journal_file, "a", encoding="utf-8") as f:
+        f.write('{"op": "append_mes\n')
+    journal.append([{"op": OP_APPEND_MESSAGES, "messages": [{"role": "ai", "content": "1"}]}])
+    original = journal.journal_file.read_bytes()
+
+    state = journal.load()
+    assert [message["content"] for message in state["messages"]] == ["0"]
+    corrupt_files = list(journal.journal_file.parent.glob("state.journal.corrupt-*"))
+    assert len(corrupt_files) == 1 and corrupt_files[0].read_bytes() == original
+    assert journal.load() == state
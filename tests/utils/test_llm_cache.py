@@ -0,0 +1,86 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+import src.utils.model as model_module
+from src.utils.llm_cache import ResponseCache, make_cache_key
+
+
+def test_response_cache_survives_restart_and_evicts(tmp_path):
+    """디스크에 저장된 응답을 다시 읽고, 최대 항목 수를 넘으면 오래된 항목을 삭제하는지 테스트합니다."""
+    db_file = tmp_path / "llm_cache.sqlite3"
+    cache = ResponseCache(db_file, memory_size=2, max_entries=10)
+    for index in range(12):
+        cache.put(make_cache_key("ollama", "llama3", 0.0, f"prompt-{index}"), f"answer-{index}")
+    cache.close()
+
+    reopened = ResponseCache(db_file, memory_size=2, max_entries=10)
+    assert reopened.get(make_cache_key("ollama", "llama3", 0.0, "prompt-11")) == "answer-11"
+    assert reopened.get(make_cache_key("ollama", "llama3", 0.0, "prompt-0")) is None
+    assert reopened.get(make_cache_key("ollama", "llama3", 0.0, "prompt-11")) == "answer-11"
+
+    stats = reopened.get_stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 1)
+    reopened.close()
+
+
+def test_response_cache_expires_entries(tmp_path):
+    """TTL이 지난 응답은 반환하지 않는지 테스트합니다."""
+    cache = ResponseCache(tmp_path / "llm_cache.sqlite3", ttl=10)
+    with patch("src.utils.llm_cache.time.time", return_value=1000.0):
+        cache.put("key", "answer")
+    with patch("src.utils.llm_cache.time.time", return_value=1011.0):
+        assert cache.get("key") is None
+    cache.close()
+
+
+def test_response_cache_evicts_periodically(tmp_path):
+    """정리는 저장할 때마다가 아니라 최대치의 10%만큼 저장할 때마다 수행하는지 테스트합니다."""
+    cache = ResponseCache(tmp_path / "llm_cache.sqlite3", max_entries=100)
+    with patch.object(ResponseCache, "_evict") as mock_evict:
+        for index in range(25):
+            cache.put(f"key-{index}", "answer")
+    assert mock_evict.call_count == 3
+    cache.close()
+
+
+def test_response_cache_closes_connections_of_finished_threads(tmp_path):
+    """종료된 스레드의 연결은 닫히고 살아 있는 스레드의 연결만 남는지 테스트합니다."""
+    cache = ResponseCache(tmp_path / "llm_cache.sqlite3", memory_size=1)
+    for index in range(20):
+        thread = threading.Thread(target=cache.put, args=(f"key-{index}", "answer"))
+        thread.start()
+        thread.join()
+
+    assert cache.get("key-0") == "answer"
+    assert list(cache._connections) == [threading.current_thread()]
+    cache.close()
+
+
+def test_invoke_uses_cache_only_for_deterministic_calls(tmp_path):
+    """온도가 0인 호출만 캐시하고, 온도가 0보다 크면 cache=True일 때만 캐시하는지 테스트합니다."""
+    llm = MagicMock()
+    llm.invoke.side_effect = lambda prompt: f"answer to {prompt}"
+    cache = ResponseCache(tmp_path / "llm_cache.sqlite3")
+
+    with patch.object(model_module, "_CACHE_ENABLED", True), \
+            patch.object(model_module, "_RESPONSE_CACHE", cache), \
+            patch.object(model_module, "_get_llm_instance", return_value=llm):
+        deterministic = {"name": "llama3", "temperature": 0.0, "type": "ollama"}
+        creative = {"name": "llama3", "temperature": 0.7, "type": "ollama"}
+
+        assert model_module.invoke("hi", model=deterministic) == "answer to hi"
+        assert model_module.invoke("hi", model=deterministic) == "answer to hi"
+        assert llm.invoke.call_count == 1
+
+        model_module.invoke("hi", model=creative)
+        model_module.invoke("hi", model=creative)
+        assert llm.invoke.call_count == 3
+
+        model_module.invoke("hi", model=creative, cache=True)
+        model_module.invoke("hi", model=creative, cache=True)
+        assert llm.invoke.call_count == 4
+
+        stats = model_module.get_llm_cache_stats()
+        assert stats["memory_hits"] == 2
+        assert stats["bypassed"] >= 2
+    cache.close()
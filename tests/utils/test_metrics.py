@@ -0,0 +1,70 @@
+import json
+from unittest.mock import patch
+
+from src.agent import Agent
+from src.utils import metrics
+from src.utils.metrics import HistogramRegistry, JsonlTraceSink, MetricsSink
+
+
+class _Collect(MetricsSink):
+    def __init__(self):
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class _LLM:
+    def invoke(self, prompt):
+        return "What is it?"
+
+
+def test_histogram_percentiles_and_openmetrics():
+    """노드별 백분위를 계산하고 OpenMetrics 형식으로 내보내는지 테스트합니다."""
+    registry = HistogramRegistry(window=100)
+    for value in range(1, 101):
+        registry.observe("process_answer", "wall_ms", float(value))
+    registry.observe("process_answer", "prompt_tokens", 7)
+
+    summary = registry.summary()["process_answer"]["wall_ms"]
+    assert (summary["count"], summary["p50"], summary["p95"], summary["p99"]) == (100, 50.0, 95.0, 99.0)
+
+    text = registry.to_openmetrics()
+    assert 'collector_node_wall_seconds_bucket{node="process_answer",le="0.05"} 50' in text
+    assert 'collector_node_wall_seconds_count{node="process_answer"} 100' in text
+    assert 'collector_node_prompt_tokens_total{node="process_answer"} 7' in text
+    assert text.endswith("# EOF\n")
+
+
+def test_graph_nodes_emit_spans_with_llm_usage(tmp_path):
+    """그래프 노드 실행마다 LLM 호출 지표가 담긴 스팬을 싱크로 전달하는지 테스트합니다."""
+    sink = _Collect()
+    trace = JsonlTraceSink(tmp_path / "metrics.jsonl")
+    with patch.object(metrics, "_ENABLED", True), patch.object(metrics, "_SINKS", [sink, trace]), \
+            patch("src.utils.model._get_llm_instance", return_value=_LLM()):
+        Agent._get_collector_graph().invoke({
+            "messages": [], "message_offset": 0, "node_result": "", "results": {}, "current_target": None,
+            "model": {"name": "llama3", "temperature": 0.0, "type": "ollama", "api_key": None}
+        }, config={"configurable": {"session_id": "metrics"}})
+    trace.close()
+
+    nodes = [record["node"] for record in sink.records]
+    assert nodes == ["find_missing", "generate_question"]
+    question = sink.records[1]
+    assert question["session_id"] == "metrics"
+    assert question["llm_calls"] == 1
+    assert question["response_tokens"] == 4
+    assert question["node_result"] == "question_generated"
+    assert question["state_out_size"] > 0
+    lines = (tmp_path / "metrics.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["node"] for line in lines] == nodes
+
+
+def test_state_in_size_does_not_grow_with_history():
+    """입력 상태 크기 추정은 메시지 기록 전체가 아니라 마지막 메시지만 포함하는지 테스트합니다."""
+    short = {"messages": [{"role": "human", "content": "A"}], "results": {}}
+    long = {"messages": [{"role": "ai", "content": "Q" * 100}] * 50 + [{"role": "human", "content": "A"}],
+            "results": {}}
+
+    assert metrics.estimate_state_size(long) == metrics.estimate_state_size(short)
+    assert metrics.estimate_state_size(short) == metrics.estimate_size(short)
@@ -0,0 +1,52 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import httpx
+
+import src.utils.model as model_module
+
+
+def setup_function():
+    model_module.close_llm_clients()
+
+
+def test_llm_clients_are_pooled_by_configuration():
+    """같은 모델 설정은 클라이언트를 재사용하고, 유휴 클라이언트는 닫는지 테스트합니다."""
+    with patch.object(model_module, "_create_llm_client",
+                      side_effect=lambda *args: model_module._PooledClient(MagicMock(), MagicMock())):
+        first = model_module._get_llm_instance("gpt-4", 0.0, "openai", "key-1")
+        assert model_module._get_llm_instance("gpt-4", 0.0, "openai", "key-1") is first
+        assert model_module._get_llm_instance("gpt-4", 0.0, "openai", "key-2") is not first
+
+        closed = model_module.get_llm_pool_stats()["closed"]
+        with patch.object(model_module, "_CLIENT_IDLE_TIMEOUT", 0.0):
+            model_module._get_llm_instance("llama3", 0.5, "ollama", None)
+
+    stats = model_module.get_llm_pool_stats()
+    assert stats["closed"] - closed == 2
+    assert stats["size"] == 1
+
+
+def test_pooled_ollama_client_is_reused_within_default_timeout():
+    """기본 시간 예산의 호출은 풀의 Ollama 객체를 그대로 쓰고, 짧은 제한의 사본은 재사용하는지 테스트합니다."""
+    with patch.object(model_module, "resolve_timeout", side_effect=lambda timeout: 120.0 if timeout is None else timeout):
+        llm = model_module._get_llm_instance("llama3", 0.0, "ollama", None)
+
+        assert model_module._with_request_timeout(llm, None)[0] is llm
+        shorter = model_module._with_request_timeout(llm, 9.5)[0]
+        assert shorter is not llm and shorter.timeout == 10
+        assert model_module._with_request_timeout(llm, 9.2)[0] is shorter
+
+
+def test_async_http_client_close_task_is_kept_until_done():
+    """실행 중인 이벤트 루프에서 닫는 비동기 HTTP 클라이언트는 완료될 때까지 태스크 참조를 유지하는지 테스트합니다."""
+    async def scenario():
+        http_async_client = httpx.AsyncClient()
+        model_module._PooledClient(MagicMock(), None, http_async_client).close()
+        assert len(model_module._CLOSING_TASKS) == 1
+        await asyncio.gather(*model_module._CLOSING_TASKS)
+        await asyncio.sleep(0)
+        return http_async_client
+
+    assert asyncio.run(scenario()).is_closed
+    assert not model_module._CLOSING_TASKS
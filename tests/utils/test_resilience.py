@@ -0,0 +1,107 @@
+import threading
+import time
+import pytest
+from unittest.mock import patch
+
+import src.utils.resilience as resilience
+from src.utils.resilience import (
+    CircuitOpenError, LLMTimeoutError, call_with_resilience, get_breaker
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_breakers():
+    """테스트마다 회로 차단기를 초기화하고 재시도 대기 시간을 없앱니다."""
+    resilience._BREAKERS.clear()
+    with patch.object(resilience, "_RETRY_BACKOFF", 0.0):
+        yield
+    resilience._BREAKERS.clear()
+
+
+def test_transient_errors_are_retried():
+    """일시적인 오류는 재시도하고, 그 외의 오류는 바로 전달하는지 테스트합니다."""
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ConnectionError("connection refused")
+        return "ok"
+
+    assert call_with_resilience(flaky, ("ollama", "llama3"), timeout=0) == "ok"
+    assert len(calls) == 3
+
+    def broken():
+        calls.append(1)
+        raise KeyError("bad response")
+
+    calls.clear()
+    with pytest.raises(KeyError):
+        call_with_resilience(broken, ("ollama", "llama3"), timeout=0)
+    assert len(calls) == 1
+
+
+def test_circuit_opens_after_consecutive_failures():
+    """연속 실패가 임계값에 도달하면 호출하지 않고 바로 실패하며, 재설정 시간 후 시험 호출로 복구되는지 테스트합니다."""
+    endpoint = ("ollama", "down")
+    calls = []
+
+    def down():
+        calls.append(1)
+        raise ConnectionError("connection refused")
+
+    with patch.object(resilience, "_BREAKER_THRESHOLD", 3), patch.object(resilience, "_MAX_RETRIES", 5):
+        with pytest.raises(CircuitOpenError):
+            call_with_resilience(down, endpoint, timeout=0)
+    assert len(calls) == 3
+    assert get_breaker(endpoint).state == "open"
+
+    with pytest.raises(CircuitOpenError):
+        call_with_resilience(lambda: "ok", endpoint, timeout=0)
+
+    get_breaker(endpoint).opened_at -= get_breaker(endpoint).reset_timeout
+    # 엔드포인트 장애가 아닌 오류로 끝난 시험 호출은 회로를 닫지 않고 다음 시험 호출을 허용
+    with pytest.raises(KeyError):
+        call_with_resilience(lambda: {}["missing"], endpoint, timeout=0)
+    assert get_breaker(endpoint).state == "half-open"
+    assert call_with_resilience(lambda: "ok", endpoint, timeout=0) == "ok"
+    assert get_breaker(endpoint).state == "closed"
+
+
+def test_timeout_and_hedged_request():
+    """시간 예산을 넘으면 LLMTimeoutError가 발생하고, 헤지 요청이 느린 첫 요청보다 먼저 끝나는지 테스트합니다."""
+    with patch.object(resilience, "_MAX_RETRIES", 0):
+        with pytest.raises(LLMTimeoutError):
+            call_with_resilience(lambda: time.sleep(0.5), ("ollama", "slow"), timeout=0.05)
+
+    delays = [0.5, 0.0]
+
+    def first_slow():
+        time.sleep(delays.pop(0))
+        return "answer"
+
+    stats = resilience.get_llm_call_stats()
+    with patch.object(resilience, "_HEDGE_DELAY", 0.05):
+        started = time.monotonic()
+        assert call_with_resilience(first_slow, ("ollama", "hedged"), timeout=5, hedge=True) == "answer"
+        assert time.monotonic() - started < 0.4
+    assert resilience.get_llm_call_stats()["hedge_wins"] == stats["hedge_wins"] + 1
+
+
+def test_abandoned_calls_keep_circuit_open_until_finished():
+    """시간 초과로 포기한 호출이 작업 스레드를 점유하는 동안은 회로를 열어 두고, 끝나면 다시 호출하는지 테스트합니다."""
+    endpoint = ("ollama", "stalled")
+    release = threading.Event()
+
+    with patch.object(resilience, "_MAX_RETRIES", 0), patch.object(resilience, "_MAX_ABANDONED_CALLS", 1):
+        with pytest.raises(LLMTimeoutError):
+            call_with_resilience(release.wait, endpoint, timeout=0.05)
+        assert get_breaker(endpoint).abandoned == 1
+        with pytest.raises(CircuitOpenError):
+            call_with_resilience(lambda: "ok", endpoint, timeout=0)
+
+        release.set()
+        deadline = time.monotonic() + 5
+        while get_breaker(endpoint).abandoned and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert call_with_resilience(lambda: "ok", endpoint, timeout=0) == "ok"
@@ -0,0 +1,18 @@
+import asyncio
+
+from src.utils import speculation
+
+
+def test_sync_take_cancels_async_speculation():
+    """동기 호출에서 꺼낸 비동기 추측은 결과를 기다리지 않고 취소하는지 테스트합니다."""
+    async def scenario():
+        speculation.astart("spec-async", "key", asyncio.sleep(10, result="question"))
+        task = speculation._PENDING["spec-async"][1]
+        assert speculation.take("spec-async", "key") is None
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        return task
+
+    task = asyncio.run(scenario())
+    assert task.cancelled()
+    assert "spec-async" not in speculation._PENDING
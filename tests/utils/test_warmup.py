@@ -0,0 +1,40 @@
+import threading
+
+from src.utils.warmup import WarmupCache
+
+
+def test_in_flight_result_is_shared_and_failures_are_forgotten():
+    """계산 중인 키는 다시 계산하지 않고 결과를 공유하며, 실패한 계산은 제거되는지 테스트합니다."""
+    cache = WarmupCache(max_entries=2, workers=2)
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return "question"
+
+    assert cache.submit("a", compute) is True
+    assert cache.submit("a", compute) is False
+    release.set()
+    assert cache.get("a", timeout=5) == "question"
+    assert len(calls) == 1
+
+    def fail():
+        raise ConnectionError("down")
+
+    cache.submit("b", fail)
+    assert cache.get("b", timeout=5) is None
+    assert not cache.contains("b")
+    assert cache.get_stats()["failures"] == 1
+
+
+def test_discard_tags_removes_only_matching_results():
+    """태그가 일치하는 결과만 제거하는지 테스트합니다."""
+    cache = WarmupCache(max_entries=4, workers=1)
+    cache.put("a", "old question", tag="old")
+    cache.put("b", "kept question", tag="same")
+
+    assert cache.discard_tags({"old"}) == 1
+    assert not cache.contains("a")
+    assert cache.get("b") == "kept question"